@@ -1,2 +1,3 @@
 @echo off
+python tools\map_compiler.py || exit /b 1
 pyinstaller -y space_station.spec
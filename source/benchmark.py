@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Headless benchmark of game map drawing.
+----------------------------------------------------------"""
+
+import os
+import argparse
+from random import Random
+from time import perf_counter
+
+# SDL drivers have to be chosen before pygame is imported.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from source.environment.map import Map
+from source.misc._pathes import MAP_PATH, MAP_BINARY_PATH, MAP_TILES_PATH, \
+                                CACHE_DIR
+from source.misc._enums import *
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+DISPLAY_SIZE = (1024, 640)
+DEFAULT_SCALE = 2
+DEFAULT_ROUNDS = 30
+
+# camera step per frame in pixels (~ player speed at 60 fps and scale 2)
+SCROLL_STEP = 4
+
+# how many screens camera passes in every scroll scenario
+SCROLL_SCREENS = 2
+
+PERCENTILES = (50, 90, 99)
+
+DIRECTIONS_NAMES = {
+    UP: 'up',
+    DOWN: 'down',
+    LEFT: 'left',
+    RIGHT: 'right',
+}
+
+# ============================ MAP BENCHMARK ================================ #
+
+
+class MapBenchmark(object):
+    """Set of timing scenarios for Map drawing methods.
+    Works with real game map under SDL's dummy video driver, so
+    could be used on build box without any display.
+    """
+    def __init__(self, scale=DEFAULT_SCALE, rounds=DEFAULT_ROUNDS, seed=0):
+        """Init.
+
+            scale:      1 or 2 (for 1x or 2x)
+            rounds:     number of measured calls for every scenario
+            seed:       random seed for camera positions
+        """
+        pygame.display.init()
+        self.screen = pygame.display.set_mode(DISPLAY_SIZE)
+        self.rounds = rounds
+        self._random = Random(seed)
+
+        started = perf_counter()
+        self.game_map = Map(
+            map_path=MAP_PATH,
+            compiled_map_path=MAP_BINARY_PATH,
+            cache_dir=CACHE_DIR,
+            tileset_path=MAP_TILES_PATH,
+            display_size_tuple=DISPLAY_SIZE,
+            scale=scale)
+        self.load_time = perf_counter() - started
+
+        # all scenarios are started from the center of the map
+        self.center = (self.game_map.rect.centerx, self.game_map.rect.centery)
+
+
+    def run(self):
+        """Run all scenarios.
+        Return list of (<scenario name>, <list of timings in seconds>).
+        """
+        results = [('full rebuild', self._run_full_rebuild())]
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            results.append(('scroll %s' % DIRECTIONS_NAMES[direction],
+                            self._run_scroll(direction)))
+        bottom_timings, top_timings = self._run_steady_state()
+        results.append(('steady bottom layers', bottom_timings))
+        results.append(('steady top layer', top_timings))
+        return results
+
+
+    def _run_full_rebuild(self):
+        """Measure Map.make_bottom_buffer() with random camera positions.
+        """
+        timings = []
+        for _ in range(self.rounds):
+            camera = self._get_random_camera_coords()
+            started = perf_counter()
+            self.game_map.make_bottom_buffer(camera)
+            timings.append(perf_counter() - started)
+        return timings
+
+
+    def _run_scroll(self, direction):
+        """Measure Map.draw_bottom_layers() for every frame, while camera
+        moves in one direction. Rendering of newly visible map parts is
+        included, so maximum values show the frame spikes.
+
+            direction:      UP, DOWN, LEFT, RIGHT
+        """
+        dx, dy = {
+            UP: (0, -SCROLL_STEP),
+            DOWN: (0, SCROLL_STEP),
+            LEFT: (-SCROLL_STEP, 0),
+            RIGHT: (SCROLL_STEP, 0),
+        }[direction]
+        if dx:
+            frames = DISPLAY_SIZE[0] * SCROLL_SCREENS // SCROLL_STEP
+        else:
+            frames = DISPLAY_SIZE[1] * SCROLL_SCREENS // SCROLL_STEP
+
+        camera_x, camera_y = self.center
+        self.game_map.make_bottom_buffer((camera_x, camera_y))
+
+        timings = []
+        for _ in range(frames):
+            camera_x += dx
+            camera_y += dy
+            started = perf_counter()
+            self.game_map.draw_bottom_layers(self.screen, (camera_x, camera_y))
+            timings.append(perf_counter() - started)
+        return timings
+
+
+    def _run_steady_state(self):
+        """Measure bottom and top layers drawing without camera moving.
+        Return tuple of two timings lists.
+        """
+        self.game_map.make_bottom_buffer(self.center)
+        bottom_timings, top_timings = [], []
+        for _ in range(self.rounds):
+            started = perf_counter()
+            self.game_map.draw_bottom_layers(self.screen, self.center)
+            bottom_timings.append(perf_counter() - started)
+
+            started = perf_counter()
+            self.game_map.draw_top_layer(self.screen, self.center)
+            top_timings.append(perf_counter() - started)
+        return bottom_timings, top_timings
+
+
+    def _get_random_camera_coords(self):
+        """Return random camera coords, far enough from map borders
+        to keep whole cached area (screen and its neighbours) inside the map.
+        """
+        rect = self.game_map.rect
+        half_width = DISPLAY_SIZE[0] * 3 // 2 + self.game_map.tile_size
+        half_height = DISPLAY_SIZE[1] * 3 // 2 + self.game_map.tile_size
+        x = self._random.randint(rect.left + half_width,
+                                 rect.right - half_width)
+        y = self._random.randint(rect.top + half_height,
+                                 rect.bottom - half_height)
+        return x, y
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Map benchmark.'
+
+
+# ------------------------------ REPORT ------------------------------------- #
+
+
+def get_percentile(sorted_values, percent):
+    """Return percentile of sorted list (nearest-rank method).
+
+        sorted_values:      sorted list of numbers
+        percent:            percentile, 0..100
+    """
+    if not sorted_values:
+        return 0.0
+    rank = int(round(percent / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[rank]
+
+
+def format_report(results, load_time):
+    """Return text table with timings statistics (in milliseconds).
+
+        results:        list of (<scenario name>, <timings list>)
+        load_time:      time of Map creation (in seconds)
+    """
+    header = ['scenario', 'calls', 'mean', 'min'] + \
+             ['p%d' % q for q in PERCENTILES] + ['max']
+    lines = ['map load: %.1f ms' % (load_time * 1000), '',
+             '%-22s' % header[0] +
+             ''.join('%10s' % column for column in header[1:])]
+
+    for name, timings in results:
+        values = sorted(timing * 1000 for timing in timings)
+        mean = sum(values) / len(values) if values else 0.0
+        row = [len(values), mean, values[0] if values else 0.0]
+        row += [get_percentile(values, q) for q in PERCENTILES]
+        row.append(values[-1] if values else 0.0)
+        lines.append('%-22s' % name + '%10d' % row[0] +
+                     ''.join('%10.3f' % value for value in row[1:]))
+    return '\n'.join(lines)
+
+
+# --------------------------------- RUN ------------------------------------- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Headless benchmark of game map drawing '
+                    '(timings are in milliseconds).')
+    parser.add_argument('--scale', type=int, default=DEFAULT_SCALE,
+                        choices=(1, 2), help='tiles scale')
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS,
+                        help='measured calls for rebuild and steady scenarios')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed for camera positions')
+    args = parser.parse_args()
+
+    benchmark = MapBenchmark(scale=args.scale, rounds=args.rounds,
+                             seed=args.seed)
+    print(format_report(benchmark.run(), benchmark.load_time))
+    pygame.quit()
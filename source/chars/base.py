@@ -5,11 +5,11 @@
  Description: Characters classes
 ----------------------------------------------------------"""
 
-import pyganim
 import pygame
-from pygame import Surface, Rect, Color
+from pygame import Rect
 
 from source.misc._enums import *
+from source.misc.game_clock import game_clock
 
 # ================================= CONST =================================== #
 
@@ -22,7 +22,46 @@ CHAR_INNER_COLLISION = {
     WIDTH: 22,
     HEIGHT: 10
 }
-BG_COLOR = Color("#888822")
+
+
+# ========================== ANIMATION CURSOR ============================== #
+
+
+class AnimationCursor(object):
+    """Playback position of character's animation.
+    Frames are shared between all characters with the same tileset
+    (see BaseChar._get_frames()), so every character keeps only this
+    cursor: animation start time (in game time) and frames delay.
+    """
+    __slots__ = ('_frames', '_delay', '_start_time')
+
+    def __init__(self, frames, delay):
+        """Init.
+
+            frames:         {<direction>: tuple of frames Surfaces}
+            delay:          animation delay (in milliseconds)
+        """
+        self._frames = frames
+        self._delay = delay / 1000.0
+        self._start_time = game_clock.now()
+
+
+    def get_frame(self, direction):
+        """Return current frame Surface of direction's animation.
+
+            direction:      UP, RIGHT, DOWN, LEFT, IDLE + <direction>
+        """
+        frames = self._frames[direction]
+        if len(frames) == 1:
+            return frames[0]
+        index = int((game_clock.now() - self._start_time) / self._delay)
+        return frames[index % len(frames)]
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Animation cursor from %.3f s' % self._start_time
 
 
 # ============================== CHAR CLASS ================================ #
@@ -34,6 +73,10 @@ class BaseChar(pygame.sprite.Sprite):
     """
     DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
 
+    # frames of all loaded tilesets, shared between characters:
+    # {(<tileset path>, <scale>): {<direction>: tuple of Surfaces}}
+    _frames_cache = {}
+
     def __init__(self, coords, tileset_path, scale, id_):
         """ Init.
 
@@ -63,13 +106,13 @@ class BaseChar(pygame.sprite.Sprite):
 
         # ~ image & animation ~
 
-        self.image = Surface((self.size, self.size))
-        self.image.fill(BG_COLOR)
-        self.image.set_colorkey(BG_COLOR)
+        # current frame (shared Surface from frames cache, never changed)
+        self.image = None
+        # True, if frame was changed by the last _redraw() call
+        self.frame_changed = False
 
-        self.animations = self._get_animation_set(tileset_path, DELAY, scale)
-        for q in self.animations:
-            self.animations[q].play()
+        self.frames = self._get_frames(tileset_path, scale)
+        self.animation = AnimationCursor(self.frames, DELAY)
         self._redraw()
 
 
@@ -93,20 +136,26 @@ class BaseChar(pygame.sprite.Sprite):
         screen.blit(self.image, self.screen_coords)
 
 
-    def _get_animation_set(self, tileset_path, delay, scale):
-        """ Form and return standard animation set with chosen delay.
+    @classmethod
+    def _get_frames(cls, tileset_path, scale):
+        """Return standard animation frames set of the tileset:
+        {<direction>: tuple of frames Surfaces}. Every tileset is loaded
+        once for all characters.
 
             tileset_path:           chars tileset file path
             scale:                  game tile's scale param (1 or 2)
-            delay:                  animation delay (in milliseconds).
 
         """
+        key = (tileset_path, scale)
+        if key in cls._frames_cache:
+            return cls._frames_cache[key]
+
         image = pygame.image.load(tileset_path).convert_alpha()
         if image.get_size() != (CHAR_SIZE * 4, CHAR_SIZE * 4):
             raise RuntimeError('Sorry! only scale 4x4 tilesets with size '
                                             'of %d supported now!' % CHAR_SIZE)
-        animations = {}
-        for tile_y, phase_name in zip(range(4), self.DIRECTIONS):
+        frames = {}
+        for tile_y, phase_name in zip(range(4), cls.DIRECTIONS):
             tiles = []
             for tile_x in range(4):
                 rect = (tile_x * CHAR_SIZE,
@@ -116,26 +165,27 @@ class BaseChar(pygame.sprite.Sprite):
                 tile = image.subsurface(rect).convert_alpha()
                 if scale == 2:
                     tile = pygame.transform.scale2x(tile)
-                tiles.append((tile, DELAY))
+                tiles.append(tile)
+
+            frames[phase_name] = tuple(tiles)
+            # First frames of every direction used for IDLE directions.
+            # This directions has no animation and have index:
+            #       IDLE + <direction const>
+            frames[IDLE + phase_name] = (tiles[0],)
 
-                # First frames of every direction used for IDLE directions.
-                # This directions has no animation and have index:
-                #       IDLE + <direction const>
-                # in animations list.
-                if tile_x == 0:
-                    animations[IDLE + phase_name] = pyganim.PygAnimation(
-                                                               [(tile, DELAY)])
-            animations[phase_name] = pyganim.PygAnimation(tiles)
-        return animations
+        cls._frames_cache[key] = frames
+        return frames
 
 
     def _redraw(self):
         """ Update character sprite according to current animation phase
-        and direction.
+        and direction. Frame is not copied: image is just linked with it,
+        so draw() costs a single blit.
         """
-        if self.direction in self.animations:
-            self.image.fill(BG_COLOR)
-            self.animations[self.direction].blit(self.image, (0, 0))
+        if self.direction in self.frames:
+            frame = self.animation.get_frame(self.direction)
+            self.frame_changed = frame is not self.image
+            self.image = frame
         else:
             raise RuntimeError('ERROR: incorrect animation state!')
 
@@ -5,20 +5,32 @@
  Description:
 ----------------------------------------------------------"""
 
-import pygame
-
 from source.misc._enums import *
+from source.misc.events import event_bus
+from .spatial_hash import SpatialHash
+
+# ---------------------------------- Const ----------------------------- #
+
+# side of spatial hash bucket (in pixels)
+SPATIAL_CELL_SIZE = 128
 
 # ----------------------------- Chars manager ------------------------- #
 
 
 class CharsManager(object):
     """Agregation class for chars.
+    Chars' rects are kept in spatial hash, so area queries don't depend
+    on total chars count.
     """
     def __init__(self, player):
         """Init. Please, use only one instance of this class.
         """
-        self._chars = {player}
+        self._chars = set()
+        self._spatial_hash = SpatialHash(SPATIAL_CELL_SIZE)
+        self.add_char(player)
+
+        event_bus.subscribe(EVENT_DETECT_CHARS_ABSENCE_ON_CELL,
+                            self._check_cell_free_of_chars)
 
 
     def add_char(self, char):
@@ -27,27 +39,76 @@ class CharsManager(object):
             char:      Char class character.
         """
         if char not in self._chars:
-            self._chars.append(char)
+            self._chars.add(char)
+            self._spatial_hash.insert(char, char.rect)
+
+
+    def remove_char(self, char):
+        """Remove character from managing.
+
+            char:      Char class character.
+        """
+        self._chars.discard(char)
+        self._spatial_hash.remove(char)
+
+
+    def update(self):
+        """Update chars' positions in spatial hash (after movement).
+        """
+        for char in self._chars:
+            self._spatial_hash.update(char, char.rect)
+
 
+    def get_chars_in_rect(self, rect):
+        """Return set of chars, colliding with the rect.
 
-    def handle_event(self, event):
-        """Handle event.
-        If event is handled, return True, else False.
+            rect:       Rect (or tuple)
+        """
+        return self._spatial_hash.get_in_rect(rect)
+
+
+    def is_rect_free_of_chars(self, rect):
+        """Return True, if no char collides with the rect.
+
+            rect:       Rect (or tuple)
+        """
+        return not self._spatial_hash.is_any_in_rect(rect)
+
+
+    def get_chars_in_radius(self, point, radius):
+        """Return list of chars, which centers are within radius from
+        the point, the nearest first.
 
-            event:      pygame.event.Event instance
+            point:      (X, Y)
+            radius:     in pixels
         """
-        if event.type == pygame.USEREVENT:
+        return self._spatial_hash.get_in_radius(point, radius)
 
-            if event.custom_type == EVENT_DETECT_CHARS_ABSENCE_ON_CELL:
-                for char in self._chars:
-                    result = char.rect.colliderect(event.cell_rect)
-                    if result and event.callback_yes:
-                        event.callback_yes()
-                    elif not result and event.callback_no:
-                        event.callback_no()
-                return True
 
-        return False
+    def get_nearest_char(self, point, max_distance=None):
+        """Return char, which center is the nearest to the point,
+        or None.
+
+            point:          (X, Y)
+            max_distance:   in pixels, or None (no limit)
+        """
+        return self._spatial_hash.get_nearest(point, max_distance)
+
+
+    def _check_cell_free_of_chars(self, cell_rect, callback_yes,
+                                                                callback_no):
+        """Check, if cell is free of chars, and call one of callbacks
+        (once per check).
+
+            cell_rect:      Rect of the cell
+            callback_yes:   callback, if any char is in the cell (or None)
+            callback_no:    callback, if cell is free (or None)
+        """
+        if self._spatial_hash.is_any_in_rect(cell_rect):
+            if callback_yes:
+                callback_yes()
+        elif callback_no:
+            callback_no()
 
 
     def __repr__(self):
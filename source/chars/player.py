@@ -10,7 +10,7 @@ import math
 import pygame
 
 from source.misc._enums import *
-from source.misc.events import events
+from source.misc.events import events, event_bus
 from .base import BaseChar
 
 # ================================= CONST =================================== #
@@ -47,6 +47,10 @@ class Player(BaseChar):
         self._x = float(self.rect.x)
         self._y = float(self.rect.y)
 
+        # position before the last update (for rendering interpolation)
+        self._previous_x = self.rect.x
+        self._previous_y = self.rect.y
+
         x = (display_size[0] - self._inner_rect.width) // 2 - self._inner_rect.x
         y = (display_size[1] - self._inner_rect.height) // 2 - self._inner_rect.y
         self.screen_coords = x, y
@@ -56,13 +60,24 @@ class Player(BaseChar):
         self._current_object_selected = None
         self._is_object_action_interface_on = False
 
+        event_bus.subscribe(EVENT_ACTION_INTERFACE_CLOSED,
+                            self._on_action_interface_closed)
+        event_bus.subscribe(EVENT_OBJECT_INTERFACE_CLOSED,
+                            self._on_object_interface_closed)
+
 
-    def get_camera_pos(self):
+    def get_camera_pos(self, alpha=1.0):
         """Get linked to our player camera coords (center of the screen).
+
+            alpha:          interpolation between position before the
+                            last update (0) and the current one (1)
         """
-        x = self.rect.x + self.camera_shift_x
-        y = self.rect.y + self.camera_shift_y
-        return x, y
+        x = self.rect.x
+        y = self.rect.y
+        if alpha < 1.0:
+            x = int(round(self._previous_x + (x - self._previous_x) * alpha))
+            y = int(round(self._previous_y + (y - self._previous_y) * alpha))
+        return x + self.camera_shift_x, y + self.camera_shift_y
 
 
     def update(self, game_map, milliseconds_spent):
@@ -70,7 +85,11 @@ class Player(BaseChar):
 
             game_map:       Map class instance.
         """
+        self._previous_x = self.rect.x
+        self._previous_y = self.rect.y
+
         is_idle_state = False
+        shift_x = shift_y = 0
 
         # DRY cries here....
         # But this is one of the bottlenecks, so I don't want to calc
@@ -79,31 +98,31 @@ class Player(BaseChar):
         if self.key_bottom:
             hard_ms = min(milliseconds_spent, MAXIMUM_LAG)
             self._y += self.movement_speed * hard_ms / 1000.0
-            self.rect.y = math.ceil(self._y)
+            shift_y = math.ceil(self._y) - self.rect.y
             self.direction = DOWN
 
         elif self.key_top:
             hard_ms = min(milliseconds_spent, MAXIMUM_LAG)
             self._y -= self.movement_speed * hard_ms / 1000.0
-            self.rect.y = int(self._y)
+            shift_y = int(self._y) - self.rect.y
             self.direction = UP
 
         elif self.key_left:
             hard_ms = min(milliseconds_spent, MAXIMUM_LAG)
             self._x -= self.movement_speed * hard_ms / 1000.0
-            self.rect.x = int(self._x)
+            shift_x = int(self._x) - self.rect.x
             self.direction = LEFT
 
         elif self.key_right:
             hard_ms = min(milliseconds_spent, MAXIMUM_LAG)
             self._x += self.movement_speed * hard_ms / 1000.0
-            self.rect.x = math.ceil(self._x)
+            shift_x = math.ceil(self._x) - self.rect.x
             self.direction = RIGHT
 
         else:
             is_idle_state = True
 
-        if is_idle_state or self._collide_map(game_map):
+        if is_idle_state or self._collide_map(game_map, shift_x, shift_y):
             if self.direction not in (IDLE, IDLE_UP, IDLE_DOWN, IDLE_LEFT,
                                                                    IDLE_RIGHT):
                 self.direction = IDLE + self.direction
@@ -153,105 +172,60 @@ class Player(BaseChar):
                 self.key_bottom = False
                 return True
 
-        elif event.type == pygame.USEREVENT:
+        return False
 
-            if event.custom_type == EVENT_ACTION_INTERFACE_CLOSED:
-                # actions interface could be closed on only by Player class
-                # so, it is better to set appropriate flags here.
-                self._is_object_action_interface_on = False
-                return True
 
-            if event.custom_type == EVENT_OBJECT_INTERFACE_CLOSED:
-                # object interface could be closed on only by Player class
-                # so, it is better to set appropriate flags here.
-                self._current_object_selected = None
-                return True
+    def _on_action_interface_closed(self):
+        """Handle report about closing actions interface.
+        """
+        # actions interface could be closed on only by Player class
+        # so, it is better to set appropriate flags here.
+        self._is_object_action_interface_on = False
 
-        return False
+
+    def _on_object_interface_closed(self):
+        """Handle report about closing object interface.
+        """
+        # object interface could be closed on only by Player class
+        # so, it is better to set appropriate flags here.
+        self._current_object_selected = None
 
 
-    def _collide_map(self, game_map):
-        """Check collision with other objects (game map borders,
-        non-walkable floor cells and object cells).
-        If collide with non-walkable, return to last possible position.
+    def _collide_map(self, game_map, shift_x, shift_y):
+        """Move player through the map's collision grid (map borders,
+        non-walkable floor cells and object cells). Movement is swept,
+        so player stops at the first obstacle on his way, even if the
+        step is longer than the obstacle.
         If collide with usable object, show actions interface.
         Return True if collide, else False.
 
             game_map:       Map class instance.
+            shift_x:        movement by X (in pixels)
+            shift_y:        movement by Y (in pixels)
         """
-        # 1. Check borders of the map.
+        self.rect, hits = game_map.collision_grid.move(
+                                                self.rect, shift_x, shift_y)
 
-        if not game_map.rect.contains(self.rect):
-            if self.direction == RIGHT:
-                self.rect.right = game_map.rect.right
-                self._x = self.rect.left
-            elif self.direction == LEFT:
-                self.rect.left = game_map.rect.left
+        if hits:
+            # stop on obstacle's border:
+            if shift_x:
                 self._x = self.rect.left
-            elif self.direction == UP:
-                self.rect.top = game_map.rect.top
-                self._y = self.rect.top
-            elif self.direction == DOWN:
-                self.rect.bottom = game_map.rect.bottom
+            if shift_y:
                 self._y = self.rect.top
-            return True
 
-        # 2. Check nearest tiles
-
-        is_player_stopped = False
-        stop_border = None
-
-        for floor_c, object_c in game_map.get_cells_to_verification(self.rect):
-
-            # - if ok, check object walkability:
-            if not object_c.is_walkable and self.rect.colliderect(object_c):
-                if self.direction == RIGHT:
-                    stop_border = object_c.rect.left
-                elif self.direction == LEFT:
-                    stop_border = object_c.rect.right
-                elif self.direction == UP:
-                    stop_border = object_c.rect.bottom
-                elif self.direction == DOWN:
-                    stop_border = object_c.rect.top
-                is_player_stopped = True
-
-                # - check object usability, if non-walkable:
-                if object_c.object is not None and \
-                              object_c.object != self._current_object_selected:
-                    # get middle point of the movement direction's side:
-                    point = self._get_sensitive_point(self.direction)
-                    # check, if this point collides to active object and
-                    # interface was not already shown:
-                    if object_c.rect.collidepoint(point) and \
-                                       not self._is_object_action_interface_on:
-                        self._enable_actions_interface(object_c.object)
-
-            # - check floor tiles walkability:
-            elif not floor_c.is_walkable and self.rect.colliderect(floor_c):
-                if self.direction == RIGHT:
-                    stop_border = floor_c.rect.left
-                elif self.direction == LEFT:
-                    stop_border = floor_c.rect.right
-                elif self.direction == UP:
-                    stop_border = floor_c.rect.bottom
-                elif self.direction == DOWN:
-                    stop_border = floor_c.rect.top
-                is_player_stopped = True
-
-        if is_player_stopped:
-            # stop to border value:
-            if self.direction == RIGHT:
-                self.rect.right = stop_border
-                self._x = self.rect.left
-            elif self.direction == LEFT:
-                self.rect.left = stop_border
-                self._x = self.rect.left
-            elif self.direction == UP:
-                self.rect.top = stop_border
-                self._y = self.rect.top
-            elif self.direction == DOWN:
-                self.rect.bottom = stop_border
-                self._y = self.rect.top
+            # check objects usability:
+            point = self._get_sensitive_point(self.direction)
+            for cell, solid_rect, is_object in hits:
+                if not is_object:
+                    continue
+                object_ = game_map.objects_links.get(cell)
+                # check, if this point collides to active object and
+                # interface was not already shown:
+                if object_ is not None and \
+                            object_ != self._current_object_selected and \
+                            solid_rect.collidepoint(point) and \
+                            not self._is_object_action_interface_on:
+                    self._enable_actions_interface(object_)
             return True
 
         else:
@@ -288,8 +262,9 @@ class Player(BaseChar):
 
 
     def _get_sensitive_point(self, direction):
-        """Get point in the middle of collision box side, to
-        check, if player could use map object.
+        """Get point in the middle of collision box side (the first
+        pixel outside the box), to check, if player could use map
+        object, that player stands close to.
 
             direction:      UP, DOWN, LEFT, RIGHT
         """
@@ -297,11 +272,11 @@ class Player(BaseChar):
         half_width = width // 2
         half_height = height // 2
         if direction == LEFT:
-            return (x, y + half_height)
+            return (x - 1, y + half_height)
         elif direction == RIGHT:
             return (x + width, y + half_height)
         elif direction == UP:
-            return (x + half_width, y)
+            return (x + half_width, y - 1)
         elif direction == DOWN:
             return (x + half_width, y + height)
 
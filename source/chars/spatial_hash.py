@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Uniform grid spatial index of objects' rects.
+----------------------------------------------------------"""
+
+from pygame import Rect
+
+
+# ========================== SPATIAL HASH CLASS ============================= #
+
+
+class SpatialHash(object):
+    """Uniform grid of square buckets. Every object is stored in all
+    buckets, it's rect overlaps, so queries check only objects from
+    buckets near the queried area, whatever total objects count is.
+
+    Objects could be of any hashable type; their rects are copied, so
+    index has to be updated after objects movement (see update()).
+    """
+    def __init__(self, cell_size):
+        """Init.
+
+            cell_size:      side of bucket (in pixels). Better to be a bit
+                            larger than typical object.
+        """
+        self.cell_size = cell_size
+        self._buckets = {}
+
+        # {<object>: (<Rect copy>, <buckets range>)}
+        self._objects = {}
+
+
+    def insert(self, object_, rect):
+        """Add object into index (or update it, if it is already added).
+
+            object_:        any hashable object
+            rect:           object's Rect
+        """
+        if object_ in self._objects:
+            self.update(object_, rect)
+            return
+
+        buckets_range = self._get_buckets_range(rect)
+        self._objects[object_] = (Rect(rect), buckets_range)
+        for bucket in self._iter_buckets(buckets_range):
+            self._buckets.setdefault(bucket, set()).add(object_)
+
+
+    def update(self, object_, rect):
+        """Update object's rect. Buckets are changed only if object
+        moved to other ones.
+
+            object_:        object, already added into index
+            rect:           object's new Rect
+        """
+        stored_rect, old_range = self._objects[object_]
+        if stored_rect == rect:
+            return
+        stored_rect.update(rect)
+
+        new_range = self._get_buckets_range(rect)
+        if new_range == old_range:
+            return
+
+        for bucket in self._iter_buckets(old_range):
+            self._discard(bucket, object_)
+        for bucket in self._iter_buckets(new_range):
+            self._buckets.setdefault(bucket, set()).add(object_)
+        self._objects[object_] = (stored_rect, new_range)
+
+
+    def remove(self, object_):
+        """Remove object from index (if it is there).
+
+            object_:        object to remove
+        """
+        item = self._objects.pop(object_, None)
+        if item is not None:
+            for bucket in self._iter_buckets(item[1]):
+                self._discard(bucket, object_)
+
+
+    def get_in_rect(self, rect):
+        """Return set of objects, which rects collide with the rect.
+
+            rect:           Rect (or tuple) to check
+        """
+        rect = Rect(rect)
+        result = set()
+        for bucket in self._iter_buckets(self._get_buckets_range(rect)):
+            for object_ in self._buckets.get(bucket, ()):
+                if object_ not in result and \
+                                 self._objects[object_][0].colliderect(rect):
+                    result.add(object_)
+        return result
+
+
+    def is_any_in_rect(self, rect):
+        """Return True, if at least one object's rect collides with the
+        rect (faster than get_in_rect(), as it stops on the first one).
+
+            rect:           Rect (or tuple) to check
+        """
+        rect = Rect(rect)
+        for bucket in self._iter_buckets(self._get_buckets_range(rect)):
+            for object_ in self._buckets.get(bucket, ()):
+                if self._objects[object_][0].colliderect(rect):
+                    return True
+        return False
+
+
+    def get_in_radius(self, point, radius):
+        """Return list of objects, which rects' centers are within
+        radius from the point, ordered by distance.
+
+            point:          (X, Y)
+            radius:         in pixels
+        """
+        x, y = point
+        area = Rect(x - radius, y - radius, radius * 2 + 1, radius * 2 + 1)
+        radius_sq = radius * radius
+
+        result = []
+        for object_ in self.get_in_rect(area):
+            distance_sq = self._get_distance_sq(object_, x, y)
+            if distance_sq <= radius_sq:
+                result.append((distance_sq, object_))
+        result.sort(key=lambda item: item[0])
+        return [object_ for _, object_ in result]
+
+
+    def get_nearest(self, point, max_distance=None):
+        """Return object, which rect's center is the nearest to the
+        point, or None. Buckets are checked ring by ring around the
+        point, until next rings could not contain any nearer object.
+
+            point:          (X, Y)
+            max_distance:   in pixels, or None (no limit)
+        """
+        if not self._objects:
+            return None
+
+        x, y = point
+        size = self.cell_size
+        center_x, center_y = x // size, y // size
+        best, best_distance_sq = None, None
+        seen = set()
+
+        ring = 0
+        while True:
+            for bucket in self._iter_ring(center_x, center_y, ring):
+                for object_ in self._buckets.get(bucket, ()):
+                    if object_ in seen:
+                        continue
+                    seen.add(object_)
+                    distance_sq = self._get_distance_sq(object_, x, y)
+                    if best is None or distance_sq < best_distance_sq:
+                        best, best_distance_sq = object_, distance_sq
+
+            # object beyond checked rings is farther, than ring * size
+            reached = ring * size
+            if best is not None and best_distance_sq <= reached * reached:
+                break
+            if len(seen) == len(self._objects):
+                break
+            if max_distance is not None and reached > max_distance:
+                break
+            ring += 1
+
+        if best is not None and max_distance is not None and \
+                              best_distance_sq > max_distance * max_distance:
+            return None
+        return best
+
+
+    def _get_distance_sq(self, object_, x, y):
+        """Return squared distance from object's rect center to point.
+
+            object_:        object in index
+            x, y:           point coords
+        """
+        center_x, center_y = self._objects[object_][0].center
+        return (center_x - x) ** 2 + (center_y - y) ** 2
+
+
+    def _get_buckets_range(self, rect):
+        """Return (<left>, <top>, <right>, <bottom>) buckets coords,
+        covered by rect (inclusive).
+
+            rect:           Rect
+        """
+        size = self.cell_size
+        return (rect.left // size,
+                rect.top // size,
+                (rect.right - 1) // size,
+                (rect.bottom - 1) // size)
+
+
+    @staticmethod
+    def _iter_buckets(buckets_range):
+        """Iterate over buckets coords of the range.
+
+            buckets_range:  (<left>, <top>, <right>, <bottom>)
+        """
+        left, top, right, bottom = buckets_range
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                yield x, y
+
+
+    @staticmethod
+    def _iter_ring(center_x, center_y, ring):
+        """Iterate over buckets coords of square ring around center
+        bucket (ring 0 is center bucket itself).
+
+            center_x, center_y:     center bucket coords
+            ring:                   ring number
+        """
+        if not ring:
+            yield center_x, center_y
+            return
+        left, right = center_x - ring, center_x + ring
+        top, bottom = center_y - ring, center_y + ring
+        for x in range(left, right + 1):
+            yield x, top
+            yield x, bottom
+        for y in range(top + 1, bottom):
+            yield left, y
+            yield right, y
+
+
+    def _discard(self, bucket, object_):
+        """Remove object from bucket; drop bucket, if it is empty.
+
+            bucket:         bucket coords
+            object_:        object to remove
+        """
+        objects = self._buckets.get(bucket)
+        if objects is not None:
+            objects.discard(object_)
+            if not objects:
+                del self._buckets[bucket]
+
+
+    def __contains__(self, object_):
+        """Check, if object is in index.
+        """
+        return object_ in self._objects
+
+
+    def __len__(self):
+        """Return number of objects in index.
+        """
+        return len(self._objects)
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Spatial hash: %d objects in %d buckets' % (
+                                        len(self._objects), len(self._buckets))
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Collision grid of game map and swept movement.
+----------------------------------------------------------"""
+
+from pygame import Rect
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+# marker of cell, which solids are not got yet
+NOT_CHECKED = object()
+
+# ========================= COLLISION GRID CLASS ============================ #
+
+
+class CollisionGrid(object):
+    """Grid of solid rects of the map cells.
+    Every cell keeps tuple of it's solids: (<Rect>, <is object>) pairs
+    (not walkable object with it's collision insets, not walkable floor),
+    or None, if the cell could be walked through.
+
+    Solids of the cell are got from callback, when the cell is checked
+    for the first time, and kept until the cell is reset (so map loading
+    doesn't wait for solids of all cells, most of which are never
+    checked).
+
+    move() method moves rect with sweeping: rect stops at the first
+    solid on it's way, however long the step is, so nothing could be
+    passed through. Movement is done axis by axis, so rect slides along
+    solids, when it moves diagonally.
+    """
+    def __init__(self, width, height, cell_size, bounds, get_cell_solids):
+        """Init.
+
+            width, height:      grid size (in cells)
+            cell_size:          side of cell (in pixels)
+            bounds:             Rect, that moving rects could not leave
+            get_cell_solids:    function(X, Y), returns solids of the
+                                cell: tuple of (<Rect>, <is object>)
+                                pairs, or None (or empty tuple)
+        """
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.bounds = Rect(bounds)
+        self._get_cell_solids = get_cell_solids
+        self._solids = [NOT_CHECKED] * (width * height)
+
+
+    def reset_cell(self, x, y):
+        """Forget solids of the cell (after it's change), they will be
+        got from callback again.
+
+            x, y:           cell coords (in cells)
+        """
+        self._solids[y * self.width + x] = NOT_CHECKED
+
+
+    def get_cell(self, x, y):
+        """Return solids of the cell (tuple of (<Rect>, <is object>)
+        pairs), or None.
+
+            x, y:           cell coords (in cells)
+        """
+        index = y * self.width + x
+        solids = self._solids[index]
+        if solids is NOT_CHECKED:
+            solids = self._solids[index] = self._get_cell_solids(x, y) or None
+        return solids
+
+
+    def is_rect_free(self, rect):
+        """Return True, if rect is inside bounds and collides no solid.
+
+            rect:           Rect to check
+        """
+        if not self.bounds.contains(rect):
+            return False
+        for _, solid_rect, _ in self._iter_solids(
+                                rect.left, rect.right, rect.top, rect.bottom):
+            if solid_rect.colliderect(rect):
+                return False
+        return True
+
+
+    def move(self, rect, dx, dy):
+        """Move rect by (dx, dy) with sliding along solids.
+        Return tuple (<new Rect>, <hits>), where hits is a list of
+        solids, that stopped the movement (by Y axis, or by X axis, if
+        movement by Y was not stopped):
+
+            ((X, Y) cell coords, <solid Rect>, <is object>)
+
+        (cell coords are None for bounds of the grid).
+
+            rect:           Rect to move (not changed)
+            dx, dy:         movement (in pixels)
+        """
+        rect = Rect(rect)
+        hits = []
+        if dx:
+            hits = self._sweep(rect, dx, True)
+        if dy:
+            hits = self._sweep(rect, dy, False) or hits
+        return rect, hits
+
+
+    def _sweep(self, rect, delta, is_horizontal):
+        """Move rect along one axis up to the first solid.
+        Rect is changed in-place. Return list of hits (see move()).
+
+            rect:           Rect to move
+            delta:          movement along the axis (in pixels)
+            is_horizontal:  True for X axis, False for Y axis
+        """
+        if is_horizontal:
+            near, far = rect.left, rect.right
+            side_from, side_to = rect.top, rect.bottom
+            bound_from, bound_to = self.bounds.left, self.bounds.right
+        else:
+            near, far = rect.top, rect.bottom
+            side_from, side_to = rect.left, rect.right
+            bound_from, bound_to = self.bounds.top, self.bounds.bottom
+
+        if delta > 0:
+            # front edge moves from "far" to "target"
+            target = far + delta
+            area_from, area_to = far - 1, target
+        else:
+            # front edge moves from "near" to "target"
+            target = near + delta
+            area_from, area_to = target, near + 1
+
+        if is_horizontal:
+            solids = self._iter_solids(area_from, area_to, side_from, side_to)
+        else:
+            solids = self._iter_solids(side_from, side_to, area_from, area_to)
+
+        # the nearest stop position of the front edge and solids on it
+        if delta > 0:
+            stop = min(target, bound_to)
+        else:
+            stop = max(target, bound_from)
+        hits = [(None, self.bounds, False)] if stop != target else []
+
+        for cell, solid_rect, is_object in solids:
+            if is_horizontal:
+                solid_near, solid_far = solid_rect.left, solid_rect.right
+                solid_side_from = solid_rect.top
+                solid_side_to = solid_rect.bottom
+            else:
+                solid_near, solid_far = solid_rect.top, solid_rect.bottom
+                solid_side_from = solid_rect.left
+                solid_side_to = solid_rect.right
+
+            # solid has to be on the way
+            if solid_side_from >= side_to or solid_side_to <= side_from:
+                continue
+
+            if delta > 0:
+                if solid_far <= far or solid_near >= target:
+                    continue
+                edge = max(solid_near, far)
+                if edge < stop:
+                    stop, hits = edge, []
+                if edge == stop:
+                    hits.append((cell, solid_rect, is_object))
+            else:
+                if solid_near >= near or solid_far <= target:
+                    continue
+                edge = min(solid_far, near)
+                if edge > stop:
+                    stop, hits = edge, []
+                if edge == stop:
+                    hits.append((cell, solid_rect, is_object))
+
+        if delta > 0:
+            shift = stop - far
+        else:
+            shift = stop - near
+        if is_horizontal:
+            rect.x += shift
+        else:
+            rect.y += shift
+        return hits
+
+
+    def _iter_solids(self, left, right, top, bottom):
+        """Iterate over solids of cells, covered by area.
+        Yield tuples ((X, Y) cell coords, <solid Rect>, <is object>).
+
+            left, right:    area X borders (in pixels, right is excluded)
+            top, bottom:    area Y borders (in pixels, bottom is excluded)
+        """
+        size = self.cell_size
+        left_cell = max(left // size, 0)
+        top_cell = max(top // size, 0)
+        right_cell = min((right - 1) // size, self.width - 1)
+        bottom_cell = min((bottom - 1) // size, self.height - 1)
+
+        solids = self._solids
+        width = self.width
+        for y in range(top_cell, bottom_cell + 1):
+            for x in range(left_cell, right_cell + 1):
+                cell_solids = solids[y * width + x]
+                if cell_solids is NOT_CHECKED:
+                    cell_solids = self.get_cell(x, y)
+                if cell_solids:
+                    for solid_rect, is_object in cell_solids:
+                        yield (x, y), solid_rect, is_object
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Collision grid %dx%d' % (self.width, self.height)
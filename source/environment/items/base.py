@@ -9,6 +9,11 @@ import pygame
 from source.misc._enums import *
 
 
+# ------------------------------ CONST ------------------------------------- #
+
+# side of storage cell, occupied by item (in pixels, without scale)
+CELL_SIZE = 32
+
 # ==================== Inventory object class ============================== #
 
 class InventoryObject(object):
@@ -73,6 +78,9 @@ class InventoryObject(object):
             tile_number:    number of tile in _tileset list.
         """
         self.image, self.type = self._tileset[alias][tile_number]
+        # (<width>, <height>) of item in storage cells
+        size_x, size_y = self._get_sizes_x_y(self.type)
+        self.size = (size_x // CELL_SIZE, size_y // CELL_SIZE)
 
 
     @staticmethod
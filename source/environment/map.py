@@ -5,15 +5,26 @@
  Description: Game map classes
 ----------------------------------------------------------"""
 
-import json
-
-import pygame
-from pygame import Rect, Surface
+from pygame import Rect, Color
 
 from source.misc._enums import *
+from source.misc.events import event_bus
 from .objects_manager import ObjectsManager
-from .map_cells import LayerCell, ObjectCell, FloorCell
+from .map_tileset import MapTileset
+from .map_layers import TileLayer, WalkableTileLayer
+from ._tile_collisions import TILES_COLLISIONS
+from .map_chunks import MapChunksCache
+from .map_binary import compile_map, load_compiled_map
+from .collision import CollisionGrid
+from .pathfinding import NavGrid, Pathfinder
+from .rooms import RoomGraph
+from .objects.doors.simple_door import SimpleDoor
+
+
+# ------------------------------ CONST ------------------------------------- #
 
+# color of the space out of map borders
+BLACK = Color(0, 0, 0)
 
 # ============================ MAP CLASS ================================= #
 
@@ -21,7 +32,7 @@ from .map_cells import LayerCell, ObjectCell, FloorCell
 class Map(object):
     """ Main game map class.
     """
-    # Order numbers of layers in map.json
+    # Order numbers of tile layers in map.json
     FLOOR_LAYER_NUM = 0
     DECOR_LAYER_NUM = 1
     OBJECTS_LAYER_NUM = 2
@@ -35,37 +46,51 @@ class Map(object):
     # special object indexes offset (additional tileset starting index - 1)
     OBJECT_INDEXIES_OFFSET = 1920
 
+    # size of pre-rendered map chunk's side (in tiles)
+    CHUNK_SIZE_IN_TILES = 8
 
-    def __init__(self, map_path, tileset_path, display_size_tuple, scale=1):
+    # approximate memory limit for all pre-rendered chunks (in bytes)
+    CHUNKS_MEMORY_LIMIT = 32 * 1024 * 1024
+
+
+    def __init__(self, map_path, tileset_path, display_size_tuple, scale=1,
+                                  compiled_map_path=None, cache_dir=None):
         """ Init.
 
             map_path:               path to map (JSON) file
             tileset_path:           path to tileset (image) file
             display_size_tuple:     (<screen width>, <screen height>)
             scale:                  1 or 2 (for 1x or 2x)
+            compiled_map_path:      path to binary map file. If it is
+                                    absent or stale, JSON map is parsed
+                                    and binary map is (re)written.
+                                    If None, JSON map is always parsed.
+            cache_dir:              directory for cached scaled tileset
+                                    atlas (or None, not to cache it)
         """
         # 1. Initialize basic attributes
 
         self.display_width, self.display_height = display_size_tuple
         self.scale = scale
-        self.bottom_buffer = {
-            CAMERA_COORDS: (0, 0),
-            SURFACE: Surface((self.display_width * 3, self.display_height * 3))
-        }
 
         # 2. Load map
 
-        with open(map_path) as f:
-            map_file_data = json.load(f)
-        layers = map_file_data['layers']
-        tile_size_origin = map_file_data['tileheight']
+        compiled_map = self._load_map(map_path, compiled_map_path)
+        layers = compiled_map.layers
 
-        self.tile_size = tile_size_origin * scale
+        self.tile_size = compiled_map.tile_size * scale
         self.objects_manager = ObjectsManager(cell_size=self.tile_size)
 
-        used_tiles = self._get_tiles_set_from_layers(layers)
+        # also, we need to use tiles, absent on layers, but used in objects.
+        used_tiles = compiled_map.used_tiles | \
+                         set(self.objects_manager.get_tiles_used_in_objects())
+
+        self.tileset = MapTileset(tileset_path, compiled_map.tile_size,
+                                              scale, used_tiles, cache_dir)
+        self._tiles_images = self.tileset.images
 
-        LayerCell.initialize(tileset_path, tile_size_origin, scale, used_tiles)
+        self.map_height_in_tiles = compiled_map.height
+        self.map_width_in_tiles = compiled_map.width
 
         self.layer_floor = self._get_map_from_layer(
                             layers[self.FLOOR_LAYER_NUM], LAYER_FLOOR)
@@ -76,16 +101,27 @@ class Map(object):
         self.layer_objects_top = self._get_map_from_layer(
                             layers[self.TOP_LAYER_NUM], LAYER_TOP)
 
-        self.map_height_in_tiles = len(self.layer_floor)
-        self.map_width_in_tiles = len(self.layer_floor[0])
+        # Tiled map data without tile layers (properties, object groups)
+        self.metadata = compiled_map.metadata
+
+        # collision rects insets (scaled) for tiles of objects layer
+        self._collision_insets = {}
+        for tile_num, special in TILES_COLLISIONS.items():
+            self._collision_insets[tile_num] = (
+                special[X] * scale,
+                special[Y] * scale,
+                special[WIDTH] * scale,
+                special[HEIGHT] * scale)
 
         # 3. Link objects with map cells.
 
-        objects_dict = self._get_objects_indexes_from_layer(
-                                              layers[self.OBJ_MARKS_LAYER_NUM])
-        for ((x, y), index) in objects_dict.items():
-            self.layer_objects[y][x].link_to_object(
-                               self.objects_manager.get_object_by_index(index))
+        # sparse table of links: {(X, Y): BaseObject instance}
+        self.objects_links = {}
+        for ((x, y), index) in compiled_map.objects_indexes.items():
+            object_ = self.objects_manager.get_object_by_index(index)
+            if object_ is not None:
+                object_.set_coords((x, y))
+                self.objects_links[(x, y)] = object_
 
         # 4. Form whole map rectangle borders (1 cell is border)
 
@@ -93,171 +129,179 @@ class Map(object):
         height = self.tile_size * (self.map_height_in_tiles - 2)
         self.rect = Rect(self.tile_size, self.tile_size, width, height)
 
+        # 5. Collision grid with solid rects of non-walkable cells
 
-    def make_bottom_buffer(self, camera_coords, direction=None, shift=0):
-        """ For perfomance improvment, we are using special buffer for:
-                - floor layer
-                - floor decorations layer
-                - bottom objects layer
-        that is huge 3x3 screen size sprite of 9 display screens and used
-        as a cache of bottom rendered map.
-
-        Such buffer is partially redrawn (up to 3 screens) when user go out
-        of it's borders.
+        self.collision_grid = CollisionGrid(
+                self.map_width_in_tiles, self.map_height_in_tiles,
+                self.tile_size, self.rect, self._get_collision_solids)
+        floor_walkable = self.layer_floor.walkable
+        objects_walkable = self.layer_objects.walkable
 
-        Current method makes whole buffer or it's part.
+        # 6. Pathfinder on navigation grid of walkable cells
 
-            camera_coords:   (<camera_x>, <camera_y>) for this moment
+        self.pathfinder = Pathfinder(NavGrid(
+                self.map_width_in_tiles, self.map_height_in_tiles,
+                floor_walkable, objects_walkable))
 
-            direction:       None, if we have to redraw all, or
-                             UP, DOWN, LEFT, RIGHT, if we have to redraw
-                             some part of buffer (player crossed up, left,
-                             etc. border of the buffer)
+        # 7. Split map into rooms, linked by doors
 
-            shift:           If player overlapped the border, this is length
-                             of such crossing in pixels (to correct redrawal)
-        """
-        camera_x, camera_y = camera_coords
-        old_camera_x, old_camera_y = self.bottom_buffer[CAMERA_COORDS]
+        doors = dict((coords, object_) for coords, object_ in
+                     self.objects_links.items()
+                     if isinstance(object_, SimpleDoor))
+        self.rooms = RoomGraph(
+                self.map_width_in_tiles, self.map_height_in_tiles,
+                self.pathfinder.nav_grid.walkable, doors)
+        self.rooms.set_labels(
+                self._get_rooms_labels(compiled_map.tile_size))
 
-        # if we partially redraw buffer, we have to remain another coord
-        if direction == RIGHT or direction == LEFT:
-            camera_y = old_camera_y
-        elif direction == UP or direction == DOWN:
-            camera_x = old_camera_x
+        # 8. Create cache of pre-rendered map chunks
 
-        # get left and top borders of the screen (relative to buffer)
-        left_x = camera_x - self.display_width // 2
-        top_y = camera_y - self.display_height // 2
+        self._map_pixels_rect = Rect(
+                                   0, 0,
+                                   self.tile_size * self.map_width_in_tiles,
+                                   self.tile_size * self.map_height_in_tiles)
 
-        size = self.tile_size
-        dx = left_x % size
-        dy = top_y % size
+        chunk_size = self.tile_size * self.CHUNK_SIZE_IN_TILES
+        self._chunks_count_x = -(-self.map_width_in_tiles //
+                                                      self.CHUNK_SIZE_IN_TILES)
+        self._chunks_count_y = -(-self.map_height_in_tiles //
+                                                      self.CHUNK_SIZE_IN_TILES)
 
-        buffer_surface = self.bottom_buffer[SURFACE]
+        # visible chunks together with one ring around them
+        # must stay in cache
+        min_chunks_count = \
+            (-(-self.display_width // chunk_size) + 3) * \
+            (-(-self.display_height // chunk_size) + 3)
 
-        # RIGHT scroll features
-        if direction == RIGHT:
-            left_cell = (left_x + self.display_width) // size
-            start_cell_x = self.display_width * 2 // size
-            buffer_surface.scroll(dx=-self.display_width - shift, dy=0)
-        else:
-            left_cell = (left_x - self.display_width) // size
-            start_cell_x = 0
+        self.bottom_chunks = MapChunksCache(
+            chunk_size=chunk_size,
+            memory_limit=self.CHUNKS_MEMORY_LIMIT,
+            min_chunks_count=min_chunks_count,
+            render_callback=self._render_chunk)
 
-        # LEFT scroll features
-        if direction == LEFT:
-            right_cell = left_x // size
-            buffer_surface.scroll(dx=self.display_width - shift, dy=0)
-        else:
-            right_cell = (left_x + 2 * self.display_width) // size
+        # 9. Index non-empty tiles of the top layer by chunks
 
-        # DOWN scroll features
-        if direction == DOWN:
-            top_cell = (top_y + self.display_height) // size
-            start_cell_y = self.display_height * 2 // size
-            buffer_surface.scroll(dx=0, dy=-self.display_height - shift)
-        else:
-            top_cell = (top_y - self.display_height) // size
-            start_cell_y = 0
+        self._top_tiles_index = {}
+        for x, y, tile_num in self.layer_objects_top.iter_non_empty():
+            self._index_top_tile(x, y, tile_num)
 
-        # UP scroll features
-        if direction == UP:
-            bottom_cell = top_y // size
-            buffer_surface.scroll(dx=0, dy=self.display_height - shift)
-        else:
-            bottom_cell = (top_y + 2 * self.display_height) // size
+        # 10. Tiles changes, collected for applying once per frame:
+        # {<layer type>: {(X, Y): <tile number>}}, and rects of the map
+        # (in pixels), changed by the last applying.
 
-        # draw background
-        buffer_cell_y = start_cell_y
-        for y_map in range(top_cell, bottom_cell + 1):
-            buffer_cell_x = start_cell_x
-            for x_map in range(left_cell, right_cell + 1):
-                coords = (buffer_cell_x * size - dx,
-                          buffer_cell_y * size - dy)
+        self._tiles_changes = {}
+        self.dirty_rects = []
 
-                floor_tile = self.layer_floor[y_map][x_map]
-                buffer_surface.blit(floor_tile.image, coords)
+        # 11. Subscribe to events
 
-                obj_tile = self.layer_objects[y_map][x_map]
-                if obj_tile.tile_number:
-                    buffer_surface.blit(obj_tile.image, coords)
+        event_bus.subscribe(EVENT_GAME_MAP_CHANGE_TILE_NUM,
+                            self._change_tiles_on_layers)
 
-                decor_tile = self.layer_floor_decor[y_map][x_map]
-                if decor_tile.tile_number:
-                    buffer_surface.blit(decor_tile.image, coords)
-                buffer_cell_x += 1
-            buffer_cell_y += 1
 
-        self.bottom_buffer[CAMERA_COORDS] = camera_x, camera_y
+    def make_bottom_buffer(self, camera_coords):
+        """ For perfomance improvment, we are using special cache of
+        pre-rendered map chunks for:
+                - floor layer
+                - floor decorations layer
+                - bottom objects layer
 
+        Every chunk is a square of CHUNK_SIZE_IN_TILES x CHUNK_SIZE_IN_TILES
+        tiles. Chunks are rendered on demand (or in advance, one per frame,
+        near visible area) and are kept in memory-bounded LRU cache.
 
-    def handle_event(self, event):
-        """Handle event.
-        If event is handled, return True, else False.
+        Current method drops whole cache and renders chunks, visible
+        with chosen camera position.
 
-            event:      pygame.event.Event instance
+            camera_coords:   (<camera_x>, <camera_y>) for this moment
         """
-        if event.type == pygame.USEREVENT:
+        self.bottom_chunks.clear()
+        for chunk_coords in self._get_visible_chunks(camera_coords):
+            self.bottom_chunks.render(chunk_coords)
 
-            if event.custom_type == EVENT_GAME_MAP_CHANGE_TILE_NUM:
-                self._change_tiles_on_layers(event.tiles)
-                return True
 
-        return False
+    def apply_tiles_changes(self):
+        """Apply tiles changes, collected since the previous call (have
+        to be called once per frame). Every cell is changed once, with
+        the last value, and cached chunks are redrawn by merged rects of
+        changed cells. These rects (in map pixels) are stored into
+        "dirty_rects" attribute.
+        """
+        self.dirty_rects = []
+        if not self._tiles_changes:
+            return
+        changes, self._tiles_changes = self._tiles_changes, {}
+
+        changed_cells = []
+        for (x, y), tile_num in changes.get(LAYER_TOP, {}).items():
+            if self.layer_objects_top.get(x, y) != tile_num:
+                self.layer_objects_top.set(x, y, tile_num)
+                if tile_num:
+                    self._index_top_tile(x, y, tile_num)
+                else:
+                    self._unindex_top_tile(x, y)
+                changed_cells.append((x, y))
+
+        bottom_cells = []
+        for (x, y), tile_num in changes.get(LAYER_OBJECTS, {}).items():
+            if self.layer_objects.get(x, y) != tile_num:
+                self.layer_objects.set(x, y, tile_num)
+                self.collision_grid.reset_cell(x, y)
+                self.pathfinder.set_cell_walkable(
+                                x, y, self.layer_floor.is_walkable(x, y) and
+                                      self.layer_objects.is_walkable(x, y))
+                bottom_cells.append((x, y))
+
+        for rect in self._merge_cells(bottom_cells):
+            self._update_rect_on_bottom_buffer(rect)
+
+        size = self.tile_size
+        self.dirty_rects = [
+            Rect(x * size, y * size, width * size, height * size)
+            for x, y, width, height in self._merge_cells(
+                                          set(changed_cells + bottom_cells))]
 
 
     def draw_bottom_layers(self, screen, camera_coords):
-        """ Draw screen part of buffered layers:
+        """ Draw screen part of cached layers:
                 - floor layer
                 - floor decorations layer
                 - bottom objects layer
 
+        Absent visible chunks are rendered immediately. If there were no
+        such chunks, one of absent chunks around visible area is rendered
+        in advance, so scrolling is spread between frames.
+
             screen:             screen's Surface
             camera_coords:      current camera coords
         """
         camera_x, camera_y = camera_coords
-        old_camera_x, old_camera_y = self.bottom_buffer[CAMERA_COORDS]
-
-        # get difference between current camera position
-        # and camera position on the moment when buffer created
-        shift_x = camera_x - old_camera_x
-        shift_y = camera_y - old_camera_y
-
-        # if crossed RIGHT border of the buffer...
-        if shift_x > self.display_width:
-            outline = shift_x - self.display_width
-            self.make_bottom_buffer(camera_coords, RIGHT, outline)
-            return self.draw_bottom_layers(screen, camera_coords)
-        # ...or crossed LEFT border of the buffer...
-        elif shift_x < -self.display_width:
-            outline = shift_x + self.display_width
-            self.make_bottom_buffer(camera_coords, LEFT, outline)
-            return self.draw_bottom_layers(screen, camera_coords)
-        # ...or crossed BOTTOM border of the buffer...
-        elif shift_y > self.display_height:
-            outline = shift_y - self.display_height
-            self.make_bottom_buffer(camera_coords, DOWN, outline)
-            return self.draw_bottom_layers(screen, camera_coords)
-        # ...or crossed TOP border of the buffer...
-        elif shift_y < -self.display_height:
-            outline = shift_y + self.display_height
-            self.make_bottom_buffer(camera_coords, UP, outline)
-            return self.draw_bottom_layers(screen, camera_coords)
-
-        surface = self.bottom_buffer[SURFACE]
-        rect = Rect(self.display_width + shift_x,
-                    self.display_height + shift_y,
-                    self.display_width,
-                    self.display_height)
-        screen.blit(surface.subsurface(rect), (0, 0))
+        left_x = camera_x - self.display_width // 2
+        top_y = camera_y - self.display_height // 2
+
+        if not self._map_pixels_rect.contains(
+                (left_x, top_y, self.display_width, self.display_height)):
+            screen.fill(BLACK)
+
+        chunk_size = self.bottom_chunks.chunk_size
+        was_rendered = False
+        for chunk_coords in self._get_visible_chunks(camera_coords):
+            if not was_rendered and chunk_coords not in self.bottom_chunks:
+                was_rendered = True
+            chunk_x, chunk_y = chunk_coords
+            screen.blit(self.bottom_chunks.get(chunk_coords),
+                        (chunk_x * chunk_size - left_x,
+                         chunk_y * chunk_size - top_y))
+
+        if not was_rendered:
+            self._prerender_chunk_near(camera_coords)
 
 
     def draw_top_layer(self, screen, camera_coords):
         """ Draw top decorative layer on screen.
         Note, that this layer not buffered and redraw by tiles
-        every frame.
-        So, it is a good practice when number of such tiles is minimal.
+        every frame. Only non-empty tiles of visible chunks are drawn
+        (through sparse index of top tiles), so the cost depends on
+        number of such tiles, not on the screen area.
 
             screen:             screen's Surface
             camera_coords:      current camera coords
@@ -267,17 +311,15 @@ class Map(object):
         shift_x = camera_x - self.display_width // 2
         shift_y = camera_y - self.display_height // 2
         size = self.tile_size
+        images = self._tiles_images
 
-        left_cell = shift_x // self.tile_size
-        top_cell = shift_y // self.tile_size
-        right_cell = (shift_x + self.display_width) // self.tile_size
-        bottom_cell = (shift_y + self.display_height) // self.tile_size
-
-        for y in range(top_cell, bottom_cell + 1):
-            for x in range(left_cell, right_cell + 1):
-                if self.layer_objects_top[y][x].tile_number:
-                    tile = self.layer_objects_top[y][x].image
-                    screen.blit(tile, (x*size - shift_x, y*size - shift_y))
+        for chunk_coords in self._get_visible_chunks(camera_coords):
+            chunk_tiles = self._top_tiles_index.get(chunk_coords)
+            if not chunk_tiles:
+                continue
+            for (x, y), tile_num in chunk_tiles.items():
+                screen.blit(images[tile_num],
+                            (x*size - shift_x, y*size - shift_y))
 
 
     def get_first_walkable_cell_coords(self):
@@ -289,113 +331,120 @@ class Map(object):
 ##        BOUNDS = 5
 ##        for y in range(self.map_height_in_tiles):
 ##            for x in range(self.map_width_in_tiles):
-##                 if self.layer_floor[y][x].is_walkable and \
-##                                       self.layer_objects[y][x].is_walkable:
+##                 if self.layer_floor.is_walkable(x, y) and \
+##                                       self.layer_objects.is_walkable(x, y):
 ##                    return x * self.tile_size + BOUNDS, \
 ##                           y * self.tile_size + BOUNDS
 
 
-    def get_cells_to_verification(self, char_rect):
-        """Return tuple of four cell's pairs around current char position.
-        Every pair contains floor and object layer's cells.
+    def _get_rooms_labels(self, tile_size):
+        """Return list of text labels of the map's object layers:
+        (<text>, (<X>, <Y>)), where coords are cell of label's center.
 
-            char_rect:      Rect instance with char's position
+            tile_size:  size of tile in map file (not scaled)
+        """
+        labels = []
+        for layer in self.metadata.get('layers', ()):
+            for object_ in layer.get('objects', ()):
+                text = object_.get('text', {}).get('text')
+                if text:
+                    x = object_['x'] + object_.get('width', 0) / 2.0
+                    y = object_['y'] + object_.get('height', 0) / 2.0
+                    labels.append(
+                        (text, (int(x // tile_size), int(y // tile_size))))
+        return labels
+
+
+    def _get_collision_solids(self, x, y):
+        """Return solid rects of the cell for collision grid: tuple of
+        (<Rect>, <is object>) pairs for non-walkable object (with
+        collision insets of it's tile) and non-walkable floor.
+
+            x, y:       cell coords (in tiles)
         """
-        top = char_rect.y // self.tile_size
-        left = char_rect.x // self.tile_size
+        index = y * self.map_width_in_tiles + x
+        size = self.tile_size
+        solids = []
 
-        floor = self.layer_floor
-        objects = self.layer_objects
+        if not self.layer_objects.walkable[index]:
+            object_rect = Rect(x * size, y * size, size, size)
+            # correction of collisions map for some sprites
+            insets = self._collision_insets.get(
+                                             self.layer_objects.tiles[index])
+            if insets:
+                inset_x, inset_y, inset_width, inset_height = insets
+                object_rect.x += inset_x
+                object_rect.y += inset_y
+                object_rect.width -= inset_width
+                object_rect.height -= inset_height
+            solids.append((object_rect, True))
 
-        return ((floor[top][left],          objects[top][left]),
-                (floor[top + 1][left],      objects[top + 1][left]),
-                (floor[top][left + 1],      objects[top][left + 1]),
-                (floor[top + 1][left + 1],  objects[top + 1][left + 1]))
+        if not self.layer_floor.walkable[index]:
+            solids.append((Rect(x * size, y * size, size, size), False))
 
+        return tuple(solids)
 
-    def _get_map_from_layer(self, layer, layer_type):
-        """Scan layer for tiles numbers.
 
-            layer:        dictionary of Tiled JSON map format with layer data
-            layer_type:   enum of layer's type
+    def _load_map(self, map_path, compiled_map_path):
+        """Load binary map, if it is up to date, or parse JSON map.
+        Return CompiledMap instance.
 
-        Return layer map in format:
-            [
-                [LayerCell, LayerCell, ....],
-                [LayerCell, LayerCell, ....],
-                ...
-            ]
+            map_path:               path to map (JSON) file
+            compiled_map_path:      path to binary map file (or None)
         """
-        layer_map, row, x, y = [], [], 0, 0
-        for tile_num in layer['data']:
-            if layer_type == LAYER_FLOOR:
-                is_walkable = tile_num not in self.STOPPABLES_FLOOR
-                cell = FloorCell(x, y, tile_num, is_walkable)
-            elif layer_type == LAYER_OBJECTS:
-                is_walkable = tile_num == self.WALKABLE_OBJ
-                cell = ObjectCell(x, y, tile_num, is_walkable)
-            else:
-                is_walkable = True
-                cell = LayerCell(x, y, tile_num)
-            row.append(cell)
-
-            x += 1
-            if x == layer['width']:
-                layer_map.append(row)
-                row, x = [], 0
-                y += 1
-        return layer_map
-
-
-    def _get_tiles_set_from_layers(self, layers_list):
-        """Scan layers for tiles numbers. Return set of this numbers.
-        Used to identify actually used tiles and prevent to load
-        useless ones.
-
-            layers_list:     list of dictionaries in Tiled JSON map
-                             format with layers data.
+        compiled_map = None
+        if compiled_map_path:
+            compiled_map = load_compiled_map(compiled_map_path, map_path,
+                                             self.OBJ_MARKS_LAYER_NUM,
+                                             self.OBJECT_INDEXIES_OFFSET)
+        if compiled_map is None:
+            compiled_map = compile_map(map_path, compiled_map_path,
+                                       self.OBJ_MARKS_LAYER_NUM,
+                                       self.OBJECT_INDEXIES_OFFSET)
+        return compiled_map
+
+
+    def _get_map_from_layer(self, tiles, layer_type):
+        """Make map layer object.
+
+            tiles:        array (or memoryview) of tiles numbers
+            layer_type:   enum of layer's type
+
+        Return WalkableTileLayer instance for floor and objects layers,
+        and TileLayer instance for others.
         """
-        tiles = set()
-        for layer in layers_list:
-            # only tiled layers:
-            if 'data' in layer:
-                tiles.update(set(layer['data']))
-        # also, we need to use tiles, absent on layers, but used in
-        # objects.
-        tiles.update(self.objects_manager.get_tiles_used_in_objects())
-        return tiles
+        width, height = self.map_width_in_tiles, self.map_height_in_tiles
+        if layer_type == LAYER_FLOOR:
+            return WalkableTileLayer(width, height, tiles,
+                                     self._is_walkable_floor_tile)
+        elif layer_type == LAYER_OBJECTS:
+            return WalkableTileLayer(width, height, tiles,
+                                     self._is_walkable_object_tile)
+        else:
+            return TileLayer(width, height, tiles)
 
 
-    def _get_objects_indexes_from_layer(self, layer):
-        """Scan layer for tiles numbers.
-        Those tile numbers actually are indexies to mark special objects.
+    def _is_walkable_floor_tile(self, tile_num):
+        """Return True, if floor tile could be walked through.
 
-            layer:        dictionary of Tiled JSON map format with layer data
+            tile_num:     tile number
+        """
+        return tile_num not in self.STOPPABLES_FLOOR
+
+
+    def _is_walkable_object_tile(self, tile_num):
+        """Return True, if object tile could be walked through.
 
-        Return dictionary, where key is tuple of coords (X, Y), and
-        value is index of the tile.
+            tile_num:     tile number
         """
-        width = layer['width']
-        objects = {}
-        control_set = {}
-        for q, tile_num in enumerate(layer['data']):
-            if tile_num:
-                y, x = divmod(q, width)
-                obj_num = tile_num - self.OBJECT_INDEXIES_OFFSET
-                if obj_num in control_set:
-                    raise RuntimeError(
-                        'Duplicate object number on map! '
-                        '#%d : %s and (%d, %d)' %
-                        (obj_num, str(control_set[obj_num]), x, y))
-                else:
-                    control_set[obj_num] = (x, y)
-                objects[(x, y)] = obj_num
-        return objects
+        return tile_num == self.WALKABLE_OBJ
 
 
     def _change_tiles_on_layers(self, tiles):
         """
-        Change tiles numbers (and images) on game map layers.
+        Collect changes of tiles numbers (and images) on game map layers.
+        Changes are applied by apply_tiles_changes() method (the last
+        change of the cell wins).
 
             tiles:          dictionary in format:
 
@@ -404,67 +453,201 @@ class Map(object):
                     (X, Y) tuple of tile coords, in tiles : <new tile number>
                 }
         """
-        if LAYER_TOP in tiles:
-            for (x, y), tile_num in tiles[LAYER_TOP].items():
-                self.layer_objects_top[y][x].set_tile(tile_num)
+        for layer_type in (LAYER_TOP, LAYER_OBJECTS):
+            if layer_type in tiles:
+                self._tiles_changes.setdefault(layer_type, {}).update(
+                                                           tiles[layer_type])
+
+
+    @staticmethod
+    def _merge_cells(cells_coords_list):
+        """Merge cells into rects: horizontal runs of cells first, then
+        runs of the same position and width in adjacent rows.
+        Return list of tuples (X, Y, <width>, <height>) (in tiles).
+
+            cells_coords_list:  list of tuples (X, Y) of cells coords
+        """
+        rows = {}
+        for x, y in cells_coords_list:
+            rows.setdefault(y, []).append(x)
+
+        # {(X, <width>): [X, Y, <width>, <height>]} of rects, that could
+        # be continued on the next row
+        open_rects = {}
+        rects = []
+        for y in sorted(rows):
+            xs = sorted(rows[y])
+            runs = []
+            start = previous = xs[0]
+            for x in xs[1:]:
+                if x != previous + 1:
+                    runs.append((start, previous - start + 1))
+                    start = x
+                previous = x
+            runs.append((start, previous - start + 1))
+
+            continued_rects = {}
+            for run in runs:
+                rect = open_rects.pop(run, None)
+                if rect is not None and rect[1] + rect[3] == y:
+                    rect[3] += 1
+                else:
+                    rect = [run[0], y, run[1], 1]
+                    rects.append(rect)
+                continued_rects[run] = rect
+            open_rects = continued_rects
+
+        return [tuple(rect) for rect in rects]
+
+
+    def _index_top_tile(self, x, y, tile_num):
+        """Add cell of top layer to the sparse index of top tiles.
+
+            x, y:       cell coords on map (in tiles)
+            tile_num:   tile number of the cell
+        """
+        chunk_coords = (x // self.CHUNK_SIZE_IN_TILES,
+                        y // self.CHUNK_SIZE_IN_TILES)
+        self._top_tiles_index.setdefault(chunk_coords, {})[(x, y)] = tile_num
 
-        if LAYER_OBJECTS in tiles:
-            for (x, y), tile_num in tiles[LAYER_OBJECTS].items():
-                self.layer_objects[y][x].set_tile(
-                    tile_num,
-                    walkable=(tile_num == self.WALKABLE_OBJ))
-            self._update_cells_on_bottom_buffer(tiles[LAYER_OBJECTS].keys())
+
+    def _unindex_top_tile(self, x, y):
+        """Remove cell of top layer from the sparse index of top tiles.
+
+            x, y:       cell coords on map (in tiles)
+        """
+        chunk_coords = (x // self.CHUNK_SIZE_IN_TILES,
+                        y // self.CHUNK_SIZE_IN_TILES)
+        chunk_tiles = self._top_tiles_index.get(chunk_coords)
+        if chunk_tiles:
+            chunk_tiles.pop((x, y), None)
+            if not chunk_tiles:
+                del self._top_tiles_index[chunk_coords]
 
 
-    def _update_cells_on_bottom_buffer(self, cells_coords_list):
+    def _update_rect_on_bottom_buffer(self, cells_rect):
         """As you know, For perfomance improvment, we are using special
-        buffer for:
+        cache of pre-rendered map chunks for:
                 - floor layer
                 - floor decorations layer
                 - bottom objects layer
-        that is huge 3x3 screen size sprite of 9 display screens and used
-        as a cache of bottom rendered map.
 
         Somehow we need to change tiles numbers for some cells. Of
-        course, we need to redraw this cells on buffer (without
-        redrawal whole buffer). This method do this.
+        course, we need to redraw this cells on cached chunks (without
+        redrawal whole chunks). This method do this. Not cached chunks
+        are skipped: they will be rendered with actual tiles later.
 
-            cells_coords_list:  list of tuples (X, Y) of cells coords,
-                                we have to update.
+            cells_rect:     (X, Y, <width>, <height>) rect of cells,
+                            we have to update (in tiles)
         """
-        camera_x, camera_y = self.bottom_buffer[CAMERA_COORDS]
+        size = self.tile_size
+        chunk_tiles = self.CHUNK_SIZE_IN_TILES
+        left, top, width, height = cells_rect
+
+        for y_map in range(top, top + height):
+            chunk_y, y_in_chunk = divmod(y_map, chunk_tiles)
+            for x_map in range(left, left + width):
+                chunk_x, x_in_chunk = divmod(x_map, chunk_tiles)
+                surface = self.bottom_chunks.get_cached((chunk_x, chunk_y))
+                if surface is not None:
+                    self._draw_bottom_cell(
+                               surface, x_map, y_map,
+                               (x_in_chunk * size, y_in_chunk * size))
+
+
+    def _render_chunk(self, surface, chunk_x, chunk_y):
+        """Draw bottom layers of the map chunk on the surface.
+        Callback for MapChunksCache.
+
+            surface:            chunk's Surface
+            chunk_x, chunk_y:   chunk coords (in chunks)
+        """
+        size = self.tile_size
+        chunk_tiles = self.CHUNK_SIZE_IN_TILES
 
-        # get left and top borders of the screen (relative to buffer)
-        left_x = camera_x - self.display_width // 2
-        top_y = camera_y - self.display_height // 2
+        left_cell = chunk_x * chunk_tiles
+        top_cell = chunk_y * chunk_tiles
+        right_cell = min(left_cell + chunk_tiles, self.map_width_in_tiles)
+        bottom_cell = min(top_cell + chunk_tiles, self.map_height_in_tiles)
 
-        size = self.tile_size
-        dx = left_x % size
-        dy = top_y % size
+        # chunks on the map edges are partially empty
+        if right_cell - left_cell < chunk_tiles or \
+                                        bottom_cell - top_cell < chunk_tiles:
+            surface.fill(BLACK)
 
-        buffer_surface = self.bottom_buffer[SURFACE]
+        for y_map in range(top_cell, bottom_cell):
+            y = (y_map - top_cell) * size
+            for x_map in range(left_cell, right_cell):
+                self._draw_bottom_cell(surface, x_map, y_map,
+                                       ((x_map - left_cell) * size, y))
 
-        left_cell = (left_x - self.display_width) // size
-        right_cell = (left_x + 2 * self.display_width) // size
-        top_cell = (top_y - self.display_height) // size
-        bottom_cell = (top_y + 2 * self.display_height) // size
 
-        for x_map, y_map in cells_coords_list:
-            if (x_map < left_cell or x_map > right_cell or
-                                      y_map < top_cell or y_map > bottom_cell):
-                continue
-            # draw background cell
-            coords = ((x_map - left_cell) * size - dx,
-                      (y_map - top_cell) * size - dy)
+    def _draw_bottom_cell(self, surface, x_map, y_map, coords):
+        """Draw all bottom layers of a single map cell on the surface.
+
+            surface:        target Surface
+            x_map, y_map:   cell coords on map (in tiles)
+            coords:         (X, Y) position on surface (in pixels)
+        """
+        images = self._tiles_images
+        index = y_map * self.map_width_in_tiles + x_map
+
+        surface.blit(images[self.layer_floor.tiles[index]], coords)
+
+        obj_tile = self.layer_objects.tiles[index]
+        if obj_tile:
+            surface.blit(images[obj_tile], coords)
 
-            floor_tile = self.layer_floor[y_map][x_map]
-            buffer_surface.blit(floor_tile.image, coords)
+        decor_tile = self.layer_floor_decor.tiles[index]
+        if decor_tile:
+            surface.blit(images[decor_tile], coords)
 
-            obj_tile = self.layer_objects[y_map][x_map]
-            if obj_tile.tile_number:
-                buffer_surface.blit(obj_tile.image, coords)
 
-            decor_tile = self.layer_floor_decor[y_map][x_map]
-            if decor_tile.tile_number:
-                buffer_surface.blit(decor_tile.image, coords)
+    def _get_visible_chunks(self, camera_coords, border=0):
+        """Return list of coords of the chunks, visible on the screen.
+        Chunks out of map are skipped.
 
+            camera_coords:      current camera coords
+            border:             count of additional chunks rings around
+                                visible area
+        """
+        camera_x, camera_y = camera_coords
+        chunk_size = self.bottom_chunks.chunk_size
+        left_x = camera_x - self.display_width // 2
+        top_y = camera_y - self.display_height // 2
+
+        left = max(left_x // chunk_size - border, 0)
+        top = max(top_y // chunk_size - border, 0)
+        right = min((left_x + self.display_width - 1) // chunk_size + border,
+                    self._chunks_count_x - 1)
+        bottom = min((top_y + self.display_height - 1) // chunk_size + border,
+                     self._chunks_count_y - 1)
+
+        return [(x, y) for y in range(top, bottom + 1)
+                                               for x in range(left, right + 1)]
+
+
+    def _prerender_chunk_near(self, camera_coords):
+        """Render one absent chunk around visible area (the nearest to
+        the camera), so it will be ready, when player comes closer.
+
+            camera_coords:      current camera coords
+        """
+        camera_x, camera_y = camera_coords
+        half_chunk = self.bottom_chunks.chunk_size // 2
+        nearest, nearest_distance = None, None
+
+        for chunk_coords in self._get_visible_chunks(camera_coords, border=1):
+            if chunk_coords in self.bottom_chunks:
+                continue
+            chunk_x, chunk_y = chunk_coords
+            distance = \
+                abs(chunk_x * self.bottom_chunks.chunk_size + half_chunk -
+                                                               camera_x) + \
+                abs(chunk_y * self.bottom_chunks.chunk_size + half_chunk -
+                                                               camera_y)
+            if nearest is None or distance < nearest_distance:
+                nearest, nearest_distance = chunk_coords, distance
+
+        if nearest is not None:
+            self.bottom_chunks.render(nearest)
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Precompiled binary format of game map.
+----------------------------------------------------------"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+from array import array
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+# Binary map file format (all integers are unsigned, header is
+# little-endian, arrays are in native byte order, stored in header):
+#
+#   header              (see HEADER below)
+#   tile layers         <layers count> arrays of <width * height> uint16
+#   used tiles          <used tiles count> uint16
+#   objects table       <objects count> triples of uint32: X, Y, index
+#   metadata            UTF-8 JSON: Tiled map without tile layers data
+#
+# Every section is aligned to 4 bytes.
+
+MAGIC = b'SSMAP\x00'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct(
+    '<'
+    '6s'        # magic
+    'H'         # format version
+    '1s'        # byte order of arrays: b'l' or b'b'
+    '20s'       # SHA-1 of source JSON file
+    'H'         # map width (in tiles)
+    'H'         # map height (in tiles)
+    'H'         # tile size (in pixels)
+    'H'         # tile layers count
+    'H'         # objects marks layer number
+    'H'         # objects indexes offset
+    'I'         # used tiles count
+    'I'         # objects count
+    'I'         # metadata size (in bytes)
+)
+
+BYTE_ORDER = b'l' if sys.byteorder == 'little' else b'b'
+
+# ======================== COMPILED MAP CLASS =============================== #
+
+
+class CompiledMap(object):
+    """Game map data, ready to use by Map class.
+    Could be made from Tiled JSON map (compile_map() function) or
+    loaded from binary file (load_compiled_map() function).
+
+    Attributes:
+
+        width, height:      map size (in tiles)
+        tile_size:          size of tile (in pixels, not scaled)
+        layers:             list of tile layers (only tile ones, in map
+                            order). Every layer is array or memoryview
+                            of uint16 tiles numbers, row by row.
+        used_tiles:         set of tiles numbers, used on tile layers
+        objects_indexes:    dict {(X, Y): <object index>}
+        metadata:           dictionary of Tiled JSON map without tile
+                            layers data (map properties, object groups)
+    """
+    def __init__(self, width, height, tile_size, layers, used_tiles,
+                                                   objects_indexes, metadata):
+        """Init.
+        """
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.layers = layers
+        self.used_tiles = used_tiles
+        self.objects_indexes = objects_indexes
+        self.metadata = metadata
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Compiled map %dx%d' % (self.width, self.height)
+
+
+# ------------------------------ COMPILING ---------------------------------- #
+
+
+def compile_map(json_path, binary_path, marks_layer_num, objects_offset):
+    """Parse Tiled JSON map and save it as binary map file.
+    Return CompiledMap instance.
+
+    If binary file could not be written, the error is ignored (map is
+    compiled again on next launch).
+
+        json_path:          path to Tiled JSON map file
+        binary_path:        path to binary map file (or None, if it is
+                            not needed to be saved)
+        marks_layer_num:    order number of tile layer with objects marks
+        objects_offset:     objects marks tiles offset (mark tile number
+                            minus this offset is an object index)
+    """
+    with open(json_path, 'rb') as f:
+        source = f.read()
+    map_file_data = json.loads(source.decode('utf-8'))
+
+    tile_layers = [layer for layer in map_file_data['layers']
+                                                            if 'data' in layer]
+    width = map_file_data['width']
+    height = map_file_data['height']
+
+    layers = []
+    used_tiles = set()
+    for layer in tile_layers:
+        if (layer['width'], layer['height']) != (width, height):
+            raise RuntimeError('Map layer "%s" has incorrect size!' %
+                                                                layer['name'])
+        layers.append(array('H', layer['data']))
+        used_tiles.update(layer['data'])
+
+    objects_indexes = _get_objects_indexes_from_layer(
+                                  tile_layers[marks_layer_num], objects_offset)
+
+    metadata = dict(map_file_data)
+    metadata['layers'] = [layer for layer in map_file_data['layers']
+                                                        if 'data' not in layer]
+
+    compiled_map = CompiledMap(
+        width=width,
+        height=height,
+        tile_size=map_file_data['tileheight'],
+        layers=layers,
+        used_tiles=used_tiles,
+        objects_indexes=objects_indexes,
+        metadata=metadata)
+
+    if binary_path:
+        try:
+            _save_compiled_map(compiled_map, binary_path,
+                               hashlib.sha1(source).digest(),
+                               marks_layer_num, objects_offset)
+        except (IOError, OSError):
+            pass
+
+    return compiled_map
+
+
+def _get_objects_indexes_from_layer(layer, objects_offset):
+    """Scan layer for tiles numbers.
+    Those tile numbers actually are indexies to mark special objects.
+
+        layer:              dictionary of Tiled JSON map format with
+                            layer data
+        objects_offset:     objects marks tiles offset
+
+    Return dictionary, where key is tuple of coords (X, Y), and
+    value is index of the tile.
+    """
+    width = layer['width']
+    objects = {}
+    control_set = {}
+    for q, tile_num in enumerate(layer['data']):
+        if tile_num:
+            y, x = divmod(q, width)
+            obj_num = tile_num - objects_offset
+            if obj_num in control_set:
+                raise RuntimeError(
+                    'Duplicate object number on map! '
+                    '#%d : %s and (%d, %d)' %
+                    (obj_num, str(control_set[obj_num]), x, y))
+            else:
+                control_set[obj_num] = (x, y)
+            objects[(x, y)] = obj_num
+    return objects
+
+
+def _save_compiled_map(compiled_map, binary_path, source_hash,
+                                             marks_layer_num, objects_offset):
+    """Write binary map file.
+    File is written under temporary name and renamed after, so
+    partially written file is never used.
+
+        compiled_map:       CompiledMap instance
+        binary_path:        path to binary map file
+        source_hash:        SHA-1 digest of source JSON file
+        marks_layer_num:    order number of tile layer with objects marks
+        objects_offset:     objects marks tiles offset
+    """
+    used_tiles = array('H', sorted(compiled_map.used_tiles))
+    objects_table = array('I')
+    for (x, y), index in sorted(compiled_map.objects_indexes.items()):
+        objects_table.extend((x, y, index))
+    metadata = json.dumps(compiled_map.metadata).encode('utf-8')
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        BYTE_ORDER,
+        source_hash,
+        compiled_map.width,
+        compiled_map.height,
+        compiled_map.tile_size,
+        len(compiled_map.layers),
+        marks_layer_num,
+        objects_offset,
+        len(used_tiles),
+        len(compiled_map.objects_indexes),
+        len(metadata))
+
+    temp_path = binary_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        for section in [header] + list(compiled_map.layers) + \
+                                       [used_tiles, objects_table, metadata]:
+            data = section.tobytes() if isinstance(section, array) \
+                                                                  else section
+            f.write(data)
+            f.write(b'\x00' * (-len(data) % 4))
+    os.replace(temp_path, binary_path)
+
+
+# ------------------------------- LOADING ----------------------------------- #
+
+
+def load_compiled_map(binary_path, json_path, marks_layer_num,
+                                                              objects_offset):
+    """Memory-map binary map file.
+    Return CompiledMap instance, or None, if binary file is absent,
+    broken or stale (made from another version of JSON map, by another
+    format version or with another parameters).
+
+    Layers are copy-on-write memoryviews of the file: changing them
+    doesn't affect the file.
+
+        binary_path:        path to binary map file
+        json_path:          path to source Tiled JSON map file
+        marks_layer_num:    order number of tile layer with objects marks
+        objects_offset:     objects marks tiles offset
+    """
+    try:
+        with open(json_path, 'rb') as f:
+            source_hash = hashlib.sha1(f.read()).digest()
+        with open(binary_path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+
+    (magic, version, byte_order, stored_hash, width, height, tile_size,
+     layers_count, stored_marks_layer_num, stored_objects_offset,
+     used_tiles_count, objects_count, metadata_size
+     ) = HEADER.unpack_from(data, 0)
+
+    if (magic, version, byte_order, stored_hash,
+            stored_marks_layer_num, stored_objects_offset) != \
+            (MAGIC, FORMAT_VERSION, BYTE_ORDER, source_hash,
+             marks_layer_num, objects_offset):
+        return None
+
+    layer_size = width * height * 2
+    offsets = [HEADER.size + -HEADER.size % 4]
+    for size in [layer_size] * layers_count + \
+                         [used_tiles_count * 2, objects_count * 12]:
+        offsets.append(offsets[-1] + size + -size % 4)
+    if offsets[-1] + metadata_size > len(data):
+        return None
+
+    view = memoryview(data)
+    layers = [view[offsets[q]:offsets[q] + layer_size].cast('H')
+                                                  for q in range(layers_count)]
+
+    start = offsets[layers_count]
+    used_tiles = set(view[start:start + used_tiles_count * 2].cast('H'))
+
+    start = offsets[layers_count + 1]
+    objects_table = view[start:start + objects_count * 12].cast('I')
+    objects_indexes = {}
+    for q in range(0, len(objects_table), 3):
+        x, y, index = objects_table[q:q + 3]
+        objects_indexes[(x, y)] = index
+
+    start = offsets[layers_count + 2]
+    metadata = json.loads(
+                      bytes(data[start:start + metadata_size]).decode('utf-8'))
+
+    return CompiledMap(
+        width=width,
+        height=height,
+        tile_size=tile_size,
+        layers=layers,
+        used_tiles=used_tiles,
+        objects_indexes=objects_indexes,
+        metadata=metadata)
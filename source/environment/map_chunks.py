@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: LRU cache of pre-rendered game map chunks
+----------------------------------------------------------"""
+
+from collections import OrderedDict
+
+from pygame import Surface
+
+
+# ======================== MAP CHUNKS CACHE CLASS =========================== #
+
+
+class MapChunksCache(object):
+    """Memory-bounded LRU cache of square map chunks.
+    Every chunk is a Surface with pre-rendered bottom layers of the map
+    (floor, floor decorations and bottom objects), keyed by chunk
+    coords (<chunk X>, <chunk Y>).
+
+    Chunks are drawn by external callback, so cache knows nothing
+    about map layers. When cache is full, least recently used chunk is
+    dropped, and it's Surface is reused for the new one.
+    """
+    def __init__(self, chunk_size, memory_limit, min_chunks_count,
+                                                            render_callback):
+        """Init.
+
+            chunk_size:         side of chunk in pixels
+            memory_limit:       approximate memory limit for all chunks
+                                surfaces (in bytes)
+            min_chunks_count:   chunks count, that cache must hold in any
+                                case (whatever memory limit is)
+            render_callback:    function(surface, chunk_x, chunk_y), that
+                                draws map chunk on the surface
+        """
+        self.chunk_size = chunk_size
+        self._render_callback = render_callback
+        self._chunks = OrderedDict()
+
+        # chunks have no transparency, so display format is used
+        self._bytes_per_chunk = chunk_size * chunk_size * \
+                                       self._make_surface().get_bytesize()
+        self.capacity = max(memory_limit // self._bytes_per_chunk,
+                            min_chunks_count)
+
+
+    def get(self, chunk_coords):
+        """Return chunk's Surface. Render it, if it is absent in cache.
+
+            chunk_coords:       (<chunk X>, <chunk Y>)
+        """
+        surface = self._chunks.get(chunk_coords)
+        if surface is not None:
+            self._chunks.move_to_end(chunk_coords)
+            return surface
+        return self.render(chunk_coords)
+
+
+    def get_cached(self, chunk_coords):
+        """Return chunk's Surface, if it is cached, else None.
+        Doesn't affect chunks usage order.
+
+            chunk_coords:       (<chunk X>, <chunk Y>)
+        """
+        return self._chunks.get(chunk_coords)
+
+
+    def render(self, chunk_coords):
+        """Render chunk (even if it is already cached) and return it.
+
+            chunk_coords:       (<chunk X>, <chunk Y>)
+        """
+        surface = self._chunks.pop(chunk_coords, None)
+        if surface is None:
+            if len(self._chunks) >= self.capacity:
+                # reuse surface of the least recently used chunk
+                _, surface = self._chunks.popitem(last=False)
+            else:
+                surface = self._make_surface()
+
+        self._render_callback(surface, *chunk_coords)
+        self._chunks[chunk_coords] = surface
+        return surface
+
+
+    def clear(self):
+        """Drop all chunks.
+        """
+        self._chunks.clear()
+
+
+    def _make_surface(self):
+        """Create new empty chunk Surface in display format.
+        """
+        return Surface((self.chunk_size, self.chunk_size)).convert()
+
+
+    def __contains__(self, chunk_coords):
+        """Check, if chunk is cached.
+        """
+        return chunk_coords in self._chunks
+
+
+    def __len__(self):
+        """Return number of cached chunks.
+        """
+        return len(self._chunks)
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Map chunks cache: %d of %d' % (len(self), self.capacity)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Game map's layers, stored in compact arrays.
+----------------------------------------------------------"""
+
+from array import array
+
+
+# ========================== TILE LAYER CLASS =============================== #
+
+
+class TileLayer(object):
+    """ Single layer of the game map.
+    Tiles numbers are stored in flat array of unsigned 16-bit integers,
+    row by row: cell (X, Y) has index <Y * width + X>.
+    """
+    def __init__(self, width, height, tiles):
+        """ Init.
+
+            width, height:  layer size (in tiles)
+            tiles:          iterable of tiles numbers (row by row).
+                            Array or memoryview of uint16 is used as is,
+                            without copying.
+        """
+        self.width = width
+        self.height = height
+        if isinstance(tiles, array) and tiles.typecode == 'H' or \
+                        isinstance(tiles, memoryview) and tiles.format == 'H':
+            self.tiles = tiles
+        else:
+            self.tiles = array('H', tiles)
+        if len(self.tiles) != width * height:
+            raise RuntimeError('Incorrect size of map layer!')
+
+
+    def get(self, x, y):
+        """Return tile number of the cell.
+
+            x, y:           cell coords (in tiles)
+        """
+        return self.tiles[y * self.width + x]
+
+
+    def set(self, x, y, tile_num):
+        """Change tile number of the cell.
+
+            x, y:           cell coords (in tiles)
+            tile_num:       new tile number
+        """
+        self.tiles[y * self.width + x] = tile_num
+
+
+    def iter_non_empty(self):
+        """Iterate over non-empty cells of the layer.
+        Yield tuples (X, Y, <tile number>).
+        """
+        width = self.width
+        for index, tile_num in enumerate(self.tiles):
+            if tile_num:
+                y, x = divmod(index, width)
+                yield x, y, tile_num
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Map layer %dx%d' % (self.width, self.height)
+
+
+# ====================== WALKABLE TILE LAYER CLASS ========================== #
+
+
+class WalkableTileLayer(TileLayer):
+    """ Layer of the game map with walkability flags.
+    Flags are stored in bytearray (1 for walkable cell, 0 for not),
+    with the same indexes as tiles numbers.
+    """
+    def __init__(self, width, height, tiles, is_walkable_tile):
+        """ Init.
+
+            width, height:      layer size (in tiles)
+            tiles:              iterable of tiles numbers (row by row)
+            is_walkable_tile:   function(<tile number>), returns True,
+                                if tile could be walked through.
+        """
+        super(WalkableTileLayer, self).__init__(width, height, tiles)
+        self._is_walkable_tile = is_walkable_tile
+        self.walkable = bytearray(
+                   bool(is_walkable_tile(tile_num)) for tile_num in self.tiles)
+
+
+    def is_walkable(self, x, y):
+        """Return True, if the cell could be walked through.
+
+            x, y:           cell coords (in tiles)
+        """
+        return self.walkable[y * self.width + x] == 1
+
+
+    def set(self, x, y, tile_num):
+        """Change tile number of the cell (and it's walkability).
+
+            x, y:           cell coords (in tiles)
+            tile_num:       new tile number
+        """
+        index = y * self.width + x
+        self.tiles[index] = tile_num
+        self.walkable[index] = bool(self._is_walkable_tile(tile_num))
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Tileset of game map's layers.
+----------------------------------------------------------"""
+
+import os
+import json
+import hashlib
+from array import array
+
+import pygame
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+# tiles, drawn as tile #2
+IGNORED_TILES_NUMS = [1980]
+
+# version of cached atlas format (change it to drop all old atlases)
+ATLAS_VERSION = 1
+
+# width of cached atlas (in tiles)
+ATLAS_COLUMNS = 32
+
+# candidates for colorkey of tiles with binary transparency (first one,
+# absent on the tile, is used)
+COLORKEYS = [(255, 0, 255), (0, 255, 255), (255, 255, 0), (1, 2, 3)]
+
+# ========================== MAP TILESET CLASS ============================== #
+
+
+class MapTileset(object):
+    """ Images of tiles, used on the game map.
+    Images are stored in "images" list, indexed directly by tile number
+    (tile number 0 means "empty cell" and has no image).
+
+    Used tiles, already scaled, could be cached on disk as single atlas
+    (raw RGBA pixels, with JSON index beside it), keyed by tileset image
+    content, scale and set of used tiles. If atlas is up to date, it is
+    loaded instead of the tileset: no PNG decoding, and no tile is cut
+    or scaled.
+
+    Every tile is stored in the fastest for blitting form: fully opaque
+    tiles - without alpha channel, tiles with only fully transparent and
+    fully opaque pixels - with RLE-accelerated colorkey, and only the
+    rest - with per-pixel alpha.
+    """
+    def __init__(self, filename, size, scale, used_tiles, cache_dir=None):
+        """ Load tileset for a game map.
+
+            filename:       name of tileset image
+            size:           size of 1 tile
+            scale:          1 or 2 (for 2x size, every pixel doubles)
+            used_tiles:     set of tiles numbers, used in game map
+            cache_dir:      directory for cached atlases (or None, if
+                            atlas is not needed)
+
+        Tileset must be single image. Tiles have to be supported
+        by Tiled editor, order: from left to right, and from top to bottom.
+        """
+        if scale not in (1, 2):
+            raise RuntimeError('Sorry! only scale 1x and 2x is '
+                                                          'supported now!')
+        self.size = size * scale
+        self.scale = scale
+
+        images = None
+        if cache_dir:
+            atlas_path = self._get_atlas_path(filename, scale, used_tiles,
+                                                                    cache_dir)
+            images = self._load_atlas(atlas_path)
+
+        if images is None:
+            images = self._load_tileset(filename, size, scale, used_tiles)
+            if cache_dir:
+                self._save_atlas(atlas_path, images)
+
+        images = [image and self._get_optimized_image(image)
+                                                          for image in images]
+
+        for tile_num in IGNORED_TILES_NUMS:
+            if tile_num in used_tiles:
+                if tile_num >= len(images):
+                    images.extend([None] * (tile_num + 1 - len(images)))
+                images[tile_num] = images[2]
+
+        self.images = images
+
+
+    @staticmethod
+    def _load_tileset(filename, size, scale, used_tiles):
+        """Cut used tiles from tileset image and scale them.
+        Return list of images, indexed by tile number (not used tiles
+        are None).
+
+            filename:       name of tileset image
+            size:           size of 1 tile (not scaled)
+            scale:          1 or 2
+            used_tiles:     set of tiles numbers, used in game map
+        """
+        image = pygame.image.load(filename).convert_alpha()
+        image_width, image_height = image.get_size()
+        images = [None]
+
+        count = 0
+        for tile_y in range(0, image_height // size):
+            for tile_x in range(0, image_width // size):
+
+                # we don't need to load tiles images of not used tiles
+                count += 1
+                if count not in used_tiles:
+                    images.append(None)
+                    continue
+
+                rect = (tile_x * size, tile_y * size, size, size)
+                tile = image.subsurface(rect).convert_alpha()
+                if scale == 2:
+                    tile = pygame.transform.scale2x(tile)
+                images.append(tile)
+        return images
+
+
+    @staticmethod
+    def _get_optimized_image(image):
+        """Check tile's alpha channel and return it's copy in the
+        fastest for blitting form (see class description).
+
+            image:          tile's Surface with per-pixel alpha
+        """
+        width, height = image.get_size()
+        area = width * height
+        opaque_count = pygame.mask.from_surface(image, 254).count()
+
+        if opaque_count == area:
+            return image.convert()
+
+        if pygame.mask.from_surface(image, 0).count() == opaque_count:
+            transparent_count = area - opaque_count
+            for colorkey in COLORKEYS:
+                keyed = pygame.Surface((width, height)).convert()
+                keyed.fill(colorkey)
+                keyed.blit(image, (0, 0))
+                # colorkey must not be met among opaque pixels
+                # (display format could also make colors closer)
+                if pygame.mask.from_threshold(
+                        keyed, colorkey, (1, 1, 1, 255)).count() == \
+                                                            transparent_count:
+                    keyed.set_colorkey(colorkey, pygame.RLEACCEL)
+                    return keyed
+
+        return image
+
+
+    @staticmethod
+    def _get_atlas_path(filename, scale, used_tiles, cache_dir):
+        """Return path to cached atlas pixels file for such tileset,
+        scale and used tiles (path to it's index differs by extension).
+
+            filename:       name of tileset image
+            scale:          1 or 2
+            used_tiles:     set of tiles numbers, used in game map
+            cache_dir:      directory for cached atlases
+        """
+        key = hashlib.sha1()
+        with open(filename, 'rb') as f:
+            key.update(f.read())
+        key.update(('%d:%d:' % (ATLAS_VERSION, scale)).encode('ascii'))
+        key.update(array('I', sorted(used_tiles)).tobytes())
+
+        name = os.path.splitext(os.path.basename(filename))[0].lower()
+        return os.path.join(cache_dir,
+                            '%s_%s.rgba' % (name, key.hexdigest()))
+
+
+    def _load_atlas(self, atlas_path):
+        """Load tiles images from cached atlas.
+        Return list of images, indexed by tile number, or None, if
+        there is no valid atlas.
+
+            atlas_path:     path to atlas pixels file
+        """
+        try:
+            with open(self._get_index_path(atlas_path)) as f:
+                index = json.load(f)
+            with open(atlas_path, 'rb') as f:
+                pixels = f.read()
+            atlas = pygame.image.fromstring(pixels, index['size'], 'RGBA')
+        except (IOError, OSError, ValueError, KeyError, pygame.error):
+            return None
+
+        if atlas.get_width() != ATLAS_COLUMNS * self.size:
+            return None
+        atlas = atlas.convert_alpha()
+
+        images = [None] * index['count']
+        for q, tile_num in enumerate(index['tiles']):
+            y, x = divmod(q, ATLAS_COLUMNS)
+            images[tile_num] = atlas.subsurface(
+                      (x * self.size, y * self.size, self.size, self.size))
+        return images
+
+
+    def _save_atlas(self, atlas_path, images):
+        """Save used tiles images as atlas into cache directory.
+        Atlases of the same tileset with other keys are removed.
+        Errors are ignored: without atlas tileset is just loaded slower.
+
+            atlas_path:     path to atlas pixels file
+            images:         list of images, indexed by tile number
+        """
+        tiles = [tile_num for tile_num, image in enumerate(images)
+                                                        if image is not None]
+        rows = max(-(-len(tiles) // ATLAS_COLUMNS), 1)
+        atlas = pygame.Surface((ATLAS_COLUMNS * self.size, rows * self.size),
+                                                            pygame.SRCALPHA)
+        for q, tile_num in enumerate(tiles):
+            y, x = divmod(q, ATLAS_COLUMNS)
+            atlas.blit(images[tile_num], (x * self.size, y * self.size),
+                                       special_flags=pygame.BLEND_RGBA_MAX)
+
+        cache_dir = os.path.dirname(atlas_path)
+        prefix = os.path.basename(atlas_path).rsplit('_', 1)[0] + '_'
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            for name in os.listdir(cache_dir):
+                if name.startswith(prefix):
+                    os.remove(os.path.join(cache_dir, name))
+
+            # index is written last, so atlas without index is never used
+            with open(atlas_path, 'wb') as f:
+                f.write(pygame.image.tostring(atlas, 'RGBA'))
+            with open(self._get_index_path(atlas_path), 'w') as f:
+                json.dump({'size': atlas.get_size(),
+                           'count': len(images),
+                           'tiles': tiles}, f)
+        except (IOError, OSError, pygame.error):
+            pass
+
+
+    @staticmethod
+    def _get_index_path(atlas_path):
+        """Return path to JSON index of cached atlas.
+
+            atlas_path:     path to atlas pixels file
+        """
+        return os.path.splitext(atlas_path)[0] + '.json'
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Map tileset: %d tiles' % (len(self.images) - 1)
@@ -7,9 +7,10 @@
 
 
 import json
-from time import time
 
 from source.misc._pathes import MAP_OBJECTS_CONFIG
+from source.misc.scheduler import Scheduler
+from source.misc.game_clock import game_clock
 from .objects._types_table import OBJECTS_CLASSES
 from .objects.base import BaseObject
 
@@ -29,8 +30,7 @@ class ObjectsManager(object):
         """Init. Please, use only one instance of this class.
         """
         self._objects = {}
-        self._timeouted_objects = {}
-        self._timers_to_exec = []
+        self._scheduler = Scheduler(get_time=game_clock.now)
         self.cell_size = cell_size
 
         BaseObject.initialize(LOCALE, self)
@@ -76,35 +76,20 @@ class ObjectsManager(object):
 
 
     def update(self):
-        """Check timer/callback table.
+        """Check timers.
         Execute callbacks, time of which is coming.
         """
-        need_to_update = False
-
-        for nearest_timer in self._timers_to_exec:
-            if nearest_timer > time():
-                break
-
-            self._timeouted_objects[nearest_timer]()
-            del self._timeouted_objects[nearest_timer]
-            need_to_update = True
-
-        if need_to_update:
-            self._timers_to_exec = list(self._timeouted_objects.keys())
-            self._timers_to_exec.sort()
+        self._scheduler.update()
 
 
     def run_after_timeout(self, callback, timeout):
         """Add some callback, that will be ran after timeount expired.
+        Return TimerHandle instance (it could be used to cancel callback).
 
             callback:       callback to execute (use lambdas for params)
-            timeout:        it seconds (up to 3 sygn after point values
-                            allowed, i.e. 0.025 sec)
+            timeout:        it seconds (of game time)
         """
-        callback_time = time() + timeout
-        self._timeouted_objects[callback_time] = callback
-        self._timers_to_exec = list(self._timeouted_objects.keys())
-        self._timers_to_exec.sort()
+        return self._scheduler.run_after_timeout(callback, timeout)
 
 
     def __repr__(self):
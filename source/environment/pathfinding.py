@@ -0,0 +1,542 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Pathfinding on map cells (A* with jump point search).
+----------------------------------------------------------"""
+
+import heapq
+import math
+from collections import OrderedDict, deque
+from time import perf_counter
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+SQRT_2 = math.sqrt(2)
+
+# maximum number of cached routes
+ROUTES_CACHE_SIZE = 512
+
+# search checks time budget after every N expanded jump points
+EXPANSIONS_PER_SLICE = 8
+
+# default time of paths searching per update() call (in seconds)
+DEFAULT_TIME_BUDGET = 0.002
+
+# ============================= NAV GRID CLASS ============================== #
+
+
+class NavGrid(object):
+    """Walkability of map cells for pathfinding: cell is walkable, if
+    both floor and object on it are walkable. Flags are stored in
+    bytearray (1 for walkable cell, 0 for not). Border cells of the map
+    are never walkable, so search doesn't need bounds checks.
+    """
+    def __init__(self, width, height, floor_walkable, objects_walkable):
+        """Init.
+
+            width, height:      grid size (in cells)
+            floor_walkable:     walkable flags of floor layer
+            objects_walkable:   walkable flags of objects layer
+        """
+        self.width = width
+        self.height = height
+        self.walkable = bytearray(
+                           floor & objects for floor, objects in zip(
+                                            floor_walkable, objects_walkable))
+        for x in range(width):
+            self.walkable[x] = 0
+            self.walkable[(height - 1) * width + x] = 0
+        for y in range(height):
+            self.walkable[y * width] = 0
+            self.walkable[y * width + width - 1] = 0
+
+
+    def is_walkable(self, x, y):
+        """Check, if cell is walkable.
+
+            x, y:           cell coords (in cells)
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.walkable[y * self.width + x] == 1
+        return False
+
+
+    def set_walkable(self, x, y, is_walkable):
+        """Change walkability of the cell (border cells are left
+        non-walkable). Return True, if it was actually changed.
+
+            x, y:           cell coords (in cells)
+            is_walkable:    True or False
+        """
+        if not (0 < x < self.width - 1 and 0 < y < self.height - 1):
+            return False
+        index = y * self.width + x
+        value = 1 if is_walkable else 0
+        if self.walkable[index] == value:
+            return False
+        self.walkable[index] = value
+        return True
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Navigation grid %dx%d' % (self.width, self.height)
+
+
+# ============================ PATH REQUEST ================================= #
+
+
+class PathRequest(object):
+    """Delayed path request. Returned by Pathfinder.request_path(),
+    could be used to cancel the request.
+    """
+    __slots__ = ('start', 'goal', 'callback')
+
+    def __init__(self, start, goal, callback):
+        """Init.
+
+            start, goal:    cells coords (X, Y)
+            callback:       function(<path or None>)
+        """
+        self.start = start
+        self.goal = goal
+        self.callback = callback
+
+
+    def cancel(self):
+        """Cancel request, if path is not found yet.
+        """
+        self.callback = None
+
+
+    @property
+    def active(self):
+        """True, if request is still waiting for the path.
+        """
+        return self.callback is not None
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Path request %s -> %s' % (self.start, self.goal)
+
+
+# =========================== PATHFINDER CLASS ============================== #
+
+
+class Pathfinder(object):
+    """Paths searching by A* with jump point search (8 directions,
+    diagonal moves could not cut corners of non-walkable cells).
+
+    Path is a list of cells coords (X, Y) from start to goal, where
+    every next cell is on straight or diagonal line from the previous
+    one (see expand_path()), or None, if goal is unreachable.
+
+    Found routes are cached. When cell becomes non-walkable, only
+    routes through it are dropped; when it becomes walkable, all routes
+    are dropped (shorter ones could appear).
+
+    request_path() puts request into queue, and update() searches paths
+    for queued requests within time budget (long search is continued
+    on next update), so many requests don't stall the frame.
+    """
+    def __init__(self, nav_grid, cache_size=ROUTES_CACHE_SIZE):
+        """Init.
+
+            nav_grid:       NavGrid instance
+            cache_size:     maximum number of cached routes
+        """
+        self.nav_grid = nav_grid
+        self.cache_size = cache_size
+
+        # {(<start>, <goal>): <path or None>}, the last used is the last
+        self._routes = OrderedDict()
+        # {<cell>: set of routes keys, passing through the cell}
+        self._routes_by_cells = {}
+
+        # {(<start>, <goal>): [PathRequest, ...]} and their order
+        self._requests = {}
+        self._queue = deque()
+
+        # current search: (<route key>, <generator>)
+        self._search = None
+
+
+    def find_path(self, start, goal):
+        """Return path from start to goal immediately (see class doc).
+
+            start, goal:    cells coords (X, Y)
+        """
+        key = (tuple(start), tuple(goal))
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            return self._routes[key]
+
+        search = self._search_path(*key)
+        try:
+            while True:
+                next(search)
+        except StopIteration as stop:
+            path = stop.value
+        self._cache_route(key, path)
+        return path
+
+
+    def request_path(self, start, goal, callback):
+        """Queue path request. Callback is called with path (see class
+        doc) from one of next update() calls.
+        Return PathRequest instance.
+
+            start, goal:    cells coords (X, Y)
+            callback:       function(<path or None>)
+        """
+        key = (tuple(start), tuple(goal))
+        request = PathRequest(key[0], key[1], callback)
+        if key in self._requests:
+            self._requests[key].append(request)
+        else:
+            self._requests[key] = [request]
+            self._queue.append(key)
+        return request
+
+
+    def update(self, time_budget=DEFAULT_TIME_BUDGET):
+        """Search paths for queued requests, until time budget is spent.
+        Cached routes are returned without searching.
+
+            time_budget:    in seconds
+        """
+        deadline = perf_counter() + time_budget
+
+        while self._search is not None or self._queue:
+            if self._search is None:
+                key = self._queue.popleft()
+                if not any(request.active for request in self._requests[key]):
+                    del self._requests[key]
+                    continue
+                if key in self._routes:
+                    self._routes.move_to_end(key)
+                    self._finish_requests(key, self._routes[key])
+                    continue
+                self._search = (key, self._search_path(*key))
+
+            if perf_counter() >= deadline:
+                return
+
+            key, search = self._search
+            try:
+                while perf_counter() < deadline:
+                    next(search)
+            except StopIteration as stop:
+                self._search = None
+                self._cache_route(key, stop.value)
+                self._finish_requests(key, stop.value)
+
+
+    def set_cell_walkable(self, x, y, is_walkable):
+        """Change walkability of the cell and drop outdated routes.
+
+            x, y:           cell coords (in cells)
+            is_walkable:    True or False
+        """
+        if not self.nav_grid.set_walkable(x, y, is_walkable):
+            return
+
+        if is_walkable:
+            self._routes.clear()
+            self._routes_by_cells.clear()
+        else:
+            for key in self._routes_by_cells.pop((x, y), ()):
+                self._drop_route(key)
+
+        # current search could use old walkability: start it again
+        if self._search is not None:
+            key = self._search[0]
+            self._search = (key, self._search_path(*key))
+
+
+    def clear_cache(self):
+        """Drop all cached routes.
+        """
+        self._routes.clear()
+        self._routes_by_cells.clear()
+
+
+    def _finish_requests(self, key, path):
+        """Pass path to callbacks of all active requests of the route.
+
+            key:            (<start>, <goal>)
+            path:           path or None
+        """
+        for request in self._requests.pop(key, ()):
+            callback = request.callback
+            if callback is not None:
+                request.callback = None
+                callback(path)
+
+
+    def _cache_route(self, key, path):
+        """Put route into cache (dropping the least recently used one,
+        if cache is full).
+
+            key:            (<start>, <goal>)
+            path:           path or None
+        """
+        if key in self._routes:
+            self._drop_route(key)
+        self._routes[key] = path
+        if path is not None:
+            for cell in self._get_route_cells(path):
+                self._routes_by_cells.setdefault(cell, set()).add(key)
+
+        while len(self._routes) > self.cache_size:
+            self._drop_route(next(iter(self._routes)))
+
+
+    def _drop_route(self, key):
+        """Remove route from cache (and from cells index).
+
+            key:            (<start>, <goal>)
+        """
+        path = self._routes.pop(key, None)
+        if path is None:
+            return
+        for cell in self._get_route_cells(path):
+            keys = self._routes_by_cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._routes_by_cells[cell]
+
+
+    @staticmethod
+    def _get_route_cells(path):
+        """Return set of cells, the path depends on: cells of the path
+        and corners, passed by diagonal moves.
+
+            path:           path (not None)
+        """
+        cells = expand_path(path)
+        result = set(cells)
+        for (x, y), (next_x, next_y) in zip(cells, cells[1:]):
+            if x != next_x and y != next_y:
+                result.add((next_x, y))
+                result.add((x, next_y))
+        return result
+
+
+    def _search_path(self, start, goal):
+        """Generator: search path from start to goal. Yields after every
+        EXPANSIONS_PER_SLICE expanded jump points, returns path.
+
+            start, goal:    cells coords (X, Y)
+        """
+        is_walkable = self.nav_grid.is_walkable
+        if not is_walkable(*start) or not is_walkable(*goal):
+            return None
+        if start == goal:
+            return [start]
+
+        open_heap = [(_get_distance(start, goal), 0, start)]
+        costs = {start: 0.0}
+        parents = {start: None}
+        closed = set()
+        counter = 0
+
+        while open_heap:
+            node = heapq.heappop(open_heap)[2]
+            if node in closed:
+                continue
+            if node == goal:
+                return self._get_path_to(node, parents)
+            closed.add(node)
+
+            counter += 1
+            if counter % EXPANSIONS_PER_SLICE == 0:
+                yield
+
+            x, y = node
+            for dx, dy in self._get_directions(node, parents[node]):
+                jump_point = self._jump(x + dx, y + dy, dx, dy, goal)
+                if jump_point is None or jump_point in closed:
+                    continue
+                cost = costs[node] + _get_distance(node, jump_point)
+                if cost < costs.get(jump_point, cost + 1):
+                    costs[jump_point] = cost
+                    parents[jump_point] = node
+                    heapq.heappush(open_heap, (
+                           cost + _get_distance(jump_point, goal),
+                           counter, jump_point))
+        return None
+
+
+    def _get_directions(self, node, parent):
+        """Return list of directions (dX, dY) to search from the node
+        (pruned by direction from the parent).
+
+            node:           cell coords (X, Y)
+            parent:         parent cell coords (X, Y), or None for start
+        """
+        walkable = self.nav_grid.walkable
+        width = self.nav_grid.width
+        x, y = node
+        index = y * width + x
+
+        if parent is None:
+            result = [(dx, dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                      if walkable[index + dy * width + dx]]
+            for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                if walkable[index + dx] and walkable[index + dy * width]:
+                    result.append((dx, dy))
+            return result
+
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        result = []
+
+        if dx and dy:
+            is_vertical_walkable = walkable[index + dy * width]
+            is_horizontal_walkable = walkable[index + dx]
+            if is_vertical_walkable:
+                result.append((0, dy))
+            if is_horizontal_walkable:
+                result.append((dx, 0))
+            if is_vertical_walkable and is_horizontal_walkable:
+                result.append((dx, dy))
+
+        elif dx:
+            is_next_walkable = walkable[index + dx]
+            is_bottom_walkable = walkable[index + width]
+            is_top_walkable = walkable[index - width]
+            if is_next_walkable:
+                result.append((dx, 0))
+                if is_bottom_walkable:
+                    result.append((dx, 1))
+                if is_top_walkable:
+                    result.append((dx, -1))
+            if is_bottom_walkable:
+                result.append((0, 1))
+            if is_top_walkable:
+                result.append((0, -1))
+
+        else:
+            is_next_walkable = walkable[index + dy * width]
+            is_right_walkable = walkable[index + 1]
+            is_left_walkable = walkable[index - 1]
+            if is_next_walkable:
+                result.append((0, dy))
+                if is_right_walkable:
+                    result.append((1, dy))
+                if is_left_walkable:
+                    result.append((-1, dy))
+            if is_right_walkable:
+                result.append((1, 0))
+            if is_left_walkable:
+                result.append((-1, 0))
+
+        return result
+
+
+    def _jump(self, x, y, dx, dy, goal):
+        """Move from the cell in direction, until jump point is found
+        (goal, or cell with forced neighbours). Return it's coords, or
+        None, if the way is blocked.
+
+            x, y:           cell coords to start with
+            dx, dy:         direction (-1, 0 or 1 for every axis)
+            goal:           goal cell coords (X, Y)
+        """
+        walkable = self.nav_grid.walkable
+        width = self.nav_grid.width
+        step = dy * width + dx
+
+        index = y * width + x
+        while True:
+            if not walkable[index]:
+                return None
+            if (x, y) == goal:
+                return x, y
+
+            if dx and dy:
+                # diagonal move: straight moves could find jump points
+                if self._jump(x + dx, y, dx, 0, goal) is not None or \
+                           self._jump(x, y + dy, 0, dy, goal) is not None:
+                    return x, y
+                # corners could not be cut
+                if not (walkable[index + dx] and walkable[index + dy * width]):
+                    return None
+
+            elif dx:
+                if (walkable[index - width] and
+                                not walkable[index - width - dx]) or \
+                            (walkable[index + width] and
+                                not walkable[index + width - dx]):
+                    return x, y
+
+            else:
+                if (walkable[index - 1] and
+                                not walkable[index - 1 - dy * width]) or \
+                            (walkable[index + 1] and
+                                not walkable[index + 1 - dy * width]):
+                    return x, y
+
+            x += dx
+            y += dy
+            index += step
+
+
+    @staticmethod
+    def _get_path_to(node, parents):
+        """Return path from start to the node.
+
+            node:           cell coords (X, Y)
+            parents:        {<node>: <parent node>}
+        """
+        path = []
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        return path
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Pathfinder: %d routes cached, %d requests queued' % (
+                                           len(self._routes), len(self._queue))
+
+
+# ------------------------------ FUNCTIONS --------------------------------- #
+
+
+def _get_distance(cell_a, cell_b):
+    """Return octile distance between cells (cost of the shortest path
+    by 8 directions without obstacles).
+
+        cell_a, cell_b:     cells coords (X, Y)
+    """
+    dx = abs(cell_a[0] - cell_b[0])
+    dy = abs(cell_a[1] - cell_b[1])
+    return max(dx, dy) + (SQRT_2 - 1) * min(dx, dy)
+
+
+def expand_path(path):
+    """Return list of all cells of the path (Pathfinder returns only
+    turning points of it).
+
+        path:           list of cells coords (X, Y)
+    """
+    cells = [path[0]]
+    for (x, y), (next_x, next_y) in zip(path, path[1:]):
+        dx = (next_x > x) - (next_x < x)
+        dy = (next_y > y) - (next_y < y)
+        while (x, y) != (next_x, next_y):
+            x += dx
+            y += dy
+            cells.append((x, y))
+    return cells
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Graph of map rooms, linked by doors.
+----------------------------------------------------------"""
+
+import heapq
+import math
+from array import array
+from collections import deque
+
+from source.misc._enums import *
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+# maximum distance from room's label to the room (in cells)
+LABEL_SEARCH_RADIUS = 3
+
+# ============================== ROOM CLASS ================================= #
+
+
+class Room(object):
+    """Area of walkable map cells, bounded by walls and doors.
+    """
+    def __init__(self, id_):
+        """Init.
+
+            id_:            room number (starting from 1)
+        """
+        self.id = id_
+        self.name = None
+        self.cells_count = 0
+        # center of the room (in cells, float)
+        self.center = (0.0, 0.0)
+        # list of (<door>, <room id>, <distance>): ways to other rooms
+        self.portals = []
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Room %d%s: %d cells' % (
+               self.id, ' (%s)' % self.name if self.name else '',
+               self.cells_count)
+
+
+# =========================== ROOM GRAPH CLASS ============================== #
+
+
+class RoomGraph(object):
+    """Map, split into rooms by flood fill of walkable cells (through
+    4 sides of cells). Door cells are not included into rooms: they are
+    portals between rooms, touching them.
+
+    Rooms and portals are found once, but door's portal is passable
+    only while the door is not closed (it's "state" is checked at the
+    moment of query), so graph queries always use the current doors
+    state, if not asked to ignore it.
+    """
+    def __init__(self, width, height, walkable, doors):
+        """Init.
+
+            width, height:  map size (in cells)
+            walkable:       walkable flags of map cells (1 or 0).
+                            Border cells have to be non-walkable.
+            doors:          {(X, Y): <door object>}
+        """
+        self.width = width
+        self.height = height
+
+        # room id of every cell (0 for cells out of rooms)
+        self._cells_rooms = array('H', bytes(2 * width * height))
+        # {<room id>: Room instance}
+        self.rooms = {}
+        # {<room name>: <room id>}
+        self._names = {}
+
+        door_indexes = set(y * width + x for x, y in doors)
+        for index, is_walkable in enumerate(walkable):
+            if is_walkable and not self._cells_rooms[index] and \
+                                                index not in door_indexes:
+                self._fill_room(index, walkable, door_indexes)
+
+        for (x, y), door in doors.items():
+            self._add_portals(x, y, door)
+
+
+    def get_room(self, x, y):
+        """Return Room of the cell, or None.
+
+            x, y:           cell coords (in cells)
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.rooms.get(self._cells_rooms[y * self.width + x])
+        return None
+
+
+    def get_room_by_name(self, name):
+        """Return Room by it's name, or None.
+
+            name:           room's name
+        """
+        return self.rooms.get(self._names.get(name))
+
+
+    def set_labels(self, labels):
+        """Name rooms by labels of map. Label is linked with the room,
+        it is placed on (or with the nearest one). If some labels are
+        placed on the same room, the first one is used.
+
+            labels:         list of (<name>, (<X>, <Y>)), coords in cells
+        """
+        for name, (x, y) in labels:
+            room = self._get_nearest_room(x, y)
+            if room is None or name in self._names:
+                continue
+            if room.name is None:
+                room.name = name
+            self._names[name] = room.id
+
+
+    def get_route(self, room_from, room_to, ignore_doors=False):
+        """Return the shortest route between rooms: list of
+        (<door>, <room>) steps (door to pass through and room behind
+        it), or None, if there is no way. Route length is estimated by
+        distances between rooms' centers and doors.
+
+            room_from:      start Room
+            room_to:        target Room
+            ignore_doors:   if True, closed doors are counted as open
+        """
+        if room_from is room_to:
+            return []
+
+        costs = {room_from.id: 0.0}
+        steps = {room_from.id: None}
+        heap = [(0.0, room_from.id)]
+        visited = set()
+
+        while heap:
+            cost, room_id = heapq.heappop(heap)
+            if room_id in visited:
+                continue
+            if room_id == room_to.id:
+                return self._get_route_to(room_id, steps)
+            visited.add(room_id)
+
+            for door, next_id, distance in self.rooms[room_id].portals:
+                if next_id in visited or \
+                        not (ignore_doors or self.is_door_passable(door)):
+                    continue
+                next_cost = cost + distance
+                if next_cost < costs.get(next_id, next_cost + 1):
+                    costs[next_id] = next_cost
+                    steps[next_id] = (room_id, door)
+                    heapq.heappush(heap, (next_cost, next_id))
+        return None
+
+
+    def get_reachable_rooms(self, room, ignore_doors=False):
+        """Return set of rooms, that could be reached from the room
+        (including itself).
+
+            room:           Room instance
+            ignore_doors:   if True, closed doors are counted as open
+        """
+        reached = {room.id}
+        queue = deque([room.id])
+        while queue:
+            for door, next_id, _ in self.rooms[queue.popleft()].portals:
+                if next_id not in reached and \
+                        (ignore_doors or self.is_door_passable(door)):
+                    reached.add(next_id)
+                    queue.append(next_id)
+        return set(self.rooms[room_id] for room_id in reached)
+
+
+    def is_area_sealed(self, rooms):
+        """Check, if there is no passable door from the rooms to others.
+
+            rooms:          Room, or iterable of Rooms
+        """
+        if isinstance(rooms, Room):
+            rooms = (rooms,)
+        area = set(room.id for room in rooms)
+        for room_id in area:
+            for door, next_id, _ in self.rooms[room_id].portals:
+                if next_id not in area and self.is_door_passable(door):
+                    return False
+        return True
+
+
+    @staticmethod
+    def is_door_passable(door):
+        """Check, if door is not closed (opening, opened or closing).
+
+            door:           door object
+        """
+        return door.state != CLOSED
+
+
+    def _fill_room(self, start_index, walkable, door_indexes):
+        """Create new room from all cells, reachable from the cell.
+
+            start_index:    index of the first cell of the room
+            walkable:       walkable flags of map cells
+            door_indexes:   set of doors cells indexes
+        """
+        room = Room(len(self.rooms) + 1)
+        self.rooms[room.id] = room
+
+        width = self.width
+        cells_rooms = self._cells_rooms
+        cells_rooms[start_index] = room.id
+        queue = deque([start_index])
+        sum_x = sum_y = 0
+
+        while queue:
+            index = queue.popleft()
+            sum_x += index % width
+            sum_y += index // width
+            room.cells_count += 1
+            for next_index in (index - 1, index + 1,
+                               index - width, index + width):
+                if walkable[next_index] and not cells_rooms[next_index] and \
+                                            next_index not in door_indexes:
+                    cells_rooms[next_index] = room.id
+                    queue.append(next_index)
+
+        room.center = (float(sum_x) / room.cells_count,
+                       float(sum_y) / room.cells_count)
+
+
+    def _add_portals(self, x, y, door):
+        """Link rooms, touching the door cell, by portals.
+
+            x, y:           door cell coords
+            door:           door object
+        """
+        rooms = []
+        for next_x, next_y in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            room = self.get_room(next_x, next_y)
+            if room is not None and room not in rooms:
+                rooms.append(room)
+
+        for room in rooms:
+            for other in rooms:
+                if other is not room:
+                    distance = _get_distance(room.center, (x, y)) + \
+                               _get_distance((x, y), other.center)
+                    room.portals.append((door, other.id, distance))
+
+
+    def _get_nearest_room(self, x, y):
+        """Return room of the cell, or the nearest room within
+        LABEL_SEARCH_RADIUS (or None).
+
+            x, y:           cell coords (in cells)
+        """
+        best, best_distance = None, None
+        for dy in range(-LABEL_SEARCH_RADIUS, LABEL_SEARCH_RADIUS + 1):
+            for dx in range(-LABEL_SEARCH_RADIUS, LABEL_SEARCH_RADIUS + 1):
+                room = self.get_room(x + dx, y + dy)
+                distance = dx * dx + dy * dy
+                if room is not None and (best is None or
+                                              distance < best_distance):
+                    best, best_distance = room, distance
+        return best
+
+
+    def _get_route_to(self, room_id, steps):
+        """Return route from start room to the room.
+
+            room_id:        target room id
+            steps:          {<room id>: (<previous room id>, <door>)}
+        """
+        route = []
+        while steps[room_id] is not None:
+            previous_id, door = steps[room_id]
+            route.append((door, self.rooms[room_id]))
+            room_id = previous_id
+        route.reverse()
+        return route
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Room graph: %d rooms' % len(self.rooms)
+
+
+# ------------------------------ FUNCTIONS --------------------------------- #
+
+
+def _get_distance(point_a, point_b):
+    """Return distance between points.
+
+        point_a, point_b:   (X, Y)
+    """
+    return math.hypot(point_a[0] - point_b[0], point_a[1] - point_b[1])
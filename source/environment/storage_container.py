@@ -2,70 +2,31 @@
 """----------------------------------------------------------
  Author:      alexey.sychov@gameloft.com
  Created:     01-06-2018
- Description:
+ Description: Storage content: items, placed in grid of cells.
 ----------------------------------------------------------"""
 
+from time import perf_counter
 
-from source.misc._enums import *
 
+# ------------------------------ CONST ------------------------------------- #
 
-# =========================== Storage cell class =========================== #
-
-
-class StorageCell(object):
-    """Very simple class for cell content of Storage
-    """
-    def __init__(self):
-        """Create empty cell.
-        """
-        self.clear()
-
-
-    def is_empty(self, self_item=None):
-        """Return True, if cell is empty, else False.
-
-            self_item:      if not None, this item cells would be
-                            counted as empty while checking.
-        """
-        if self.inventory_item and self.inventory_item != self_item:
-            return False
-        else:
-            return True
-
-
-    def put_item(self, item, is_dumb=False):
-        """Fill cell with item (main part or dumb one).
-
-            item:          Inventory object
-            is_dumb:       True for upper-left corner, False for others
-        """
-        self.inventory_item = item
-        self.is_dumb = is_dumb
-
-
-    def clear(self):
-        """Make cell clear.
-        """
-        self.inventory_item = None
-        self.is_dumb = False
-
-
-    def __repr__(self):
-        """Simple representation.
-        """
-        if not self.inventory_item:
-            return 'Empty cell'
-        elif self.is_dumb:
-            return 'Dumb cell of %s' % str(self.inventory_item)
-        else:
-            return 'Cell of %s' % str(self.inventory_item)
-
+# maximum time of items arranging (in seconds), so it fits into one frame
+ARRANGE_TIME_BUDGET = 0.004
 
 # ========================= Storage content class ========================== #
 
 
 class StorageContent(object):
     """Data model class for Storage class.
+
+    Items of any rectangular shape could be stored: item's "size"
+    attribute is (<width>, <height>) of it in cells.
+
+    Occupied cells are kept as bitmap: one integer for every row, where
+    bit X is set, if cell X is occupied. So item's row is checked by one
+    mask, and free places are searched by masks of whole rows. Every
+    item is indexed by it's upper left cell (and every cell - by it's
+    item), so items are found and removed without scanning of cells.
     """
     def __init__(self, width, height):
         """Init.
@@ -74,158 +35,290 @@ class StorageContent(object):
         """
         self.width = width
         self.height = height
-        self.storage_cells = [[StorageCell() for x in range(self.width)]
-                                                 for y in range(self.height)]
+
+        # occupied cells bitmap, row by row
+        self._rows = [0] * height
+        # item of every cell (or None), row by row
+        self._cells_items = [None] * (width * height)
+        # {<item>: (X, Y) of upper left cell}
+        self._items_positions = {}
 
 
     def add_item(self, item):
-        """Try to add item to storage with non-defined placement.
+        """Try to add item to storage with non-defined placement (to the
+        first free place, from top to bottom and from left to right).
         Return True, if item was added and False, if was not.
 
             item:       InventoryObject instance.
         """
-        item_type = item.type
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.get_cell_available_for(x, y, item):
-                    # for 1x1 sprites:
-                    if item_type == SPRITE_1x1:
-                        self.storage_cells[y][x].put_item(item)
-                        return True
-
-                    # for 2x1 sprites:
-                    elif item_type == SPRITE_2x1:
-                        self.storage_cells[y][x].put_item(item)
-                        self.storage_cells[y][x + 1].put_item(
-                                                            item, is_dumb=True)
-                        return True
-
-                    # for 1x2 sprites:
-                    elif item_type == SPRITE_1x2:
-                        self.storage_cells[y][x].put_item(item)
-                        self.storage_cells[y + 1][x].put_item(
-                                                            item, is_dumb=True)
-                        return True
-
-                    # for 2x2 sprites:
-                    elif item_type == SPRITE_2x2:
-                        self.storage_cells[y][x].put_item(item)
-                        self.storage_cells[y + 1][x].put_item(
-                                                            item, is_dumb=True)
-                        self.storage_cells[y][x + 1].put_item(
-                                                            item, is_dumb=True)
-                        self.storage_cells[y + 1][x + 1].put_item(
-                                                            item, is_dumb=True)
-                        return True
-        return False
+        position = self.get_free_position(item.size)
+        if position is None:
+            return False
+        self._put_item(item, *position)
+        return True
 
 
     def remove_item(self, item):
-        """Remove item from storage cells.
+        """Remove item from storage cells (if it is there).
 
             item:           InventoryObject instance.
         """
-        for row in self.storage_cells:
-            for cell in row:
-                if cell.inventory_item == item:
-                    cell.clear()
+        position = self._items_positions.pop(item, None)
+        if position is None:
+            return
+
+        x, y = position
+        width, height = item.size
+        mask = ~(((1 << width) - 1) << x)
+        for row in range(y, y + height):
+            self._rows[row] &= mask
+            start = row * self.width + x
+            self._cells_items[start:start + width] = [None] * width
 
 
     def add_item_to_specific_cells(self, item, cells):
         """Try to add item to storage defined placement (specific cells).
+        Item is placed by the upper left cell of them. If item is
+        already in storage, it is moved.
         Return True, if item was added and False
 
             item:           InventoryObject instance.
             cells:          List of storage target cells coords in (X, Y).
 
         """
-        upper_left_cell = min(cells)
-        item_type = item.type
+        x, y = min(cells)
+        if not self.is_place_free(x, y, item.size, self_item=item):
+            return False
+
+        self.remove_item(item)
+        self._put_item(item, x, y)
+        return True
 
-        # check, if all cells are ready to put item into
-        for cell in cells:
-            x, y = cell
-            if not self.storage_cells[y][x].is_empty(self_item=item):
-                return False
 
-        # put item
-        for cell in cells:
-            x, y = cell
-            is_dumb = cell != upper_left_cell
-            self.storage_cells[y][x].put_item(item, is_dumb=is_dumb)
+    def arrange(self, time_budget=ARRANGE_TIME_BUDGET):
+        """Repack items compactly: the largest ones first, to the top
+        left corner. First-fit packing by free cells bitmap is tried
+        first, then skyline packing (it leaves no holes under items, so
+        it could succeed, when first-fit one is mislead by them).
+        Return True, if all items were packed and placed. Else storage
+        is left unchanged (e.g. if time budget is over).
 
+            time_budget:    maximum time of arranging (in seconds)
+        """
+        deadline = perf_counter() + time_budget
+
+        # the largest, then the highest first, the upper left first among
+        # items of the same size, so items are not shuffled needlessly
+        items = sorted(
+            self._items_positions,
+            key=lambda item: (-item.size[0] * item.size[1], -item.size[1],
+                              -item.size[0], self._items_positions[item][1],
+                              self._items_positions[item][0]))
+
+        for pack in (self._pack_by_first_fit, self._pack_by_skyline):
+            positions = pack(items, deadline)
+            if positions is not None:
+                break
+        else:
+            return False
+
+        self._rows = [0] * self.height
+        self._cells_items = [None] * (self.width * self.height)
+        self._items_positions = {}
+        for item, (x, y) in zip(items, positions):
+            self._put_item(item, x, y)
         return True
 
 
     def get_cell_available_for(self, x, y, item):
-        """Check, if item with "sprite_type" size can be put to cell
-        with x, y coords (counting around ones).
+        """Check, if item can be put to place, covering the cell with
+        x, y coords. Places, where the cell is upper left one, are
+        checked first. Return list of (X, Y) coords of place cells (from
+        top to bottom and from left to right), or None.
 
             x, y:       Storage cell coords
             item:       InventoryObject instance.
         """
-        if not self.storage_cells[y][x].is_empty(self_item=item):
+        if not self.is_place_free(x, y, (1, 1), self_item=item):
             return None
 
-        sprite_type = item.type
-
-        # for 1x1 sprites:
-        if sprite_type == SPRITE_1x1:
-            return [(x, y)]
-
-        # for 2x1 sprites:
-        elif sprite_type == SPRITE_2x1:
-            if  x + 1 < self.width and \
-                        self.storage_cells[y][x + 1].is_empty(self_item=item):
-                return [(x, y), (x + 1, y)]
-            elif x - 1 >= 0 and \
-                        self.storage_cells[y][x - 1].is_empty(self_item=item):
-                return [(x - 1, y), (x, y)]
-
-        # for 1x2 sprites:
-        elif sprite_type == SPRITE_1x2:
-            if y + 1 < self.height and \
-                        self.storage_cells[y + 1][x].is_empty(self_item=item):
-                return [(x, y), (x, y + 1)]
-            elif y - 1 >= 0 and \
-                        self.storage_cells[y - 1][x].is_empty(self_item=item):
-                return [(x, y - 1), (x, y)]
-
-        # for 2x2 sprites:
-        elif sprite_type == SPRITE_2x2:
-            if y + 1 < self.height:
-                if x + 1 < self.width and \
-                   self.storage_cells[y][x + 1].is_empty(self_item=item) and \
-                   self.storage_cells[y + 1][x].is_empty(self_item=item) and \
-                   self.storage_cells[y + 1][x + 1].is_empty(self_item=item):
-                    return [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
-                elif x - 1 >= 0 and \
-                   self.storage_cells[y][x - 1].is_empty(self_item=item) and \
-                   self.storage_cells[y + 1][x].is_empty(self_item=item) and \
-                   self.storage_cells[y + 1][x - 1].is_empty(self_item=item):
-                    return [(x - 1, y), (x, y), (x - 1, y + 1), (x, y + 1)]
-            if y - 1 >= 0:
-                if x + 1 < self.width and \
-                   self.storage_cells[y][x + 1].is_empty(self_item=item) and \
-                   self.storage_cells[y - 1][x].is_empty(self_item=item) and \
-                   self.storage_cells[y - 1][x + 1].is_empty(self_item=item):
-                    return [(x, y - 1), (x + 1, y - 1), (x, y), (x + 1, y)]
-                elif x - 1 >= 0 and \
-                   self.storage_cells[y][x - 1].is_empty(self_item=item) and \
-                   self.storage_cells[y - 1][x].is_empty(self_item=item) and \
-                   self.storage_cells[y - 1][x - 1].is_empty(self_item=item):
-                    return [(x - 1, y - 1), (x, y - 1), (x - 1, y), (x, y)]
+        width, height = item.size
+        for top in range(y, y - height, -1):
+            for left in range(x, x - width, -1):
+                if self.is_place_free(left, top, item.size, self_item=item):
+                    return [(cell_x, cell_y)
+                            for cell_y in range(top, top + height)
+                            for cell_x in range(left, left + width)]
         return None
 
 
-    def get_main_item_cell(self, cell):
-        """Return "main" cell it's coords for chosen "dumb".
+    def is_place_free(self, x, y, size, self_item=None):
+        """Check, if place is inside storage and all it's cells are
+        empty.
 
-            cell:       StorageCell instance
+            x, y:           upper left cell coords of the place
+            size:           (<width>, <height>) of the place in cells
+            self_item:      if not None, this item cells would be
+                            counted as empty while checking.
+        """
+        width, height = size
+        if x < 0 or y < 0 or x + width > self.width or \
+                                                   y + height > self.height:
+            return False
+
+        mask = ((1 << width) - 1) << x
+        own_mask = 0
+        own_top = own_bottom = -1
+        if self_item in self._items_positions:
+            own_x, own_top = self._items_positions[self_item]
+            own_width, own_height = self_item.size
+            own_mask = ((1 << own_width) - 1) << own_x
+            own_bottom = own_top + own_height
+
+        for row in range(y, y + height):
+            occupied = self._rows[row]
+            if own_top <= row < own_bottom:
+                occupied &= ~own_mask
+            if occupied & mask:
+                return False
+        return True
+
+
+    def get_free_position(self, size, first_row=0):
+        """Return (X, Y) of upper left cell of the first free place of
+        the size (from top to bottom and from left to right), or None.
+
+            size:           (<width>, <height>) of the place in cells
+            first_row:      row to start searching from
+        """
+        width, height = size
+        if width > self.width or height > self.height:
+            return None
+
+        # bits of cells, where place could start (to be inside storage)
+        starts_mask = (1 << (self.width - width + 1)) - 1
+        full_mask = (1 << self.width) - 1
+        rows = self._rows
+
+        for y in range(first_row, self.height - height + 1):
+            occupied = 0
+            for row in range(y, y + height):
+                occupied |= rows[row]
+            free = ~occupied & full_mask
+
+            # bit X is left set, if "width" cells from X are free
+            starts = free & starts_mask
+            for shift in range(1, width):
+                starts &= free >> shift
+                if not starts:
+                    break
+            if starts:
+                return (starts & -starts).bit_length() - 1, y
+        return None
+
+
+    def get_item(self, x, y):
+        """Return item, placed in the cell, or None.
+
+            x, y:       Storage cell coords
+        """
+        return self._cells_items[y * self.width + x]
+
+
+    def get_item_position(self, item):
+        """Return (X, Y) of item's upper left cell, or None, if item is
+        not in storage.
+
+            item:       InventoryObject instance.
+        """
+        return self._items_positions.get(item)
+
+
+    def iter_items(self):
+        """Iterate over items in storage. Yield (<item>, (X, Y) of it's
+        upper left cell).
+        """
+        for item, position in self._items_positions.items():
+            yield item, position
+
+
+    def _pack_by_skyline(self, items, deadline):
+        """Pack items one by one on skyline: the lowest free row of
+        every column. Item is put where it lies the highest (and the
+        leftmost, among such places). Return list of (X, Y) of items
+        upper left cells, or None, if items are not packed (until
+        deadline).
+
+            items:          list of items, in packing order
+            deadline:       perf_counter() value to stop packing at
+        """
+        skyline = [0] * self.width
+        positions = []
+        for item in items:
+            width, height = item.size
+            best_x = best_y = None
+            for x in range(self.width - width + 1):
+                y = max(skyline[x:x + width])
+                if best_y is None or y < best_y:
+                    best_x, best_y = x, y
+            if best_y is None or best_y + height > self.height or \
+                                                     perf_counter() > deadline:
+                return None
+            skyline[best_x:best_x + width] = [best_y + height] * width
+            positions.append((best_x, best_y))
+        return positions
+
+
+    def _pack_by_first_fit(self, items, deadline):
+        """Pack items one by one into the first free place (from top
+        to bottom and from left to right) of empty storage. Return list
+        of (X, Y) of items upper left cells, or None, if items are not
+        packed (until deadline).
+
+            items:          list of items, in packing order
+            deadline:       perf_counter() value to stop packing at
         """
-        for y, row in enumerate(self.storage_cells):
-            for x, some_cell in enumerate(row):
-                if not some_cell.is_dumb and \
-                               some_cell.inventory_item == cell.inventory_item:
-                    return some_cell, (x, y)
+        packed = StorageContent(self.width, self.height)
+        positions = []
+        # items of the same size could not be placed higher, than the
+        # previous one (it would be placed there), so search starts from
+        # it's row
+        previous_size, first_row = None, 0
+        for item in items:
+            if item.size != previous_size:
+                previous_size, first_row = item.size, 0
+            position = packed.get_free_position(item.size, first_row)
+            if position is None or perf_counter() > deadline:
+                return None
+            packed._put_item(item, *position)
+            positions.append(position)
+            first_row = position[1]
+        return positions
+
+
+    def _put_item(self, item, x, y):
+        """Put item to the place (it has to be free).
 
+            item:       InventoryObject instance.
+            x, y:       upper left cell coords of the place
+        """
+        width, height = item.size
+        mask = ((1 << width) - 1) << x
+        for row in range(y, y + height):
+            self._rows[row] |= mask
+            start = row * self.width + x
+            self._cells_items[start:start + width] = [item] * width
+        self._items_positions[item] = (x, y)
+
+
+    def __len__(self):
+        """Return number of items in storage.
+        """
+        return len(self._items_positions)
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Storage content %dx%d: %d items' % (
+                                    self.width, self.height, len(self))
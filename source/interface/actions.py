@@ -8,7 +8,7 @@
 import pygame
 from pygame import Rect
 
-from source.misc.events import events
+from source.misc.events import events, event_bus
 from source.misc._enums import *
 from source.misc._pathes import ACTIONS_TILES_PATH
 
@@ -122,11 +122,14 @@ class ActionInterface(pygame.sprite.Sprite):
         self._is_active = False
         self._selected_object = None
         self._actions_list = []
-        self._events = [pygame.USEREVENT, pygame.KEYDOWN]
-        self._custom_events = [
-            EVENT_DISABLE_ACTION_INTERFACE,
-            EVENT_ENABLE_ACTION_INTERFACE,
-            EVENT_UPDATE_ACTION_INTERFACE]
+        self._events = [pygame.KEYDOWN]
+
+        # True, if buttons were changed since they were drawn last time
+        self.dirty = True
+
+        event_bus.subscribe(EVENT_ENABLE_ACTION_INTERFACE, self._enable)
+        event_bus.subscribe(EVENT_DISABLE_ACTION_INTERFACE, self._disable)
+        event_bus.subscribe(EVENT_UPDATE_ACTION_INTERFACE, self._update)
 
 
     def _enable(self, direction, object_):
@@ -139,6 +142,7 @@ class ActionInterface(pygame.sprite.Sprite):
         self._actions_list = object_.get_actions_list()
         self._direction = direction
         self._is_active = True
+        self.dirty = True
 
 
     def _update(self):
@@ -146,12 +150,15 @@ class ActionInterface(pygame.sprite.Sprite):
         """
         if self._selected_object:
             self._actions_list = self._selected_object.get_actions_list()
+            self.dirty = True
 
 
     def _disable(self):
         """Disable action buttons.
         """
         self._is_active = False
+        self.dirty = True
+        events.actions_interface_close_reporting()
 
 
     def draw(self, screen):
@@ -164,6 +171,19 @@ class ActionInterface(pygame.sprite.Sprite):
             for icon, coords in zip(self._actions_list,
                                                    positions[self._direction]):
                 screen.blit(self._tileset[icon], coords)
+        self.dirty = False
+
+
+    def get_rect(self):
+        """Return Rect, covering buttons, shown now, or None.
+        """
+        if not (self._is_active and self._actions_list):
+            return None
+        positions = self._positions[len(self._actions_list)]
+        rects = [self._tileset[icon].get_rect(topleft=coords)
+                 for icon, coords in zip(self._actions_list,
+                                         positions[self._direction])]
+        return rects[0].unionall(rects)
 
 
     def handle_event(self, event):
@@ -194,25 +214,6 @@ class ActionInterface(pygame.sprite.Sprite):
                 self._selected_object.player_acts_good()
                 return True
 
-        # if user event, proceed enabling/disableing interface:
-        elif event.type == pygame.USEREVENT:
-
-            if event.custom_type == EVENT_ENABLE_ACTION_INTERFACE:
-                self._enable(event.direction, event.object_)
-                return True
-
-            elif event.custom_type == EVENT_DISABLE_ACTION_INTERFACE:
-                self._disable()
-                events.actions_interface_close_reporting()
-                return True
-
-            elif event.custom_type == EVENT_UPDATE_ACTION_INTERFACE:
-                self._update()
-                return True
-
-            else:
-                return False
-
         # don't proceed anything else.
         else:
             return False
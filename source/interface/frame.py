@@ -6,12 +6,20 @@
 ----------------------------------------------------------"""
 
 
+from collections import OrderedDict
+
 import pygame
 from pygame import Rect, Surface, Color
 
 from source.misc._enums import *
 
 
+# ------------------------------ CONST ------------------------------------- #
+
+# maximum number of cached backgrounds (of all sizes) per frame config
+BACKGROUNDS_CACHE_SIZE = 16
+
+
 # ======================== Frame config class ========================= #
 
 
@@ -19,7 +27,7 @@ class FrameConfig(object):
     """Small class for Frame class configuration purposes.
     """
     def __init__(self, tileset_path, part_rects, padding=1, max_size=None,
-                                       min_size=None, bg_color=Color(0, 0, 0)):
+                        min_size=None, bg_color=Color(0, 0, 0), size_step=1):
         """
         Creates simple config object for Frame class:
 
@@ -31,6 +39,9 @@ class FrameConfig(object):
             max_size:       (x, y), maximum frame size
             min_size:       (x, y), minimum frame size
             bg_color:       Color instance, for background re-filling
+            size_step:      frame size is changed by this step while
+                            resizing (from minimum size), so close sizes
+                            share cached background
         """
         self.tileset_path = tileset_path
         self.part_rects = part_rects
@@ -38,6 +49,158 @@ class FrameConfig(object):
         self.max_size = max_size
         self.min_size = min_size
         self.bg_color = bg_color
+        self.size_step = size_step
+
+
+# ====================== Frame background class ======================= #
+
+
+class FrameBackground(object):
+    """Nine-slice renderer of frame backgrounds: corners, sides, tiled
+    by planks, and filled center. One instance is shared by all frames
+    with the same config (see get()).
+
+    Rendered backgrounds are cached by size (the least recently used
+    ones are dropped). Sides are blitted at once from strips, where
+    planks are tiled only once.
+    """
+    _instances = {}
+
+    @classmethod
+    def get(cls, frame_config, tileset):
+        """Return renderer for the frame config.
+
+            frame_config:   FrameConfig instance
+            tileset:        {<part enum>: Surface} - tiles of frame parts
+        """
+        if frame_config not in cls._instances:
+            cls._instances[frame_config] = cls(frame_config, tileset)
+        return cls._instances[frame_config]
+
+
+    def __init__(self, frame_config, tileset):
+        """Init.
+
+            frame_config:   FrameConfig instance
+            tileset:        {<part enum>: Surface} - tiles of frame parts
+        """
+        self._parts_rects = frame_config.part_rects
+        self._background_color = frame_config.bg_color
+        self._tileset = tileset
+
+        # {<side enum>: Surface with tiled planks}
+        self._strips = {}
+        # {(<width>, <height>): Surface}, the last used is the last
+        self._cache = OrderedDict()
+
+
+    def render(self, width, height):
+        """Return background Surface of the size (shared between
+        frames, so it has to be copied before drawing on it).
+
+            width, height:  frame size
+        """
+        key = (width, height)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        surface = Surface((width, height))
+        surface.fill(self._background_color)
+        parts_rects = self._parts_rects
+        tileset = self._tileset
+
+        # draw top side of the HUD
+        self._draw_side(surface, UP,
+                        parts_rects[TOP_LEFT].width, 0,
+                        width - parts_rects[TOP_LEFT].width
+                              - parts_rects[TOP_RIGHT].width)
+
+        # draw bottom side of the HUD
+        self._draw_side(surface, DOWN,
+                        parts_rects[BOTTOM_LEFT].width,
+                        height - tileset[DOWN].get_size()[1],
+                        width - parts_rects[BOTTOM_LEFT].width
+                              - parts_rects[BOTTOM_RIGHT].width)
+
+        # draw left side of the HUD
+        self._draw_side(surface, LEFT,
+                        0, parts_rects[TOP_LEFT].height,
+                        height - parts_rects[TOP_LEFT].height
+                               - parts_rects[BOTTOM_LEFT].height)
+
+        # draw right side of the HUD
+        self._draw_side(surface, RIGHT,
+                        width - tileset[RIGHT].get_size()[0],
+                        parts_rects[TOP_RIGHT].height,
+                        height - parts_rects[TOP_RIGHT].height
+                               - parts_rects[BOTTOM_RIGHT].height)
+
+        # draw corners
+        surface.blit(tileset[TOP_LEFT], (0, 0))
+        surface.blit(tileset[TOP_RIGHT],
+                           (width - tileset[TOP_RIGHT].get_size()[0], 0))
+        surface.blit(tileset[BOTTOM_LEFT],
+                           (0, height - parts_rects[BOTTOM_LEFT].height))
+        surface.blit(tileset[BOTTOM_RIGHT],
+                    (width - tileset[BOTTOM_RIGHT].get_size()[0],
+                     height - tileset[BOTTOM_RIGHT].get_size()[1]))
+
+        self._cache[key] = surface
+        if len(self._cache) > BACKGROUNDS_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return surface
+
+
+    def _draw_side(self, surface, side, x, y, length):
+        """Draw side of the frame by one blit of the strip part.
+
+            surface:        background Surface
+            side:           UP, DOWN, LEFT or RIGHT
+            x, y:           coords of the side beginning
+            length:         side length (in pixels)
+        """
+        if length <= 0:
+            return
+        strip = self._get_strip(side, length)
+        if side in (UP, DOWN):
+            area = (0, 0, length, strip.get_height())
+        else:
+            area = (0, 0, strip.get_width(), length)
+        surface.blit(strip, (x, y), area)
+
+
+    def _get_strip(self, side, length):
+        """Return Surface of the side's planks, tiled along the side,
+        not shorter than length.
+
+            side:           UP, DOWN, LEFT or RIGHT
+            length:         minimum strip length (in pixels)
+        """
+        strip = self._strips.get(side)
+        is_horizontal = side in (UP, DOWN)
+        if strip is not None and length <= (strip.get_width()
+                                  if is_horizontal else strip.get_height()):
+            return strip
+
+        plank = self._tileset[side]
+        plank_width, plank_height = plank.get_size()
+        if is_horizontal:
+            strip = Surface((length, plank_height))
+            for x in range(0, length, plank_width):
+                strip.blit(plank, (x, 0))
+        else:
+            strip = Surface((plank_width, length))
+            for y in range(0, length, plank_height):
+                strip.blit(plank, (0, y))
+        self._strips[side] = strip
+        return strip
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Frame background: %d sizes cached' % len(self._cache)
 
 
 # ========================== Frame class ============================== #
@@ -76,17 +239,18 @@ class Frame(object):
             self._min_size = (self.rect.width, self.rect.height)
 
         self._padding = frame_config.padding
+        self._size_step = frame_config.size_step
 
         self._events = {}
 
-        # "_background_source" used as hidden canvas of maximum size, where
-        # borders and background are drawn
-        self._background_source = Surface(self._max_size)
-
-        # "_background" used as a part of "_background_source", that is
-        # actually drawn on screen
+        # "_background" is copy of rendered background of current size,
+        # that is actually drawn on screen (frame contents are drawn on it)
         self._background = None
 
+        # True, if frame was changed (moved, resized or redrawn), since
+        # it was drawn last time
+        self.dirty = True
+
         self._dragging = False
         self._resizing = False
         self._mouse_pressed_pos = None
@@ -103,6 +267,8 @@ class Frame(object):
                 _rect = self._parts_rects[q]
                 self._tileset[q] = image.subsurface(_rect).convert()
             Frame._cached_tilesets[frame_config.tileset_path] = self._tileset
+        self._background_renderer = FrameBackground.get(frame_config,
+                                                        self._tileset)
 
         # 3. ~ Make background ~
 
@@ -110,11 +276,15 @@ class Frame(object):
         max_x, max_y = self._max_size
         self.rect.width = min(max(self.rect.width, min_x), max_x)
         self.rect.height = min(max(self.rect.height, min_y), max_y)
+        # size, wanted by resizing (before applying of size step)
+        self._wanted_size = self.rect.size
         self._redraw_background()
 
 
     def resize(self, dx, dy):
         """Change size of the frame relatevly on deltas of X and Y.
+        Size is changed by size step of frame config.
+        Return True, if size was actually changed.
 
             dx:     delta on X
             dy:     delta on Y
@@ -122,13 +292,20 @@ class Frame(object):
         min_x, min_y = self._min_size
         max_x, max_y = self._max_size
 
-        new_width = min(max(self.rect.width + dx, min_x), max_x)
-        new_height = min(max(self.rect.height + dy, min_y), max_y)
+        wanted_width = min(max(self._wanted_size[0] + dx, min_x), max_x)
+        wanted_height = min(max(self._wanted_size[1] + dy, min_y), max_y)
+        self._wanted_size = (wanted_width, wanted_height)
+
+        step = self._size_step
+        new_width = min_x + (wanted_width - min_x) // step * step
+        new_height = min_y + (wanted_height - min_y) // step * step
 
         if (self.rect.width != new_width or self.rect.height != new_height):
             self.rect.width = new_width
             self.rect.height = new_height
             self._redraw_background()
+            return True
+        return False
 
 
     def move(self, dx, dy):
@@ -139,6 +316,7 @@ class Frame(object):
         """
         self.rect.x += dx
         self.rect.y += dy
+        self.dirty = True
 
 
     def draw(self, screen):
@@ -149,6 +327,14 @@ class Frame(object):
         screen.blit(self._background, self.rect)
 
 
+    def is_animated(self):
+        """Return True, if frame draws something new in every game
+        frame (e.g. following the mouse), so it's picture could not be
+        reused. Frame is static by default.
+        """
+        return False
+
+
     def add_event_handler(self, event_type, callback):
         """Add event to be handled
 
@@ -198,15 +384,15 @@ class Frame(object):
     def _update_resizing(self):
         """Method for using in classes, descendants of Frame.
         If resizing state was enabled, update frame's size.
+        Return True, if size was changed, else False.
         """
         if self._resizing:
             current_mouse_pos = pygame.mouse.get_pos()
             if current_mouse_pos != self._mouse_pressed_pos:
                 dx = current_mouse_pos[0] - self._mouse_pressed_pos[0]
                 dy = current_mouse_pos[1] - self._mouse_pressed_pos[1]
-                self.resize(dx, dy)
                 self._mouse_pressed_pos = current_mouse_pos
-                return True
+                return self.resize(dx, dy)
         return False
 
 
@@ -247,71 +433,12 @@ class Frame(object):
 
 
     def _redraw_background(self):
-        """Draw background on "_background_source" surface.
-        Set "_background" attribute to actual part of it.
+        """Set "_background" attribute to copy of rendered background
+        of current frame size.
         """
-        width = self.rect.width
-        height = self.rect.height
-        surface = self._background_source
-
-        surface.fill(self._background_color)
-
-        # draw top side of the HUD
-        hud_top_side_len = width - self._parts_rects[TOP_LEFT].width \
-                                           - self._parts_rects[TOP_RIGHT].width
-        plank_width, _ = self._tileset[UP].get_size()
-        x = self._parts_rects[TOP_LEFT].width
-        y = 0
-        while hud_top_side_len > 0:
-            surface.blit(self._tileset[UP], (x, y))
-            x += plank_width
-            hud_top_side_len -= plank_width
-
-        # draw bottom side of the HUD
-        hud_bottom_side_len = width - self._parts_rects[BOTTOM_LEFT].width \
-                                        - self._parts_rects[BOTTOM_RIGHT].width
-        plank_width, _ = self._tileset[DOWN].get_size()
-        x = self._parts_rects[BOTTOM_LEFT].width
-        y = height - self._tileset[DOWN].get_size()[1]
-        while hud_bottom_side_len > 0:
-            surface.blit(self._tileset[DOWN], (x, y))
-            x += plank_width
-            hud_bottom_side_len -= plank_width
-
-        # draw left side of the HUD
-        hud_left_side_len = height - self._parts_rects[TOP_LEFT].height \
-                                        - self._parts_rects[BOTTOM_LEFT].height
-        _, plank_height = self._tileset[LEFT].get_size()
-        y = self._parts_rects[TOP_LEFT].height
-        x = 0
-        while hud_left_side_len > 0:
-            surface.blit(self._tileset[LEFT], (x, y))
-            y += plank_height
-            hud_left_side_len -= plank_height
-
-        # draw right side of the HUD
-        hud_right_side_len = height - self._parts_rects[TOP_RIGHT].height \
-                                       - self._parts_rects[BOTTOM_RIGHT].height
-        _, plank_height = self._tileset[RIGHT].get_size()
-        y = self._parts_rects[TOP_RIGHT].height
-        x = width - self._tileset[RIGHT].get_size()[0]
-        while hud_right_side_len > 0:
-            surface.blit(self._tileset[RIGHT], (x, y))
-            y += plank_height
-            hud_right_side_len -= plank_height
-
-        # draw corners
-        surface.blit(self._tileset[TOP_LEFT], (0, 0))
-        surface.blit(self._tileset[TOP_RIGHT],
-                           (width - self._tileset[TOP_RIGHT].get_size()[0], 0))
-        surface.blit(self._tileset[BOTTOM_LEFT],
-                           (0, height - self._parts_rects[BOTTOM_LEFT].height))
-        surface.blit(self._tileset[BOTTOM_RIGHT],
-                    (width - self._tileset[BOTTOM_RIGHT].get_size()[0],
-                     height - self._tileset[BOTTOM_RIGHT].get_size()[1]))
-
-        self._background = self._background_source.subsurface(
-                                     (0, 0, self.rect.width, self.rect.height))
+        self._background = self._background_renderer.render(
+                                     self.rect.width, self.rect.height).copy()
+        self.dirty = True
 
     # -------------------------------- #
 
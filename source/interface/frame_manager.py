@@ -5,9 +5,7 @@
  Description:
 ----------------------------------------------------------"""
 
-import pygame
-
-from source.misc.events import events
+from source.misc.events import events, event_bus
 from source.misc._enums import *
 from .storages.base import Storage
 
@@ -21,6 +19,12 @@ class FrameManager(object):
         self._frames = []
         self.events = []
 
+        # True, if frames list or order was changed since last drawing
+        self._order_changed = True
+
+        event_bus.subscribe(EVENT_SHOW_INTERFACE_FRAME, self.add_frame)
+        event_bus.subscribe(EVENT_HIDE_INTERFACE_FRAME, self.remove_frame)
+
 
     def add_frame(self, frame, on_top=True):
         """Add frame to manager's list.
@@ -32,6 +36,7 @@ class FrameManager(object):
             self._frames.append(frame)
         else:
             self._frames.insert(0, frame)
+        self._order_changed = True
         self._update_events()
 
         if isinstance(frame, Storage):
@@ -44,6 +49,7 @@ class FrameManager(object):
             frame:      Frame instance
         """
         self._frames.remove(frame)
+        self._order_changed = True
         self._update_events()
         events.force_memory_free()
 
@@ -53,17 +59,46 @@ class FrameManager(object):
 
             frame:      Frame instance
         """
-        self._frames.remove(frame)
-        self._frames.append(frame)
+        if self._frames[-1] is not frame:
+            self._frames.remove(frame)
+            self._frames.append(frame)
+            self._order_changed = True
 
 
     def draw_frames(self, screen):
-        """Draw all frames in manager.
+        """Draw all frames in manager. Frames are marked as not dirty.
 
             screen:     display screen Surface
         """
         for frame in self._frames:
             frame.draw(screen)
+            frame.dirty = False
+        self._order_changed = False
+
+
+    def is_dirty(self):
+        """Return True, if frames have to be drawn again: some frame
+        was changed, or frames were added, removed or reordered.
+        """
+        return self._order_changed or \
+               any(frame.dirty for frame in self._frames)
+
+
+    def is_animated(self):
+        """Return True, if some frame has to be drawn in every game
+        frame (see Frame.is_animated()).
+        """
+        return any(frame.is_animated() for frame in self._frames)
+
+
+    def get_frames_area(self):
+        """Return Rect, covering all frames, or None, if there are
+        no frames.
+        """
+        if not self._frames:
+            return None
+        return self._frames[0].rect.unionall(
+                                    [frame.rect for frame in self._frames])
 
 
     def handle_event(self, event):
@@ -74,17 +109,6 @@ class FrameManager(object):
         if event.type not in self.events:
             return False
 
-        # handle Frame Manager events:
-        if event.type == pygame.USEREVENT:
-
-            if event.custom_type == EVENT_SHOW_INTERFACE_FRAME:
-                self.add_frame(event.frame)
-                return True
-
-            elif event.custom_type == EVENT_HIDE_INTERFACE_FRAME:
-                self.remove_frame(event.frame)
-                return True
-
         # handle frames events:
         for frame in reversed(self._frames):
             if frame.handle_event(event):
@@ -7,6 +7,7 @@
 
 
 import pygame
+from pygame import Rect, Surface
 
 from source.misc._enums import *
 from .log import Log
@@ -26,6 +27,10 @@ LOG_START_COORDS = (0, 505, 497, 135)
 
 DEBUG_FONT = ('Comic Sans MS', 20)
 DEBUG_COLOR = pygame.Color(0, 250, 0)
+DEBUG_TEXT_POSITION = (20, 20)
+
+# transparent color of HUD overlay (never used in frames)
+OVERLAY_COLORKEY = pygame.Color(255, 0, 255)
 
 # ================================ HUD ==================================== #
 
@@ -34,6 +39,11 @@ class Hud(object):
     """Main manager class for game HUD.
     Contains all frames, indicators and other in-game info in
     action phase.
+
+    Frames are composed on overlay Surface, which is redrawn only when
+    some of them is changed, so unchanged frames are drawn by one blit.
+    Frames, drawing something new every game frame (e.g. dragged item),
+    are drawn on screen directly, while they do it.
     """
     def __init__(self, display_size, scale):
         """Init.
@@ -45,12 +55,29 @@ class Hud(object):
 
         self._frames_manager = FrameManager()
         self._debug_text = pygame.font.SysFont(*DEBUG_FONT)
+        self._debug_text_message = None
+        self._debug_text_surface = None
 
         self.log_frame = Log(LOG_START_COORDS)
         self._frames_manager.add_frame(self.log_frame)
 
         self._action_interface = ActionInterface(display_size, scale)
 
+        # frames are drawn on canvas, and area of canvas, covered by them,
+        # is copied to overlay (RLE-accelerated, so it's blitting is fast)
+        self._display_rect = Rect((0, 0), display_size)
+        self._overlay_canvas = Surface(display_size)
+        self._overlay = None
+        self._overlay_position = None
+        # False, if overlay has to be redrawn
+        self._is_overlay_actual = False
+
+        # what was drawn last time, to find screen areas, changed since
+        self._was_animated = False
+        self._action_interface_rect = None
+        self._debug_text_rect = None
+        self._is_debug_text_changed = False
+
 
         # ---------------- testing, del later ----------------------------- #
         self._pseudo_inventory_enabled = False      # TEST! DELETE LATER !!!!
@@ -74,10 +101,46 @@ class Hud(object):
             debug_text:     debug text to be shown on screen.
         """
         self._frames_manager.update()
-        if debug_text:
+        debug_text = debug_text or None
+        if debug_text != self._debug_text_message:
             self._debug_text_message = debug_text
-        else:
-            self._debug_text_message = None
+            if debug_text:
+                self._debug_text_surface = self._debug_text.render(
+                                                debug_text, False, DEBUG_COLOR)
+            else:
+                self._debug_text_surface = None
+            self._is_debug_text_changed = True
+
+
+    def get_dirty_rects(self):
+        """Return list of screen Rects, which will be changed by the
+        next draw() call (comparing with the previous one), or None, if
+        HUD could be changed anywhere on screen (some frame draws
+        something new every game frame, or did it last time).
+        """
+        if self._was_animated or self._frames_manager.is_animated():
+            return None
+
+        rects = []
+        if not self._is_overlay_actual or self._frames_manager.is_dirty():
+            if self._overlay:
+                rects.append(self._overlay.get_rect(
+                                            topleft=self._overlay_position))
+            area = self._frames_manager.get_frames_area()
+            if area is not None:
+                rects.append(area.clip(self._display_rect))
+
+        if self._is_debug_text_changed:
+            rects.append(self._debug_text_rect)
+            if self._debug_text_surface:
+                rects.append(self._debug_text_surface.get_rect(
+                                                 topleft=DEBUG_TEXT_POSITION))
+
+        if self._action_interface.dirty:
+            rects.append(self._action_interface_rect)
+            rects.append(self._action_interface.get_rect())
+
+        return [rect for rect in rects if rect]
 
 
     def draw(self, screen):
@@ -85,22 +148,56 @@ class Hud(object):
 
             screen:     display screen Surface
         """
+        self._action_interface_rect = self._action_interface.get_rect()
         self._action_interface.draw(screen)
-        self._frames_manager.draw_frames(screen)
+
+        self._was_animated = self._frames_manager.is_animated()
+        if self._was_animated:
+            self._frames_manager.draw_frames(screen)
+            self._is_overlay_actual = False
+        else:
+            if not self._is_overlay_actual or \
+                                          self._frames_manager.is_dirty():
+                self._redraw_overlay()
+            if self._overlay:
+                screen.blit(self._overlay, self._overlay_position)
+
         self._debug_outtext(screen)
 
 
+    def _redraw_overlay(self):
+        """Compose frames on overlay Surface.
+        """
+        self._is_overlay_actual = True
+        self._overlay = None
+
+        area = self._frames_manager.get_frames_area()
+        if area is not None:
+            area = area.clip(self._display_rect)
+        if not area:
+            self._frames_manager.draw_frames(self._overlay_canvas)
+            return
+
+        self._overlay_canvas.fill(OVERLAY_COLORKEY, area)
+        self._frames_manager.draw_frames(self._overlay_canvas)
+        self._overlay = self._overlay_canvas.subsurface(area).copy()
+        self._overlay.set_colorkey(OVERLAY_COLORKEY, pygame.RLEACCEL)
+        self._overlay_position = area.topleft
+
+
     def _debug_outtext(self, screen):
-        """Output line of text in a top left corner +20+20 with 25px interval.
-        For debug purposes.
+        """Output line of text in a top left corner +20+20 (text is
+        rendered only when it is changed). For debug purposes.
 
             screen:     display screen Surface
         """
-        textsurface = self._debug_text.render(
-            self._debug_text_message,
-            False,
-            DEBUG_COLOR)
-        screen.blit(textsurface, (20, 20))
+        self._is_debug_text_changed = False
+        if self._debug_text_surface:
+            screen.blit(self._debug_text_surface, DEBUG_TEXT_POSITION)
+            self._debug_text_rect = self._debug_text_surface.get_rect(
+                                                 topleft=DEBUG_TEXT_POSITION)
+        else:
+            self._debug_text_rect = None
 
     # -------------------------------- #
 
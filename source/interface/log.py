@@ -5,15 +5,16 @@
 ----------------------------------------------------------"""
 
 import os
-from collections import deque
-from itertools import islice
+from collections import OrderedDict
 
 import pygame
 from pygame import Rect, Color
 
 from source.misc._enums import *
 from source.misc._pathes import INTERFACE_DIR
+from source.misc.events import event_bus
 from .frame import Frame, FrameConfig
+from .log_history import LogHistory
 
 # ------------------------------ CONST ------------------------------------- #
 
@@ -37,7 +38,6 @@ FRAME_CONFIG = FrameConfig(
 
 # ------------ LOG specific consts: ---------- #
 
-DEQUE_MAX_LEN = 30
 TEXT_COLORS = {
     None: Color(200, 200, 200),
     DANGER: Color(230, 0, 0),
@@ -46,6 +46,9 @@ TEXT_COLORS = {
 }
 RESIZE_BUTTON_SIZE = 20
 
+# maximum number of messages with cached rendered lines
+LINES_CACHE_SIZE = 256
+
 FONT = ('Lucida Console', 15)
 LINE_SPACING = 2
 
@@ -66,10 +69,18 @@ class Log(Frame):
 
         super(Log, self).__init__(rect=rect, frame_config=FRAME_CONFIG)
 
-        self._messages = deque(maxlen=DEQUE_MAX_LEN)
+        self._messages = LogHistory()
+        # tag of shown messages (None - all messages are shown)
+        self._tag_filter = None
         self._font = pygame.font.SysFont(*FONT)
-        self._current_message_index = None
-        self._bottomed_message_index = None
+        # rendered lines of messages, the last used is the last:
+        # {(<message>, <tag>, <width>): tuple of lines Surfaces}
+        self._lines_cache = OrderedDict()
+        # numbers of messages in history: the top shown one (None, if
+        # text is aligned to bottom) and the top one of bottom aligned
+        # text (where scrolling up starts from)
+        self._current_message_number = None
+        self._bottomed_message_number = None
         self._up_to_last_string = False
         self._update_text()
 
@@ -79,7 +90,7 @@ class Log(Frame):
                                                 self._event_mousebutton_up)
         self.add_event_handler(pygame.MOUSEBUTTONDOWN,
                                                 self._event_mousebutton_down)
-        self.add_event_handler(pygame.USEREVENT, self._custom_event)
+        event_bus.subscribe(EVENT_PLAYER_MESSAGE_TO_LOG, self._on_message)
 
 
     def output(self, msg, tag=None):
@@ -88,7 +99,21 @@ class Log(Frame):
             msg:    message text
             tag:    DANGER, SUCCESS, FAIL or None
         """
-        self._messages.append((msg, tag))
+        self._messages.append(msg, tag)
+        if self._current_message_number is not None:
+            self._update_text_bottomed()
+        elif self._tag_filter is None or self._tag_filter == tag:
+            # text is already aligned to bottom: just add new lines
+            self._add_text_bottomed(msg, tag)
+
+
+    def set_tag_filter(self, tag):
+        """Show only messages with the tag (messages are taken from
+        index of the tag, not filtered one by one).
+
+            tag:    DANGER, SUCCESS, FAIL, or None to show all messages
+        """
+        self._tag_filter = tag
         self._update_text_bottomed()
 
 
@@ -105,7 +130,7 @@ class Log(Frame):
 
             bottom_anchor:      if True, force to bottom align.
         """
-        if bottom_anchor or self._current_message_index is None:
+        if bottom_anchor or self._current_message_number is None:
             self._update_text_bottomed()
         else:
             self._update_text_topped()
@@ -114,7 +139,8 @@ class Log(Frame):
     def _update_text_topped(self):
         """Update text in the log, redrawing them on log frame.
         This method will align text to the top of the log by current
-        message index.
+        message number. Only messages, visible in the log, are taken
+        from history.
         """
         _width, _height = self._background.get_size()
         text_frame = self._background.subsurface(
@@ -124,6 +150,7 @@ class Log(Frame):
                              _height - self._padding * 2))
 
         text_frame.fill(self._background_color)
+        self.dirty = True
         font_height = self._font.size("Tg")[1]
         text_width = text_frame.get_width()
         text_height = text_frame.get_height()
@@ -131,16 +158,15 @@ class Log(Frame):
         position_y = 0
         max_position_y = text_height
 
-        messages = islice(self._messages,
-                          self._current_message_index,
-                          len(self._messages))
+        messages = self._messages.iter_forward(
+                        self._current_message_number, self._tag_filter)
 
         self._up_to_last_string = False
-        for msg, tag in messages:
-            for strings_surface in self._get_strings_surfaces_from_message(
+        for _, msg, tag in messages:
+            for strings_surface in self._get_message_lines(
                             msg=msg,
-                            width=text_width,
-                            color=TEXT_COLORS[tag]):
+                            tag=tag,
+                            width=text_width):
                 if position_y > max_position_y:
                     return
                 text_frame.blit(strings_surface, (0, position_y))
@@ -151,6 +177,7 @@ class Log(Frame):
     def _update_text_bottomed(self):
         """Update text in the log, redrawing them on log frame.
         This method will align text to bottom of the log.
+        Only messages, visible in the log, are taken from history.
         """
         _width, _height = self._background.get_size()
         text_frame = self._background.subsurface(
@@ -160,6 +187,7 @@ class Log(Frame):
                              _height - self._padding * 2))
 
         text_frame.fill(self._background_color)
+        self.dirty = True
         font_height = self._font.size("Tg")[1]
         text_width = text_frame.get_width()
         text_height = text_frame.get_height()
@@ -168,48 +196,119 @@ class Log(Frame):
         min_position_y = - font_height
 
         self._up_to_last_string = True
+        self._current_message_number = None
 
-        message_index = len(self._messages) - 1
-        for msg, tag in reversed(self._messages):
+        for number, msg, tag in self._messages.iter_backward(
+                                                            self._tag_filter):
             for strings_surface in reversed(
-                    self._get_strings_surfaces_from_message(
+                    self._get_message_lines(
                             msg=msg,
-                            width=text_width,
-                            color=TEXT_COLORS[tag])):
+                            tag=tag,
+                            width=text_width)):
                 text_frame.blit(strings_surface, (0, position_y))
                 position_y -= font_height + LINE_SPACING
                 if position_y < min_position_y:
-                    self._current_message_index = None
-                    # update last shown message index
-                    self._bottomed_message_index = message_index
+                    # update last shown message number
+                    self._bottomed_message_number = number
                     return
-            message_index -= 1
+        self._bottomed_message_number = None
+
+
+    def _add_text_bottomed(self, msg, tag):
+        """Add lines of new message to the bottom of the log, moving
+        already drawn text up (instead of redrawing all of it).
+
+            msg:        string message
+            tag:        DANGER, SUCCESS, FAIL or None
+        """
+        _width, _height = self._background.get_size()
+        text_frame = self._background.subsurface(
+                            (self._padding,
+                             self._padding,
+                             _width - self._padding * 2,
+                             _height - self._padding * 2))
+
+        font_height = self._font.size("Tg")[1]
+        line_height = font_height + LINE_SPACING
+        text_width = text_frame.get_width()
+        text_height = text_frame.get_height()
 
+        lines = self._get_message_lines(msg=msg, tag=tag, width=text_width)
+        shift = len(lines) * line_height
+        text_frame.scroll(0, -shift)
+        text_frame.fill(self._background_color,
+                        (0, text_height - shift, text_width, shift))
+        self.dirty = True
 
-    def _get_strings_surfaces_from_message(self, msg, width, color):
-        """Get list of surfaces, everyone is a fraphical string
-        of message (according to frame width).
+        position_y = text_height - font_height
+        for strings_surface in reversed(lines):
+            text_frame.blit(strings_surface, (0, position_y))
+            position_y -= line_height
+
+        # update last shown message number
+        position_y = text_height - font_height
+        for number, msg, tag in self._messages.iter_backward(
+                                                            self._tag_filter):
+            lines = self._get_message_lines(msg=msg, tag=tag, width=text_width)
+            position_y -= line_height * len(lines)
+            if position_y < - font_height:
+                self._bottomed_message_number = number
+                return
+
+
+    def _get_message_lines(self, msg, tag, width):
+        """Get tuple of surfaces, everyone is a graphical string
+        of message (according to frame width). Lines are rendered once
+        and are taken from cache, while message is shown.
 
             msg:        string message
+            tag:        DANGER, SUCCESS, FAIL or None
             width:      width of textbox in pixels
-            color:      Color class instance
         """
-        strings_surfaces = []
+        key = (msg, tag, width)
+        lines = self._lines_cache.get(key)
+        if lines is not None:
+            self._lines_cache.move_to_end(key)
+            return lines
+
+        color = TEXT_COLORS[tag]
+        lines = tuple(
+            self._font.render(string, False, color, self._background_color)
+            for string in self._wrap_message(msg, width))
+
+        self._lines_cache[key] = lines
+        if len(self._lines_cache) > LINES_CACHE_SIZE:
+            self._lines_cache.popitem(last=False)
+        return lines
+
+
+    def _wrap_message(self, msg, width):
+        """Split message to strings, fitting into the width (by words,
+        if it is possible).
+
+            msg:        string message
+            width:      width of textbox in pixels
+        """
+        strings = []
         while msg:
-            q = 1
-            # determine maximum width of line
-            while self._font.size(msg[:q])[0] < width and q < len(msg):
-                q += 1
+            # determine the shortest part of msg, reaching the width
+            # (width of the text grows with it's length, so binary
+            # search is used instead of checking parts one by one)
+            low, high = 1, len(msg)
+            while low < high:
+                middle = (low + high) // 2
+                if self._font.size(msg[:middle])[0] < width:
+                    low = middle + 1
+                else:
+                    high = middle
+            q = low
             # if we've wrapped the msg, then adjust the wrap to the last word
             if q < len(msg):
-                q = msg.rfind(" ", 0, q) + 1
-            # render the line
-            strings_surfaces.append(
-                self._font.render(
-                    msg[:q], False, color, self._background_color))
-            # remove the msg we just blitted
+                q = msg.rfind(" ", 0, q) + 1 or max(q - 1, 1)
+            strings.append(msg[:q])
+            # remove the msg we just wrapped
             msg = msg[q:]
-        return strings_surfaces
+        return strings
 
 
     def _is_resize_corner_selected(self, coords):
@@ -263,55 +362,58 @@ class Log(Frame):
             return False
 
 
-    def _custom_event(self, event):
-        """Handle some custom event.
+    def _on_message(self, message, message_type, once):
+        """Handle player's message event.
+
+            message:                message text,
+            message_type:           message tag (None for default)
+            once:                   flag, True if need preventing spam
         """
-        if event.custom_type == EVENT_PLAYER_MESSAGE_TO_LOG:
-            if (not event.once) or (not self._messages) or (
-                        not self._is_msg_appears_last_time(
-                                           event.message, event.message_type)):
-                self.output(event.message, tag=event.message_type)
-            return True
-        else:
-            return False
+        if (not once) or (
+                    not self._is_msg_appears_last_time(message, message_type)):
+            self.output(message, tag=message_type)
 
 
     def _is_msg_appears_last_time(self, msg, msg_type):
         """
         """
         pair = (msg, msg_type)
-        for q in range(min(len(self._messages), 5)):
-            if self._messages[-q - 1] == pair:
+        number = self._messages.get_last()
+        for q in range(5):
+            if number is None:
+                break
+            if self._messages.get(number) == pair:
                 return True
+            number = self._messages.get_previous(number)
         return False
 
 
     def _scroll_up(self):
         """Scroll text content up.
         """
-        messages_count = len(self._messages)
-        if not messages_count or \
-           self._current_message_index == 0:
-            return
-
-        if self._current_message_index is None:
-            self._current_message_index = self._bottomed_message_index
+        if self._current_message_number is None:
+            if self._bottomed_message_number is None:
+                return
+            self._current_message_number = self._bottomed_message_number
         else:
-            self._current_message_index -= 1
+            number = self._messages.get_previous(
+                            self._current_message_number, self._tag_filter)
+            if number is None:
+                return
+            self._current_message_number = number
         self._update_text()
 
 
     def _scroll_down(self):
         """Scroll text content down.
         """
-        messages_count = len(self._messages)
-        if not messages_count or \
-           self._current_message_index is None or \
-           self._up_to_last_string or \
-           self._current_message_index == messages_count - 1:
+        if self._current_message_number is None or self._up_to_last_string:
             return
-
-        self._current_message_index += 1
+        number = self._messages.get_next(
+                            self._current_message_number, self._tag_filter)
+        if number is None:
+            return
+        self._current_message_number = number
         self._update_text()
 
     # -------------------------------- #
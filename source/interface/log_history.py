@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Compact storage of player's log messages.
+----------------------------------------------------------"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from source.misc._enums import *
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+# maximum number of messages in history
+HISTORY_MAX_LEN = 200000
+
+# part of history, dropped at once, when it is full
+HISTORY_TRIM_PART = 0.25
+
+# messages tags (tag code is index in this tuple)
+TAGS = (None, DANGER, SUCCESS, FAIL)
+
+# ========================== LOG HISTORY CLASS ============================== #
+
+
+class LogHistory(object):
+    """History of log messages.
+
+    Every message gets sequential number (it is never changed, even if
+    older messages are dropped). Message is stored as number of it's
+    text in table of unique texts (so repeated messages cost some
+    bytes) and tag code. Also, numbers of messages of every tag are
+    indexed, so messages could be filtered by tag without checking all
+    of them.
+
+    When history is full, the oldest messages are dropped (by big
+    parts, to keep appending cheap).
+    """
+    def __init__(self, max_len=HISTORY_MAX_LEN):
+        """Init.
+
+            max_len:        maximum number of messages
+        """
+        self.max_len = max_len
+
+        # number of the first kept message
+        self._first = 0
+
+        self._text_ids = array('I')
+        self._tag_codes = bytearray()
+
+        self._texts = []
+        self._text_ids_by_texts = {}
+
+        # {<tag>: array of numbers of messages with this tag}
+        self._tag_indexes = dict((tag, array('I')) for tag in TAGS)
+
+
+    def append(self, msg, tag=None):
+        """Add new message. Return it's number.
+
+            msg:            message text
+            tag:            DANGER, SUCCESS, FAIL or None
+        """
+        text_id = self._text_ids_by_texts.get(msg)
+        if text_id is None:
+            text_id = len(self._texts)
+            self._texts.append(msg)
+            self._text_ids_by_texts[msg] = text_id
+
+        number = self._first + len(self._text_ids)
+        self._text_ids.append(text_id)
+        self._tag_codes.append(TAGS.index(tag))
+        self._tag_indexes[tag].append(number)
+
+        if len(self._text_ids) > self.max_len:
+            self._trim(int(self.max_len * HISTORY_TRIM_PART) or 1)
+        return number
+
+
+    def get(self, number):
+        """Return message by it's number: (<text>, <tag>).
+
+            number:         message number
+        """
+        position = number - self._first
+        if not 0 <= position < len(self._text_ids):
+            raise IndexError('No message with number %d' % number)
+        return (self._texts[self._text_ids[position]],
+                TAGS[self._tag_codes[position]])
+
+
+    def get_first(self, tag_filter=None):
+        """Return number of the first message (with tag, if filter is
+        set), or None, if there are no such messages.
+
+            tag_filter:     tag, or None for all messages
+        """
+        if tag_filter is None:
+            return self._first if self._text_ids else None
+        numbers = self._tag_indexes[tag_filter]
+        return numbers[0] if numbers else None
+
+
+    def get_last(self, tag_filter=None):
+        """Return number of the last message (with tag, if filter is
+        set), or None, if there are no such messages.
+
+            tag_filter:     tag, or None for all messages
+        """
+        if tag_filter is None:
+            return self._first + len(self._text_ids) - 1 \
+                                                if self._text_ids else None
+        numbers = self._tag_indexes[tag_filter]
+        return numbers[-1] if numbers else None
+
+
+    def get_previous(self, number, tag_filter=None):
+        """Return number of message before the message (with tag, if
+        filter is set), or None.
+
+            number:         message number
+            tag_filter:     tag, or None for all messages
+        """
+        if tag_filter is None:
+            return number - 1 if number > self._first else None
+        numbers = self._tag_indexes[tag_filter]
+        position = bisect_left(numbers, number)
+        return numbers[position - 1] if position else None
+
+
+    def get_next(self, number, tag_filter=None):
+        """Return number of message after the message (with tag, if
+        filter is set), or None.
+
+            number:         message number
+            tag_filter:     tag, or None for all messages
+        """
+        if tag_filter is None:
+            last = self.get_last()
+            return number + 1 if last is not None and number < last else None
+        numbers = self._tag_indexes[tag_filter]
+        position = bisect_right(numbers, number)
+        return numbers[position] if position < len(numbers) else None
+
+
+    def iter_forward(self, number, tag_filter=None):
+        """Iterate over messages from the message (with tag, if filter
+        is set) to the last one. Yield (<number>, <text>, <tag>).
+
+            number:         message number to start with
+            tag_filter:     tag, or None for all messages
+        """
+        number = max(number, self._first)
+        if tag_filter is not None:
+            numbers = self._tag_indexes[tag_filter]
+            position = bisect_left(numbers, number)
+            number = numbers[position] if position < len(numbers) else None
+
+        while number is not None:
+            text, tag = self.get(number)
+            yield number, text, tag
+            number = self.get_next(number, tag_filter)
+
+
+    def iter_backward(self, tag_filter=None):
+        """Iterate over messages from the last one (with tag, if filter
+        is set) to the first one. Yield (<number>, <text>, <tag>).
+
+            tag_filter:     tag, or None for all messages
+        """
+        number = self.get_last(tag_filter)
+        while number is not None:
+            text, tag = self.get(number)
+            yield number, text, tag
+            number = self.get_previous(number, tag_filter)
+
+
+    def _trim(self, count):
+        """Drop the oldest messages (and texts, not used anymore).
+
+            count:          number of messages to drop
+        """
+        self._first += count
+        del self._text_ids[:count]
+        del self._tag_codes[:count]
+        for numbers in self._tag_indexes.values():
+            del numbers[:bisect_left(numbers, self._first)]
+
+        # renumber texts, left in use
+        texts = []
+        text_ids_by_texts = {}
+        new_ids = {}
+        for position, text_id in enumerate(self._text_ids):
+            new_id = new_ids.get(text_id)
+            if new_id is None:
+                new_id = new_ids[text_id] = len(texts)
+                texts.append(self._texts[text_id])
+                text_ids_by_texts[texts[-1]] = new_id
+            self._text_ids[position] = new_id
+        self._texts = texts
+        self._text_ids_by_texts = text_ids_by_texts
+
+
+    def __len__(self):
+        """Return number of messages in history.
+        """
+        return len(self._text_ids)
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Log history: %d messages, %d texts' % (
+                                         len(self._text_ids), len(self._texts))
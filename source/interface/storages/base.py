@@ -14,6 +14,11 @@ from source.sounds.sound_library import SoundLibrary
 from source.misc._enums import *
 
 
+# ------------------------------ CONST ------------------------------------- #
+
+# mouse button (right one), arranging items of storage by click
+ARRANGE_MOUSE_BUTTON = 3
+
 # ========================= Storage config class ========================== #
 
 
@@ -107,9 +112,6 @@ class Storage(Frame):
         # rect of storage cells area
         self._storage_rect = Rect(start_x, start_y, width_grid, height_grid)
 
-        # list of tuples (Rect, (x,y)) for every storage cell
-        self._storage_cells_areas = self._get_storage_cells_areas()
-
         super(Storage, self).__init__(rect=final_rect,
                                       frame_config=storage_config.frame_config)
 
@@ -138,6 +140,12 @@ class Storage(Frame):
             screen.blit(self._dragged_item[DI_ITEM].image, (x, y))
 
 
+    def is_animated(self):
+        """Return True, while item is dragged (it follows the mouse).
+        """
+        return self._dragged_item is not None
+
+
     def update(self):
         """Update frame state (dragging and resizing handling).
         """
@@ -161,6 +169,18 @@ class Storage(Frame):
         self._draw_storage_items()
         if self._dragged_item:
             self._draw_dragged_item()
+        self.dirty = True
+
+
+    def arrange_items(self):
+        """Arrange items in storage compactly and redraw it.
+        Return True, if items were arranged.
+        """
+        if self._dragged_item or not self.content.arrange():
+            return False
+        self._sound_library.play('item_put.wav')
+        self.redraw_storage()
+        return True
 
 
     def _get_target_storage(self, point_on_screen_coords):
@@ -180,14 +200,11 @@ class Storage(Frame):
     def _draw_storage_items(self):
         """Draw items in storage.
         """
-        for y in range(self.content.height):
-            for x in range(self.content.width):
-                cell = self.content.storage_cells[y][x]
-                if not cell.is_empty() and not cell.is_dumb:
-                    self._background.blit(
-                        cell.inventory_item.image,
-                        (self._storage_rect.x + x * self._cell_size,
-                         self._storage_rect.y + y * self._cell_size))
+        for item, (x, y) in self.content.iter_items():
+            self._background.blit(
+                item.image,
+                (self._storage_rect.x + x * self._cell_size,
+                 self._storage_rect.y + y * self._cell_size))
 
 
     def _draw_storage_grid(self):
@@ -218,25 +235,6 @@ class Storage(Frame):
             )
 
 
-    def _get_storage_cells_areas(self):
-        """Form a dictionary, where keys are Rects instances, and
-        values are (x, y) coords tuples of appropriate cells.
-        Used for self._storage_cells_areas attr.
-        """
-        table = []
-        cell_size = self._cell_size
-        _x = self._storage_rect.x
-        _y = self._storage_rect.y
-        for y in range(self.content.height):
-            for x in range(self.content.width):
-                rect = Rect(_x + x * cell_size,
-                            _y + y * cell_size,
-                            cell_size,
-                            cell_size)
-                table.append((rect, (x, y)))
-        return table
-
-
     def _get_cell_coords_by_click_pos(self, click_pos):
         """Return coords of cell, if was clicked to it.
         Else returns None.
@@ -245,11 +243,10 @@ class Storage(Frame):
         """
         x, y = click_pos
         relative_pos = x - self.rect.x, y - self.rect.y
-        for rect, coords in self._storage_cells_areas:
-            if rect.collidepoint(relative_pos):
-                return coords
-        else:
+        if not self._storage_rect.collidepoint(relative_pos):
             return None
+        return ((relative_pos[0] - self._storage_rect.x) // self._cell_size,
+                (relative_pos[1] - self._storage_rect.y) // self._cell_size)
 
 
     def _start_item_dragging(self, x, y, mouse_pos):
@@ -261,19 +258,18 @@ class Storage(Frame):
         """
         self._sound_library.play('item_pick.wav')
 
-        # get main cell of chosen item
-        cell = self.content.storage_cells[y][x]
-        if cell.is_dumb:
-            cell, (x, y) = self.content.get_main_item_cell(cell)
+        # get upper left cell of chosen item
+        item = self.content.get_item(x, y)
+        x, y = self.content.get_item_position(item)
 
         # draw outline:
-        image = cell.inventory_item.image
+        image = item.image
         mask = pygame.mask.from_surface(image)
         outline_list = mask.outline()
         width, height = image.get_size()
         self._dragged_item = {
             DI_OUTLINED_IMAGE:  Surface((width, height)),
-            DI_ITEM: cell.inventory_item,
+            DI_ITEM: item,
             DI_CELL_X: x,
             DI_CELL_Y: y,
             DI_HALF_IMAGE_WIDTH: image.get_width() // 3,
@@ -313,6 +309,7 @@ class Storage(Frame):
         )
         cell_place = self._background.subsurface(cell_rect)
         cell_place.blit(image, (1, 1))
+        self.dirty = True
 
 
     def _dragging_item_handled_off(self):
@@ -401,15 +398,15 @@ class Storage(Frame):
 
             cell_list:      mark available cells by special color.
         """
-        for rect, coords in self._storage_cells_areas:
-            if coords in cell_list:
-                inner_rect = (
-                    rect.x + 1,
-                    rect.y + 1,
-                    rect.width - 1,
-                    rect.height - 1,
-                )
-                self._background.fill(self._available_cell_color, inner_rect)
+        for x, y in cell_list:
+            inner_rect = (
+                self._storage_rect.x + x * self._cell_size + 1,
+                self._storage_rect.y + y * self._cell_size + 1,
+                self._cell_size - 1,
+                self._cell_size - 1,
+            )
+            self._background.fill(self._available_cell_color, inner_rect)
+        self.dirty = True
 
 
     # ---------------------- EVENTS ----------------------- #
@@ -437,7 +434,9 @@ class Storage(Frame):
                 self.rect.width - self._padding * 2,
                 self.rect.height - self._padding * 2
             )
-            if not in_border_rect.collidepoint(event.pos):
+            if event.button == ARRANGE_MOUSE_BUTTON:
+                self.arrange_items()
+            elif not in_border_rect.collidepoint(event.pos):
                 self._enable_dragging_state(event.pos)
             else:
                 cell_coords = self._get_cell_coords_by_click_pos(event.pos)
@@ -445,7 +444,7 @@ class Storage(Frame):
                     return True
 
                 x, y = cell_coords
-                if not self.content.storage_cells[y][x].is_empty():
+                if self.content.get_item(x, y) is not None:
                     self._start_item_dragging(x, y, event.pos)
 
             return True
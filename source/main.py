@@ -8,6 +8,7 @@
 import gc
 
 import pygame
+from pygame import Rect
 
 from source.environment.map import Map
 from source.chars.player import Player
@@ -15,15 +16,22 @@ from source.chars.chars_manager import CharsManager
 from source.interface.hud import Hud
 from source.sounds.music_box import MusicBox
 
-from source.misc._pathes import MAP_PATH, MAP_TILES_PATH, PLAYER_TILES_PATH
+from source.misc._pathes import MAP_PATH, MAP_BINARY_PATH, MAP_TILES_PATH, \
+                                PLAYER_TILES_PATH, CACHE_DIR
 from source.misc._enums import *
-from source.misc.events import EVENT_SONG_END
+from source.misc.events import EVENT_SONG_END, event_bus
+from source.misc.game_clock import game_clock
 
 
 # ------------------------------ CONST ------------------------------------- #
 
 DISPLAY_SIZE = (1024, 640)
 FPS_LIMIT = 180
+SIMULATION_RATE = 60
+PATHFINDING_TIME_BUDGET = 0.002
+# if True, only changed screen areas are redrawn and updated, while
+# camera is not moving
+DIRTY_RECTS_UPDATE = True
 DOUBLE = True
 DEBUG = True
 
@@ -50,10 +58,14 @@ class Main(object):
         self.screen = pygame.display.set_mode(DISPLAY_SIZE)
         self.hud = Hud(display_size=DISPLAY_SIZE, scale=scale)
 
+        self.display_rect = Rect((0, 0), DISPLAY_SIZE)
         self.timer = pygame.time.Clock()
+        game_clock.set_fixed_step(1.0 / SIMULATION_RATE)
 
         self.game_map = Map(
             map_path=MAP_PATH,
+            compiled_map_path=MAP_BINARY_PATH,
+            cache_dir=CACHE_DIR,
             tileset_path=MAP_TILES_PATH,
             display_size_tuple=DISPLAY_SIZE,
             scale=scale)
@@ -69,6 +81,14 @@ class Main(object):
         # init map buffer first time
         self.game_map.make_bottom_buffer(self.player.get_camera_pos())
 
+        # main event: need to force garbage collector
+        event_bus.subscribe(EVENT_FORCE_MEMORY_FREE, gc.collect)
+
+        # camera position and player's frame, drawn last time (None, if
+        # whole screen has to be drawn)
+        self._drawn_camera_position = None
+        self._drawn_player_image = None
+
         # start music playing
         self.music_box = MusicBox()
         self.music_box.start()
@@ -78,10 +98,14 @@ class Main(object):
         """Start game main loop.
         """
         while True:
-            milliseconds_spent = self.timer.tick(FPS_LIMIT)
+            self.timer.tick(FPS_LIMIT)
+            game_clock.tick()
 
             # ~ 1. Events handling ~
 
+            # custom game events (published since the previous frame)
+            event_bus.dispatch()
+
             for event in pygame.event.get():
 
                 # main event: exit from game
@@ -93,12 +117,6 @@ class Main(object):
                     self.music_box.play_next()
                     continue
 
-                # main event: need to force garbage collector
-                if event.type == pygame.USEREVENT and \
-                                  event.custom_type == EVENT_FORCE_MEMORY_FREE:
-                    gc.collect()
-                    continue
-
                 # HUD events:
                 if self.hud.handle_event(event):
                     continue
@@ -107,32 +125,40 @@ class Main(object):
                 if self.player.handle_event(event):
                     continue
 
-                # Game Map events:
-                if self.game_map.handle_event(event):
-                    continue
-
-                # Char Manager events:
-                if self.chars_manager.handle_event(event):
-                    continue
+            # tiles changes are applied once per frame
+            self.game_map.apply_tiles_changes()
 
             # ~ 2. Update ~
 
+            # simulation runs with fixed rate, independently of FPS
             self.hud.update(debug_text=self._get_debug_message())
-            self.player.update(self.game_map, milliseconds_spent)
-            self.game_map.objects_manager.update()
+            for step in game_clock.steps():
+                self.player.update(self.game_map, step * 1000.0)
+                self.chars_manager.update()
+                self.game_map.objects_manager.update()
+
+            # paths for chars are searched within time budget
+            self.game_map.pathfinder.update(PATHFINDING_TIME_BUDGET)
 
             # ~ 3. Draw ~
 
-            camera_position = self.player.get_camera_pos()
-            self.game_map.draw_bottom_layers(self.screen, camera_position)
-            self.player.draw(self.screen)
-            self.game_map.draw_top_layer(self.screen, camera_position)
+            camera_position = self.player.get_camera_pos(game_clock.alpha)
+            dirty_rects = self._get_dirty_rects(camera_position)
 
-            self.hud.draw(self.screen)
+            if dirty_rects is None:
+                self._draw(camera_position)
+            else:
+                for rect in dirty_rects:
+                    self.screen.set_clip(rect)
+                    self._draw(camera_position)
+                self.screen.set_clip(None)
 
             # ~ 4. Display updating ~
 
-            pygame.display.update()
+            if dirty_rects is None:
+                pygame.display.update()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
 
 
     def quit(self):
@@ -143,6 +169,53 @@ class Main(object):
         raise SystemExit(0)
 
 
+    def _draw(self, camera_position):
+        """Draw map, player and HUD on screen (only inside it's clip
+        area, if it is set).
+
+            camera_position:    (X, Y) of camera on map
+        """
+        self.game_map.draw_bottom_layers(self.screen, camera_position)
+        self.player.draw(self.screen)
+        self.game_map.draw_top_layer(self.screen, camera_position)
+
+        self.hud.draw(self.screen)
+
+        self._drawn_camera_position = camera_position
+        self._drawn_player_image = self.player.image
+
+
+    def _get_dirty_rects(self, camera_position):
+        """Return list of screen Rects, changed since the previous
+        frame: changed map tiles, player's animation and HUD. Return None,
+        if whole screen has to be redrawn (camera moved, or dirty rects
+        mode is off).
+
+            camera_position:    (X, Y) of camera on map
+        """
+        if not DIRTY_RECTS_UPDATE or \
+                                 camera_position != self._drawn_camera_position:
+            return None
+
+        hud_rects = self.hud.get_dirty_rects()
+        if hud_rects is None:
+            return None
+
+        camera_x, camera_y = camera_position
+        shift_x = camera_x - DISPLAY_SIZE[0] // 2
+        shift_y = camera_y - DISPLAY_SIZE[1] // 2
+        rects = [rect.move(-shift_x, -shift_y)
+                 for rect in self.game_map.dirty_rects]
+
+        if self.player.image is not self._drawn_player_image:
+            rects.append(self.player.image.get_rect(
+                                            topleft=self.player.screen_coords))
+
+        rects.extend(hud_rects)
+        rects = [rect.clip(self.display_rect) for rect in rects]
+        return [rect for rect in rects if rect]
+
+
     def _get_debug_message(self):
         """Form debug message.
         For test purposes only.
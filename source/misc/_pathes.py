@@ -24,6 +24,7 @@ else:
 SOUNDS_DIR = os.path.join(MAIN_DIR, 'sounds', 'sound')
 MUSIC_DIR = os.path.join(MAIN_DIR, 'sounds', 'music')
 INTERFACE_DIR = os.path.join(MAIN_DIR, 'graphics', 'interface')
+CACHE_DIR = os.path.join(MAIN_DIR, 'cache')
 
 # ------ variation patterns ------- #
 
@@ -33,6 +34,7 @@ OBJECT_TEXT_PATH_PATTERN = os.path.join(MAIN_DIR, 'gamedata', 'text',
 # ------ files ------- #
 
 MAP_PATH = os.path.join(MAIN_DIR, 'gamedata', 'map', 'map.json')
+MAP_BINARY_PATH = os.path.join(MAIN_DIR, 'gamedata', 'map', 'map.bin')
 MAP_TILES_PATH = os.path.join(MAIN_DIR, 'graphics', 'tilesets', 'TILES.png')
 PLAYER_TILES_PATH = os.path.join(MAIN_DIR, 'graphics', 'chars', 'captain.png')
 ACTIONS_TILES_PATH = os.path.join(MAIN_DIR, 'graphics', 'tilesets',
@@ -6,8 +6,9 @@
 ----------------------------------------------------------"""
 
 
+from collections import deque
+
 from pygame.locals import USEREVENT
-from pygame.event import Event, post
 
 from ._enums import *
 
@@ -19,8 +20,82 @@ DEBUG = False
 # ---------------------------------------------------------------------- #
 
 
+class EventBus(object):
+    """In-process publish/subscribe bus for custom game events.
+    Messages are routed by custom type (EVENT_* enums) through dispatch
+    table to all subscribers of this type, so delivering of message
+    doesn't depend on count of other subscribers.
+
+    Messages are queued on publishing and delivered by dispatch() call
+    (once per frame, in main loop). Messages, published while
+    dispatching, are delivered on the next dispatch() call.
+    """
+    def __init__(self):
+        """Init.
+        """
+        self._subscribers = {}
+        self._queue = deque()
+
+
+    def subscribe(self, custom_type, callback):
+        """Add subscriber for messages of some type.
+
+            custom_type:    EVENT_* enum
+            callback:       callable, that takes message fields as
+                            keyword arguments
+        """
+        self._subscribers.setdefault(custom_type, []).append(callback)
+
+
+    def unsubscribe(self, custom_type, callback):
+        """Remove subscriber for messages of some type.
+
+            custom_type:    EVENT_* enum
+            callback:       callable, used in subscribe()
+        """
+        callbacks = self._subscribers.get(custom_type)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+
+    def publish(self, custom_type, **fields):
+        """Queue message for delivering.
+
+            custom_type:    EVENT_* enum
+            fields:         message fields
+        """
+        self._queue.append((custom_type, fields))
+
+
+    def dispatch(self):
+        """Deliver all messages, queued before this call.
+        """
+        queue = self._queue
+        subscribers = self._subscribers
+        for _ in range(len(queue)):
+            custom_type, fields = queue.popleft()
+            for callback in subscribers.get(custom_type, ()):
+                callback(**fields)
+
+
+    def clear(self):
+        """Drop all queued messages.
+        """
+        self._queue.clear()
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Event bus: %d messages queued' % len(self._queue)
+
+
+# ---------------------------------------------------------------------- #
+
+
 class CustomEvents(object):
     """Simple fabric for custom events.
+    Every method publishes message on events bus.
     It's better to use standard single instance below.
     """
     # ---------------------------- Main -------------------------------- #
@@ -32,10 +107,7 @@ class CustomEvents(object):
         if DEBUG:
             print('! force_memory_free')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_FORCE_MEMORY_FREE
-        ))
+        event_bus.publish(EVENT_FORCE_MEMORY_FREE)
 
     # ------------------------- Game map -------------------------------- #
 
@@ -51,11 +123,10 @@ class CustomEvents(object):
         if DEBUG:
             print('! change_tile_num_on_game_map')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_GAME_MAP_CHANGE_TILE_NUM,
-            tiles=tiles,
-        ))
+        event_bus.publish(
+            EVENT_GAME_MAP_CHANGE_TILE_NUM,
+            tiles=tiles
+        )
 
     # ----------------------- Action Interface --------------------------- #
 
@@ -69,12 +140,11 @@ class CustomEvents(object):
         if DEBUG:
             print('+ enable_action_interface')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_ENABLE_ACTION_INTERFACE,
+        event_bus.publish(
+            EVENT_ENABLE_ACTION_INTERFACE,
             direction=direction,
             object_=object_
-        ))
+        )
 
 
     def disable_action_interface(self):
@@ -84,10 +154,7 @@ class CustomEvents(object):
         if DEBUG:
             print('- disable_action_interface')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_DISABLE_ACTION_INTERFACE
-        ))
+        event_bus.publish(EVENT_DISABLE_ACTION_INTERFACE)
 
 
     def update_action_interface(self):
@@ -97,10 +164,7 @@ class CustomEvents(object):
         if DEBUG:
             print('- update_action_interface')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_UPDATE_ACTION_INTERFACE
-        ))
+        event_bus.publish(EVENT_UPDATE_ACTION_INTERFACE)
 
     # ----------------------------- Log ------------------------------ #
 
@@ -116,13 +180,12 @@ class CustomEvents(object):
         if DEBUG:
             print('   + put_message_to_players_log')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_PLAYER_MESSAGE_TO_LOG,
+        event_bus.publish(
+            EVENT_PLAYER_MESSAGE_TO_LOG,
             message=message,
             message_type=message_type,
             once=once
-        ))
+        )
 
     # ----------------------- Frame Manager --------------------------- #
 
@@ -135,11 +198,10 @@ class CustomEvents(object):
         if DEBUG:
             print('+ show_interface_frame')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_SHOW_INTERFACE_FRAME,
-            frame=frame,
-        ))
+        event_bus.publish(
+            EVENT_SHOW_INTERFACE_FRAME,
+            frame=frame
+        )
 
 
     def hide_interface_frame(self, frame):
@@ -151,11 +213,10 @@ class CustomEvents(object):
         if DEBUG:
             print('- hide_interface_frame')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_HIDE_INTERFACE_FRAME,
-            frame=frame,
-        ))
+        event_bus.publish(
+            EVENT_HIDE_INTERFACE_FRAME,
+            frame=frame
+        )
 
     # ---------------------------- Player ----------------------------- #
 
@@ -166,10 +227,7 @@ class CustomEvents(object):
         if DEBUG:
             print('   * actions_interface_close_reporting')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_ACTION_INTERFACE_CLOSED
-        ))
+        event_bus.publish(EVENT_ACTION_INTERFACE_CLOSED)
 
 
     def object_interface_close_reporting(self):
@@ -179,10 +237,7 @@ class CustomEvents(object):
         if DEBUG:
             print('   * object_interface_close_reporting')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_OBJECT_INTERFACE_CLOSED
-        ))
+        event_bus.publish(EVENT_OBJECT_INTERFACE_CLOSED)
 
     # ------------------------- Chars Manager ----------------------------- #
 
@@ -195,13 +250,12 @@ class CustomEvents(object):
         if DEBUG:
             print('   * check_cell_free_of_chars')
 
-        post(Event(
-            USEREVENT,
-            custom_type=EVENT_DETECT_CHARS_ABSENCE_ON_CELL,
+        event_bus.publish(
+            EVENT_DETECT_CHARS_ABSENCE_ON_CELL,
             cell_rect=cell_rect,
             callback_yes=callback_yes,
-            callback_no=callback_no,
-        ))
+            callback_no=callback_no
+        )
 
     # ------------- #
 
@@ -215,7 +269,8 @@ class CustomEvents(object):
 
 EVENT_SONG_END = USEREVENT + 1
 
-# -------------- instance for importing ------------------- #
+# -------------- instances for importing ------------------- #
 
+event_bus = EventBus()
 events = CustomEvents()
 
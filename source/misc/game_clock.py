@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Game clock (single source of game time).
+----------------------------------------------------------"""
+
+from time import monotonic
+
+
+# ------------------------------ CONST ------------------------------------- #
+
+# time step of virtual mode frame (in seconds)
+DEFAULT_VIRTUAL_STEP = 1.0 / 60
+
+# maximum simulation steps per frame (if frame was too long, the rest of
+# it's time is dropped, i.e. game slows down instead of freezing)
+MAX_STEPS_PER_FRAME = 5
+
+# ============================ GAME CLOCK CLASS ============================= #
+
+
+class GameClock(object):
+    """Game time, that all game subsystems have to read instead of
+    wall clock. It's better to use standard single instance below.
+
+    Game time changes only in tick() (once per frame), so all readers
+    see the same time during the frame.
+
+    If fixed step is set, game time is moved by fixed steps instead:
+    tick() only accumulates frame time, and steps() moves game time
+    step by step, while accumulated time is enough. Simulation is
+    updated on every step, and rendering interpolates between the
+    last two steps by "alpha" value. Game time could be:
+
+        - paused (time stands still);
+        - scaled (slow motion, if scale < 1, or fast forward, if > 1);
+        - virtual: time doesn't depend on wall clock at all, every
+          tick() moves it by fixed step, and advance() moves it by any
+          value. So headless simulations run as fast as CPU allows.
+    """
+    def __init__(self, get_real_time=monotonic):
+        """Init.
+
+            get_real_time:  function, that returns wall clock time
+                            (in seconds)
+        """
+        self._get_real_time = get_real_time
+        self._last_real_time = get_real_time()
+        self._time = 0.0
+
+        self.delta = 0.0
+        self.scale = 1.0
+        self.paused = False
+        self.virtual = False
+        self.virtual_step = DEFAULT_VIRTUAL_STEP
+        self.fixed_step = None
+        self._lag = 0.0
+
+
+    def now(self):
+        """Return current game time (in seconds).
+        """
+        return self._time
+
+
+    def tick(self):
+        """Move game time to the new frame.
+        Return game time, passed since the previous tick (in seconds).
+        """
+        real_time = self._get_real_time()
+        if self.virtual:
+            delta = self.virtual_step
+        else:
+            delta = real_time - self._last_real_time
+        self._last_real_time = real_time
+
+        if self.paused:
+            delta = 0.0
+        self.delta = delta * self.scale
+
+        if self.fixed_step is None:
+            self._time += self.delta
+        else:
+            self._lag = min(self._lag + self.delta,
+                            self.fixed_step * MAX_STEPS_PER_FRAME)
+        return self.delta
+
+
+    def steps(self):
+        """Generator: move game time by fixed steps, while there is
+        enough accumulated time. Every step is yielded after game time
+        is moved, so the simulation of the step sees it's end time.
+        """
+        step = self.fixed_step
+        while self._lag >= step:
+            self._lag -= step
+            self._time += step
+            yield step
+
+
+    @property
+    def alpha(self):
+        """Part of fixed step, accumulated but not simulated yet
+        (0 <= alpha < 1). Used to interpolate rendering between the
+        last two simulation steps. Always 1 without fixed step.
+        """
+        if self.fixed_step is None:
+            return 1.0
+        return self._lag / self.fixed_step
+
+
+    def set_fixed_step(self, step):
+        """Set fixed simulation step (or switch it off).
+
+            step:           in seconds (of game time), or None
+        """
+        self.fixed_step = step
+        self._lag = 0.0
+
+
+    @property
+    def delta_ms(self):
+        """Game time of the last frame (in milliseconds).
+        """
+        return self.delta * 1000.0
+
+
+    def set_scale(self, scale):
+        """Set game time speed.
+
+            scale:          1 - real speed, 0.5 - twice slower,
+                            2 - twice faster, etc.
+        """
+        if scale < 0:
+            raise ValueError('Game time scale could not be negative!')
+        self.scale = float(scale)
+
+
+    def pause(self):
+        """Stop game time.
+        """
+        self.paused = True
+
+
+    def resume(self):
+        """Continue game time after pause.
+        """
+        self.paused = False
+
+
+    def set_virtual(self, virtual, step=DEFAULT_VIRTUAL_STEP):
+        """Switch virtual mode on or off.
+
+            virtual:        True or False
+            step:           game time of one frame in virtual mode
+                            (in seconds, before scaling)
+        """
+        self.virtual = virtual
+        self.virtual_step = step
+        # wall time, spent in virtual mode, is not counted
+        self._last_real_time = self._get_real_time()
+
+
+    def advance(self, seconds):
+        """Move game time forward immediately (e.g., to the next timer
+        in headless simulation). Doesn't change last frame's delta.
+
+            seconds:        time to skip (in seconds, not scaled)
+        """
+        if seconds < 0:
+            raise ValueError('Game time could not go back!')
+        self._time += seconds
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Game clock: %.3f s%s' % (self._time,
+                                          ' (paused)' if self.paused else '')
+
+
+# ------------------------------ INSTANCE ---------------------------------- #
+
+game_clock = GameClock()
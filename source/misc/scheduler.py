@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Timers scheduler (callbacks, delayed in time).
+----------------------------------------------------------"""
+
+import heapq
+from time import monotonic
+
+
+# ============================ TIMER HANDLE ================================= #
+
+
+class TimerHandle(object):
+    """Single scheduled callback.
+    Returned by Scheduler.run_after_timeout(), could be used to cancel
+    the callback.
+    """
+    __slots__ = ('time', 'callback', 'cancelled', '_scheduler')
+
+    def __init__(self, time_, callback, scheduler):
+        """Init.
+
+            time_:          time, when callback has to be executed
+            callback:       callback to execute
+            scheduler:      Scheduler instance
+        """
+        self.time = time_
+        self.callback = callback
+        self.cancelled = False
+        self._scheduler = scheduler
+
+
+    def cancel(self):
+        """Cancel callback, if it is not executed yet.
+        Return True, if it was actually cancelled.
+        """
+        if self.callback is None:
+            return False
+        self.cancelled = True
+        self.callback = None
+        # handle could be already taken from the heap for execution
+        if self._scheduler is not None:
+            self._scheduler._on_cancel()
+            self._scheduler = None
+        return True
+
+
+    @property
+    def active(self):
+        """True, if callback is still waiting for execution.
+        """
+        return self.callback is not None
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Timer at %.3f%s' % (self.time,
+                                   '' if self.active else ' (inactive)')
+
+
+# ============================== SCHEDULER ================================== #
+
+
+class Scheduler(object):
+    """Binary heap of timers, ordered by execution time.
+    Callbacks with the same time are executed in order of scheduling,
+    so no one is lost. Adding and executing of timer costs O(log n).
+
+    Cancelled timers are left in the heap and just skipped, but heap
+    is rebuilt without them, when they are more than a half of it.
+    """
+    # minimal heap size to clean it from cancelled timers
+    MIN_HEAP_SIZE_TO_CLEAN = 64
+
+    def __init__(self, get_time=monotonic):
+        """Init.
+
+            get_time:       function, that returns current time (seconds)
+        """
+        self._get_time = get_time
+        self._heap = []
+        self._counter = 0
+        self._cancelled_count = 0
+
+
+    def run_after_timeout(self, callback, timeout):
+        """Add callback, that will be ran after timeout expired.
+        Return TimerHandle instance.
+
+            callback:       callback to execute (use lambdas for params)
+            timeout:        in seconds
+        """
+        handle = TimerHandle(self._get_time() + timeout, callback, self)
+        self._counter += 1
+        heapq.heappush(self._heap, (handle.time, self._counter, handle))
+        return handle
+
+
+    def update(self):
+        """Execute all callbacks, time of which is coming.
+        Callbacks, added while executing, are executed on next update
+        not earlier (even with zero timeout).
+        """
+        heap = self._heap
+        now = self._get_time()
+
+        ready = []
+        while heap and heap[0][0] <= now:
+            handle = heapq.heappop(heap)[2]
+            if handle.cancelled:
+                self._cancelled_count -= 1
+            else:
+                handle._scheduler = None
+                ready.append(handle)
+
+        for handle in ready:
+            # handle could be cancelled by previous callback
+            callback = handle.callback
+            if callback is not None:
+                handle.callback = None
+                callback()
+
+
+    def get_nearest_time(self):
+        """Return time of the nearest active timer, or None.
+        """
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled_count -= 1
+        return heap[0][0] if heap else None
+
+
+    def clear(self):
+        """Cancel all timers.
+        """
+        for _, _, handle in self._heap:
+            handle.cancelled = True
+            handle._scheduler = None
+            handle.callback = None
+        self._heap = []
+        self._cancelled_count = 0
+
+
+    def _on_cancel(self):
+        """Count cancelled timer; rebuild heap, if there are too many.
+        """
+        self._cancelled_count += 1
+        if len(self._heap) >= self.MIN_HEAP_SIZE_TO_CLEAN and \
+                               self._cancelled_count * 2 > len(self._heap):
+            self._heap = [item for item in self._heap
+                                                   if not item[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_count = 0
+
+
+    def __len__(self):
+        """Return number of active timers.
+        """
+        return len(self._heap) - self._cancelled_count
+
+
+    def __repr__(self):
+        """Simple representation.
+        """
+        return 'Scheduler: %d timers' % len(self)
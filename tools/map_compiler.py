@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""----------------------------------------------------------
+ Author:      alexey.sychov@gameloft.com
+ Created:     18-10-2026
+ Description: Compiler of Tiled JSON map into binary map file.
+----------------------------------------------------------"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(
+                                                                __file__))))
+
+from source.environment.map import Map
+from source.environment.map_binary import compile_map, load_compiled_map
+from source.misc._pathes import MAP_PATH, MAP_BINARY_PATH
+
+
+def validate(json_path, binary_path):
+    """Load binary map back and compare it with JSON map.
+    Return list of found differences (empty list, if all is right).
+
+        json_path:      path to Tiled JSON map file
+        binary_path:    path to binary map file
+    """
+    compiled_map = load_compiled_map(binary_path, json_path,
+                                     Map.OBJ_MARKS_LAYER_NUM,
+                                     Map.OBJECT_INDEXIES_OFFSET)
+    if compiled_map is None:
+        return ['binary map could not be loaded']
+
+    with open(json_path, 'rb') as f:
+        map_file_data = json.loads(f.read().decode('utf-8'))
+    tile_layers = [layer for layer in map_file_data['layers']
+                                                            if 'data' in layer]
+    errors = []
+
+    if (compiled_map.width, compiled_map.height) != \
+                            (map_file_data['width'], map_file_data['height']):
+        errors.append('map size differs')
+    if compiled_map.tile_size != map_file_data['tileheight']:
+        errors.append('tile size differs')
+
+    if len(compiled_map.layers) != len(tile_layers):
+        errors.append('tile layers count differs')
+    else:
+        for tiles, layer in zip(compiled_map.layers, tile_layers):
+            if list(tiles) != layer['data']:
+                errors.append('tiles of layer "%s" differ' % layer['name'])
+
+    used_tiles = set()
+    for layer in tile_layers:
+        used_tiles.update(layer['data'])
+    if compiled_map.used_tiles != used_tiles:
+        errors.append('used tiles set differs')
+
+    marks_layer = tile_layers[Map.OBJ_MARKS_LAYER_NUM]
+    objects_indexes = {}
+    for q, tile_num in enumerate(marks_layer['data']):
+        if tile_num:
+            y, x = divmod(q, marks_layer['width'])
+            objects_indexes[(x, y)] = tile_num - Map.OBJECT_INDEXIES_OFFSET
+    if compiled_map.objects_indexes != objects_indexes:
+        errors.append('objects indexes differ')
+
+    non_tile_layers = [layer for layer in map_file_data['layers']
+                                                        if 'data' not in layer]
+    if compiled_map.metadata['layers'] != non_tile_layers:
+        errors.append('non-tile layers differ')
+
+    return errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compile Tiled JSON map into binary map file '
+                    'and validate the result.')
+    parser.add_argument('--json', default=MAP_PATH,
+                        help='path to Tiled JSON map')
+    parser.add_argument('--output', default=MAP_BINARY_PATH,
+                        help='path to binary map file')
+    args = parser.parse_args()
+
+    compile_map(args.json, args.output,
+                Map.OBJ_MARKS_LAYER_NUM, Map.OBJECT_INDEXIES_OFFSET)
+    errors = validate(args.json, args.output)
+    if errors:
+        for error in errors:
+            print('Error: %s' % error)
+        sys.exit(1)
+    print('Map compiled: %s' % args.output)